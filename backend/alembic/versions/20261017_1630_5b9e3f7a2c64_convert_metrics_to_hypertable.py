@@ -0,0 +1,94 @@
+"""Convert metrics to a TimescaleDB hypertable
+
+Revision ID: 5b9e3f7a2c64
+Revises: e2b6d8f4a931
+Create Date: 2026-10-17 16:30:12.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.config import get_settings
+from src.infrastructure.database.timescale import (
+    HAS_TIMESCALEDB_SQL,
+    METRICS_HYPERTABLE,
+    metrics_policy_statements,
+    validate_metrics_retention,
+)
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9e3f7a2c64'
+down_revision = 'e2b6d8f4a931'
+branch_labels = None
+depends_on = None
+
+CHUNK_INTERVAL = '1 day'
+
+
+def _has_timescaledb() -> bool:
+    return op.get_bind().execute(HAS_TIMESCALEDB_SQL).scalar() is not None
+
+
+def upgrade() -> None:
+    settings = get_settings()
+    # Fail before touching the table rather than halfway through the policies
+    validate_metrics_retention(settings.metrics_retention_days)
+
+    # Unique constraints of a hypertable must include the partitioning column
+    op.drop_constraint('metrics_pkey', 'metrics', type_='primary')
+    op.create_primary_key('metrics_pkey', 'metrics', ['id', 'timestamp'])
+    op.create_index(
+        'ix_metrics_database_id_metric_type_timestamp',
+        'metrics',
+        ['database_id', 'metric_type', sa.text('timestamp DESC')],
+        unique=False,
+    )
+
+    if not _has_timescaledb():
+        # Plain PostgreSQL (e.g. local tests): keep a regular table
+        return
+
+    op.execute(
+        f"SELECT create_hypertable('{METRICS_HYPERTABLE}', 'timestamp', "
+        f"chunk_time_interval => INTERVAL '{CHUNK_INTERVAL}', "
+        "create_default_indexes => false, migrate_data => true, if_not_exists => true)"
+    )
+    op.execute(
+        f"ALTER TABLE {METRICS_HYPERTABLE} SET ("
+        "timescaledb.compress, "
+        "timescaledb.compress_segmentby = 'database_id, metric_type', "
+        "timescaledb.compress_orderby = 'timestamp DESC')"
+    )
+    for statement in metrics_policy_statements(
+        settings.metrics_compress_after_hours, settings.metrics_retention_days
+    ):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if _has_timescaledb():
+        op.execute(
+            f"SELECT remove_retention_policy('{METRICS_HYPERTABLE}', if_exists => true)"
+        )
+        op.execute(
+            f"SELECT remove_compression_policy('{METRICS_HYPERTABLE}', if_exists => true)"
+        )
+        # A hypertable cannot be turned back into a plain table in place:
+        # copy the rows (compressed chunks read transparently) into a new table
+        op.execute(
+            "CREATE TABLE metrics_plain (LIKE metrics INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        op.execute("INSERT INTO metrics_plain SELECT * FROM metrics")
+        op.drop_table('metrics')
+        op.rename_table('metrics_plain', 'metrics')
+        op.create_foreign_key(
+            'metrics_database_id_fkey', 'metrics', 'databases',
+            ['database_id'], ['id'], ondelete='CASCADE',
+        )
+        op.create_index(op.f('ix_metrics_timestamp'), 'metrics', ['timestamp'], unique=False)
+    else:
+        op.drop_index('ix_metrics_database_id_metric_type_timestamp', table_name='metrics')
+        op.drop_constraint('metrics_pkey', 'metrics', type_='primary')
+
+    op.create_primary_key('metrics_pkey', 'metrics', ['id'])
@@ -0,0 +1,52 @@
+"""Add continuous aggregates for metric rollups
+
+Revision ID: 9d4a6c1e8f30
+Revises: 5b9e3f7a2c64
+Create Date: 2026-10-17 17:20:41.093512
+
+"""
+from alembic import op
+
+from src.infrastructure.database.timescale import HAS_TIMESCALEDB_SQL, METRIC_ROLLUPS
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4a6c1e8f30'
+down_revision = '5b9e3f7a2c64'
+branch_labels = None
+depends_on = None
+
+
+def _has_timescaledb() -> bool:
+    return op.get_bind().execute(HAS_TIMESCALEDB_SQL).scalar() is not None
+
+
+def upgrade() -> None:
+    if not _has_timescaledb():
+        # Plain PostgreSQL: the repository aggregates raw metrics instead
+        return
+
+    for rollup in METRIC_ROLLUPS.values():
+        op.execute(rollup.create_sql())
+        op.execute(
+            f"CREATE INDEX ix_{rollup.view}_database_id_metric_type_bucket "
+            f"ON {rollup.view} (database_id, metric_type, bucket DESC)"
+        )
+        op.execute(rollup.policy_sql())
+
+    # Materialize existing history once; policies only refresh recent windows,
+    # and refresh_continuous_aggregate cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for rollup in METRIC_ROLLUPS.values():
+            op.execute(f"CALL refresh_continuous_aggregate('{rollup.view}', NULL, NULL)")
+
+
+def downgrade() -> None:
+    if not _has_timescaledb():
+        return
+
+    for rollup in reversed(list(METRIC_ROLLUPS.values())):
+        op.execute(
+            f"SELECT remove_continuous_aggregate_policy('{rollup.view}', if_exists => true)"
+        )
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {rollup.view}")
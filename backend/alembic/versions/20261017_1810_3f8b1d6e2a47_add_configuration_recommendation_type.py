@@ -0,0 +1,28 @@
+"""Add CONFIGURATION recommendation type
+
+Revision ID: 3f8b1d6e2a47
+Revises: 9d4a6c1e8f30
+Create Date: 2026-10-17 18:10:03.552871
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8b1d6e2a47'
+down_revision = '9d4a6c1e8f30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ALTER TYPE ... ADD VALUE cannot run inside a transaction before PostgreSQL 12
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE recommendationtype ADD VALUE IF NOT EXISTS 'CONFIGURATION'")
+
+
+def downgrade() -> None:
+    # Enum values cannot be dropped; move such recommendations to REWRITE and keep the value
+    op.execute(
+        "UPDATE recommendations SET type = 'REWRITE' WHERE type = 'CONFIGURATION'"
+    )
@@ -0,0 +1,41 @@
+"""Re-apply the TimescaleDB compression and retention policies of metrics.
+
+Usage:
+    python scripts/apply_metrics_policies.py
+
+The migration that creates the hypertable applies METRICS_COMPRESS_AFTER_HOURS
+and METRICS_RETENTION_DAYS once; run this after changing either setting.
+"""
+import asyncio
+import sys
+
+sys.path.insert(0, ".")
+
+from src.config import get_settings
+from src.infrastructure.database.session import AsyncSessionLocal
+from src.infrastructure.database.timescale import IS_HYPERTABLE_SQL, metrics_policy_statements
+
+
+async def main() -> None:
+    settings = get_settings()
+    async with AsyncSessionLocal() as session:
+        if (await session.execute(IS_HYPERTABLE_SQL)).scalar() is None:
+            print("metrics is not a TimescaleDB hypertable, nothing to do")
+            return
+        for statement in metrics_policy_statements(
+            settings.metrics_compress_after_hours, settings.metrics_retention_days
+        ):
+            await session.execute(statement)
+        await session.commit()
+
+    retention = (
+        f"{settings.metrics_retention_days} days" if settings.metrics_retention_days else "forever"
+    )
+    print(
+        f"metrics: compress after {settings.metrics_compress_after_hours} h, "
+        f"keep {retention}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
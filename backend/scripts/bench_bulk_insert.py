@@ -0,0 +1,136 @@
+"""Benchmark per-row save() against bulk save_all() for queries and recommendations.
+
+Usage:
+    python scripts/bench_bulk_insert.py [--sizes 10,1000,100000] [--row-limit 10000]
+
+Runs against the configured DATABASE_URL. Every measurement runs in its own
+transaction (with a throwaway user and database row) that is rolled back, so
+nothing is left behind. Per-row saves above --row-limit are skipped, as they
+take minutes at 100k rows.
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+sys.path.insert(0, ".")
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities import DatabaseType, PlanTier, Query, Recommendation, RecommendationType
+from src.infrastructure.database.models import DatabaseModel, UserModel
+from src.infrastructure.database.repositories.query_repository import PostgresQueryRepository
+from src.infrastructure.database.repositories.recommendation_repository import (
+    PostgresRecommendationRepository,
+)
+from src.infrastructure.database.session import AsyncSessionLocal
+
+
+async def _with_database(session: AsyncSession) -> uuid.UUID:
+    user_id, database_id = uuid.uuid4(), uuid.uuid4()
+    session.add(UserModel(
+        id=user_id,
+        email=f"bench-{user_id}@example.com",
+        hashed_password="x",
+        plan_tier=PlanTier.FREE,
+    ))
+    session.add(DatabaseModel(
+        id=database_id,
+        user_id=user_id,
+        name="bench",
+        type=DatabaseType.POSTGRES,
+        encrypted_connection_string="postgresql://bench",
+    ))
+    await session.flush()
+    return database_id
+
+
+def _queries(database_id: uuid.UUID, size: int) -> List[Query]:
+    now = datetime.utcnow()
+    return [
+        Query(
+            database_id=database_id,
+            sql_text="SELECT * FROM t WHERE id = $1",
+            normalized_sql="SELECT * FROM t WHERE id = $1",
+            execution_time_ms=12.5,
+            timestamp=now,
+            calls=i,
+            fingerprint_hash=i % 20,
+        )
+        for i in range(size)
+    ]
+
+
+def _recommendations(query_id: uuid.UUID, size: int) -> List[Recommendation]:
+    return [
+        Recommendation(
+            query_id=query_id,
+            rec_type=RecommendationType.INDEX,
+            title="Add index",
+            description="Sequential scan on t",
+            sql_suggestion="CREATE INDEX ON t (id)",
+            estimated_impact=50.0,
+            confidence=0.8,
+        )
+        for _ in range(size)
+    ]
+
+
+async def _per_row(repo, entities) -> None:
+    for entity in entities:
+        await repo.save(entity)
+
+
+async def _timed(
+    prepare: Callable[[AsyncSession, uuid.UUID], Awaitable[Tuple[object, list]]],
+    per_row: bool,
+) -> float:
+    async with AsyncSessionLocal() as session:
+        repo, entities = await prepare(session, await _with_database(session))
+        started = time.perf_counter()
+        await (_per_row(repo, entities) if per_row else repo.save_all(entities))
+        elapsed = time.perf_counter() - started
+        await session.rollback()
+    return elapsed
+
+
+async def bench_queries(size: int, per_row: bool) -> float:
+    async def prepare(session, database_id):
+        return PostgresQueryRepository(session), _queries(database_id, size)
+    return await _timed(prepare, per_row)
+
+
+async def bench_recommendations(size: int, per_row: bool) -> float:
+    async def prepare(session, database_id):
+        # Parent query for the foreign key, written before timing starts
+        query = _queries(database_id, 1)[0]
+        await PostgresQueryRepository(session).save(query)
+        return PostgresRecommendationRepository(session), _recommendations(query.id, size)
+    return await _timed(prepare, per_row)
+
+
+def _row(name: str, size: int, per_row: Optional[float], bulk: float) -> str:
+    per_row_text = f"{per_row * 1000:10.1f} ms" if per_row is not None else f"{'skipped':>13}"
+    speedup = f"{per_row / bulk:8.1f}x" if per_row is not None else ""
+    return f"{name:<16} {size:>8}  {per_row_text}  {bulk * 1000:10.1f} ms  {speedup}"
+
+
+async def main(sizes: List[int], row_limit: int) -> None:
+    print(f"{'table':<16} {'rows':>8}  {'per-row save':>13}  {'save_all':>13}  speedup")
+    for name, bench in (("queries", bench_queries), ("recommendations", bench_recommendations)):
+        for size in sizes:
+            per_row = await bench(size, per_row=True) if size <= row_limit else None
+            bulk = await bench(size, per_row=False)
+            print(_row(name, size, per_row, bulk))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,1000,100000")
+    parser.add_argument("--row-limit", type=int, default=10_000)
+    args = parser.parse_args()
+
+    asyncio.run(main([int(s) for s in args.sizes.split(",")], args.row_limit))
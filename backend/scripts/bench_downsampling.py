@@ -0,0 +1,86 @@
+"""Benchmark LTTB downsampling of metric series before serialization.
+
+Usage:
+    python scripts/bench_downsampling.py [--sizes 1440,43200,525600] [--max-points 500]
+
+For one metric series of each size, times lttb_indices() alone and the
+whole response path (downsample + JSON encoding of MetricsResponse) against
+encoding the full series, and reports the payload sizes. Needs no database.
+"""
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+sys.path.insert(0, ".")
+
+import numpy as np
+
+from src.application.dto.metric_dto import MetricRead, MetricsResponse
+from src.application.services.downsampling import downsample_metrics, lttb_indices
+from src.domain.entities import Metric, MetricType
+
+
+def _series(size: int) -> List[Metric]:
+    database_id, start = uuid.uuid4(), datetime(2026, 1, 1)
+    rng = np.random.default_rng(0)
+    values = np.sin(np.arange(size) / 500) * 100 + rng.normal(0, 5, size) + 200
+    return [
+        Metric(
+            database_id=database_id,
+            metric_type=MetricType.QPS,
+            value=float(value),
+            timestamp=start + timedelta(minutes=i),
+            metadata={"min": float(value) - 1, "max": float(value) + 1, "count": 1},
+        )
+        for i, value in enumerate(values)
+    ]
+
+
+def _encode(metrics: List[Metric]) -> str:
+    return MetricsResponse(
+        database_id=metrics[0].database_id,
+        metrics=[MetricRead.model_validate(m) for m in metrics],
+    ).model_dump_json()
+
+
+def _best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(sizes: List[int], max_points: int) -> None:
+    print(
+        f"{'points':>8}  {'lttb':>9}  {'full encode':>12}  {'lttb+encode':>12}  "
+        f"{'full KiB':>9}  {'lttb KiB':>9}"
+    )
+    for size in sizes:
+        metrics = _series(size)
+        x = np.fromiter((m.timestamp.timestamp() for m in metrics), dtype=np.float64)
+        y = np.fromiter((m.value for m in metrics), dtype=np.float64)
+
+        lttb = _best_of(lambda x=x, y=y: lttb_indices(x, y, max_points))
+        full = _best_of(lambda metrics=metrics: _encode(metrics))
+        reduced = _best_of(lambda metrics=metrics: _encode(downsample_metrics(metrics, max_points)))
+        full_size = len(_encode(metrics)) / 1024
+        reduced_size = len(_encode(downsample_metrics(metrics, max_points))) / 1024
+
+        print(
+            f"{size:>8}  {lttb * 1000:6.2f} ms  {full * 1000:9.1f} ms  {reduced * 1000:9.1f} ms  "
+            f"{full_size:9.0f}  {reduced_size:9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1440,43200,525600")
+    parser.add_argument("--max-points", type=int, default=500)
+    args = parser.parse_args()
+
+    main([int(s) for s in args.sizes.split(",")], args.max_points)
@@ -0,0 +1,76 @@
+"""Benchmark ExplainAnalyzer on large synthetic EXPLAIN ANALYZE plans.
+
+Usage:
+    python scripts/bench_explain_analyzer.py [--nodes 100,1000,10000] [--repeat 5]
+
+Builds balanced (fan-out 3) and chain-shaped plans with the given number of
+nodes and reports the best time of ExplainAnalyzer.analyze(). Needs no
+database.
+"""
+import argparse
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, ".")
+
+from src.infrastructure.analyzers.explain_analyzer import ExplainAnalyzer
+
+NODE_TYPES = ["Seq Scan", "Index Scan", "Nested Loop", "Hash Join", "Sort", "Aggregate"]
+
+
+def _node(rng: random.Random) -> Dict[str, Any]:
+    rows = rng.choice([1, 100, 5000, 20000])
+    return {
+        "Node Type": rng.choice(NODE_TYPES),
+        "Relation Name": f"t{rng.randrange(50)}",
+        "Total Cost": rng.uniform(1, 10000),
+        "Plan Rows": rows,
+        "Actual Rows": rows * rng.choice([1, 1, 20]),
+        "Actual Total Time": rng.uniform(0.01, 50),
+        "Actual Loops": rng.choice([1, 1, 10]),
+        "Shared Hit Blocks": rng.randrange(1000),
+        "Plans": [],
+    }
+
+
+def balanced_plan(count: int, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    nodes: List[Dict[str, Any]] = [_node(rng) for _ in range(count)]
+    for i in range(1, count):
+        nodes[(i - 1) // 3]["Plans"].append(nodes[i])
+    return {"Plan": nodes[0]}
+
+
+def chain_plan(count: int, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    root = node = _node(rng)
+    for _ in range(count - 1):
+        child = _node(rng)
+        node["Plans"].append(child)
+        node = child
+    return {"Plan": root}
+
+
+def bench(plan: Dict[str, Any], repeat: int) -> float:
+    analyzer = ExplainAnalyzer()
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        analyzer.analyze(plan)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", default="100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8}  {'balanced':>10}  {'chain':>10}")
+    for count in (int(n) for n in args.nodes.split(",")):
+        balanced = bench(balanced_plan(count), args.repeat)
+        chain = bench(chain_plan(count), args.repeat)
+        print(f"{count:>8}  {balanced * 1000:7.2f} ms  {chain * 1000:7.2f} ms")
@@ -0,0 +1,111 @@
+"""Benchmark metric writes: ORM save_all() against buffered COPY ingest().
+
+Usage:
+    python scripts/bench_metric_ingest.py [--databases 200] [--metrics-per-database 40]
+                                          [--batch-sizes 500,5000,50000]
+
+Simulates one collection shard: every database contributes a cycle's worth of
+metrics, written through one session. Runs against the configured
+DATABASE_URL inside a transaction that is rolled back.
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, ".")
+
+from src.domain.entities import DatabaseType, Metric, MetricType, PlanTier
+from src.infrastructure.database.models import DatabaseModel, UserModel
+from src.infrastructure.database.repositories.metric_repository import PostgresMetricRepository
+from src.infrastructure.database.session import AsyncSessionLocal
+
+METRIC_TYPES = list(MetricType)
+
+
+async def _databases(session, count: int) -> List[uuid.UUID]:
+    user_id = uuid.uuid4()
+    session.add(UserModel(
+        id=user_id,
+        email=f"bench-{user_id}@example.com",
+        hashed_password="x",
+        plan_tier=PlanTier.FREE,
+    ))
+    database_ids = [uuid.uuid4() for _ in range(count)]
+    for i, database_id in enumerate(database_ids):
+        session.add(DatabaseModel(
+            id=database_id,
+            user_id=user_id,
+            name=f"bench-{i}",
+            type=DatabaseType.POSTGRES,
+            encrypted_connection_string="postgresql://bench",
+        ))
+    await session.flush()
+    return database_ids
+
+
+def _cycle(database_id: uuid.UUID, count: int) -> List[Metric]:
+    now = datetime.utcnow()
+    return [
+        Metric(
+            database_id=database_id,
+            metric_type=METRIC_TYPES[i % len(METRIC_TYPES)],
+            value=float(i),
+            timestamp=now,
+            metadata={"interval_seconds": 300},
+        )
+        for i in range(count)
+    ]
+
+
+async def bench(databases: int, per_database: int, batch_size: int = 0) -> float:
+    """Seconds to write one shard's metrics; batch_size 0 uses save_all()."""
+    async with AsyncSessionLocal() as session:
+        database_ids = await _databases(session, databases)
+        cycles = [_cycle(database_id, per_database) for database_id in database_ids]
+        repo = PostgresMetricRepository(
+            session, batch_size=batch_size or 1, max_latency_seconds=float("inf")
+        )
+
+        started = time.perf_counter()
+        for metrics in cycles:
+            if batch_size:
+                await repo.ingest(metrics)
+            else:
+                await repo.save_all(metrics)
+        if batch_size:
+            await repo.flush()
+        elapsed = time.perf_counter() - started
+
+        await session.rollback()
+    return elapsed
+
+
+async def main(databases: int, per_database: int, batch_sizes: List[int]) -> None:
+    total = databases * per_database
+    print(f"{databases} databases x {per_database} metrics = {total} rows")
+    baseline = await bench(databases, per_database)
+    print(f"{'save_all (ORM)':<22} {baseline * 1000:9.1f} ms  {total / baseline:11,.0f} rows/s")
+    for batch_size in batch_sizes:
+        elapsed = await bench(databases, per_database, batch_size)
+        print(
+            f"{f'ingest (COPY {batch_size})':<22} {elapsed * 1000:9.1f} ms  "
+            f"{total / elapsed:11,.0f} rows/s  {baseline / elapsed:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--databases", type=int, default=200)
+    parser.add_argument("--metrics-per-database", type=int, default=40)
+    parser.add_argument("--batch-sizes", default="500,5000,50000")
+    args = parser.parse_args()
+
+    asyncio.run(main(
+        args.databases,
+        args.metrics_per_database,
+        [int(s) for s in args.batch_sizes.split(",")],
+    ))
@@ -0,0 +1,101 @@
+"""Benchmark SqlNormalizer backends (pglast vs sqlparse).
+
+Usage:
+    python scripts/bench_sql_normalizer.py [corpus.csv] [--repeat N]
+
+The corpus is a CSV whose first column is the query text, e.g. exported from
+a monitored database with:
+
+    \\copy (SELECT query FROM pg_stat_statements) TO 'corpus.csv' CSV
+
+Without a corpus, ORM-style statements with varying literals are generated.
+"""
+import argparse
+import csv
+import random
+import re
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, ".")
+
+from src.infrastructure.services.sql_normalizer import SqlNormalizer, pg_parser
+
+TEMPLATES = [
+    "SELECT users.id, users.email, users.created_at FROM users WHERE users.id = {int}",
+    "select * from orders where customer_id = {int} and status = '{word}' order by created_at desc limit {int}",
+    "SELECT p.name, o.total FROM products p JOIN orders o ON p.id = o.product_id "
+    "WHERE o.created_at > '{date}' AND o.total > {float}",
+    "UPDATE inventory SET stock = stock - {int} WHERE product_id = {int}",
+    "INSERT INTO events (user_id, kind, payload) VALUES ({int}, '{word}', '{word}')",
+    "SELECT count(*) FROM sessions WHERE last_seen > now() - interval '{int} minutes'",
+    "/* controller:users action:show */ SELECT  \"users\".* FROM \"users\" WHERE \"users\".\"id\" = {int} LIMIT 1",
+    "DELETE FROM carts WHERE updated_at < '{date}' AND user_id IS NULL",
+    "SELECT email, count(*) FROM orders GROUP BY email HAVING count(*) > {int}",
+    "select a.id, b.name from accounts a left join billing b on b.account_id = a.id "
+    "where a.plan in ('{word}', '{word}') and b.amount between {float} and {float}",
+]
+WORDS = ["active", "pending", "pro", "free", "shipped", "cancelled"]
+PLACEHOLDER = re.compile(r"\{(int|float|word|date)\}")
+
+
+def generated_corpus(size: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    fill = {
+        "int": lambda: str(rng.randint(1, 100_000)),
+        "float": lambda: f"{rng.uniform(1, 1000):.2f}",
+        "word": lambda: rng.choice(WORDS),
+        "date": lambda: f"2026-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+    }
+    return [
+        PLACEHOLDER.sub(lambda m: fill[m.group(1)](), rng.choice(TEMPLATES))
+        for _ in range(size)
+    ]
+
+
+def load_corpus(path: str) -> List[str]:
+    with open(path, newline="") as f:
+        return [row[0] for row in csv.reader(f) if row and row[0].strip()]
+
+
+def bench(name: str, normalize: Callable[[str], str], corpus: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for sql in corpus:
+            normalize(sql)
+        best = min(best, time.perf_counter() - started)
+    fingerprints = len({normalize(sql) for sql in corpus})
+    print(
+        f"{name:<10} {best * 1000:9.1f} ms  {len(corpus) / best:11,.0f} stmt/s  "
+        f"{fingerprints:6d} fingerprints"
+    )
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?", help="CSV file with one query per row")
+    parser.add_argument("--size", type=int, default=5_000, help="generated corpus size")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else generated_corpus(args.size)
+    print(f"{len(corpus)} statements, best of {args.repeat}")
+
+    sqlparse_time = bench("sqlparse", SqlNormalizer._normalize_sqlparse, corpus, args.repeat)
+    if pg_parser is None:
+        print("pglast is not installed")
+        return
+    pglast_time = bench("pglast", SqlNormalizer._normalize_uncached, corpus, args.repeat)
+    print(f"speedup    {sqlparse_time / pglast_time:.1f}x")
+
+    # Steady state of a collection cycle: the same texts come back every poll
+    SqlNormalizer.normalize_many(corpus)
+    cached_time = bench("cached", SqlNormalizer.normalize, corpus, args.repeat)
+    print(f"speedup    {sqlparse_time / cached_time:.1f}x  {SqlNormalizer.cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Rewrite fingerprints made by older SqlNormalizer rules.
+
+Usage:
+    python scripts/renormalize_queries.py [--dry-run]
+
+Samples whose normalization_version is below NORMALIZATION_VERSION are moved
+to the fingerprint their pattern's sample_sql gets under the current rules,
+and patterns that collapse onto one fingerprint are merged (see
+PostgresQueryPatternRepository.renormalize). Samples no longer store their
+own text, so query_patterns is the source of truth and is never rebuilt from
+the samples. One database is done per transaction, so the script can be
+interrupted and resumed. Until it finishes, aggregates group old and new
+fingerprints of the same statement separately.
+"""
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import func, select
+
+from src.infrastructure.database.models import QueryModel, QueryPatternModel
+from src.infrastructure.database.repositories.query_pattern_repository import (
+    PostgresQueryPatternRepository,
+)
+from src.infrastructure.database.session import AsyncSessionLocal
+from src.infrastructure.services.sql_normalizer import NORMALIZATION_VERSION
+
+
+async def renormalize(dry_run: bool) -> None:
+    async with AsyncSessionLocal() as session:
+        outdated = QueryModel.normalization_version < NORMALIZATION_VERSION
+        total = await session.scalar(select(func.count()).select_from(QueryModel).where(outdated))
+        database_ids = (
+            await session.scalars(select(QueryModel.database_id).where(outdated).distinct())
+        ).all()
+        print(
+            f"{total} queries in {len(database_ids)} databases below version {NORMALIZATION_VERSION}"
+        )
+        if dry_run or not total:
+            return
+
+        repo = PostgresQueryPatternRepository(session)
+        for i, database_id in enumerate(database_ids, 1):
+            fingerprints = await repo.renormalize(database_id)
+            await session.commit()
+            print(f"{i}/{len(database_ids)} {database_id}: {fingerprints} fingerprints")
+
+        remaining = await session.scalar(select(func.count()).select_from(QueryModel).where(outdated))
+        if remaining:
+            print(f"{remaining} queries left: their fingerprints have no pattern text to renormalize")
+        fingerprints = await session.scalar(select(func.count()).select_from(QueryPatternModel))
+        print(f"done, {fingerprints} fingerprints")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="only count outdated queries")
+    args = parser.parse_args()
+
+    asyncio.run(renormalize(args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,12 +17,16 @@ class DatabaseBase(BaseModel):
 class DatabaseCreate(DatabaseBase):
     """DTO for connecting a new database."""
     connection_string: str
+    explain_cost_budget: Optional[float] = Field(default=None, ge=0)
+    explain_timeout_ms: Optional[int] = Field(default=None, ge=100)
 
 
 class DatabaseUpdate(BaseModel):
     """DTO for updating database info."""
     name: Optional[str] = None
     is_active: Optional[bool] = None
+    explain_cost_budget: Optional[float] = Field(default=None, ge=0)
+    explain_timeout_ms: Optional[int] = Field(default=None, ge=100)
 
 
 class DatabaseRead(DatabaseBase):
@@ -36,6 +40,8 @@ class DatabaseRead(DatabaseBase):
     created_at: datetime
     last_connected_at: Optional[datetime] = None
     last_collection_at: Optional[datetime] = None
+    explain_cost_budget: Optional[float] = None
+    explain_timeout_ms: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -3,7 +3,7 @@ from uuid import UUID
 from typing import Dict, Optional, List
 from pydantic import BaseModel
 
-from src.domain.entities.metric import MetricType
+from src.domain.entities.metric import MetricResolution, MetricType
 
 class MetricRead(BaseModel):
     timestamp: datetime
@@ -16,4 +16,5 @@ class MetricRead(BaseModel):
 
 class MetricsResponse(BaseModel):
     database_id: UUID
+    resolution: MetricResolution = MetricResolution.RAW
     metrics: List[MetricRead]
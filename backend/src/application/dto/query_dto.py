@@ -12,6 +12,7 @@ class QueryRead(BaseModel):
     sql_text: str
     normalized_sql: str
     execution_time_ms: float
+    calls: Optional[int] = None
     explain_plan: Optional[Dict] = None
     timestamp: datetime
     status: QueryStatus
@@ -1,5 +1,6 @@
 """Database repository interface."""
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
@@ -14,6 +15,11 @@ class IDatabaseRepository(ABC):
         """Get database by ID."""
         pass
 
+    @abstractmethod
+    async def get_by_ids(self, db_ids: List[UUID]) -> List[Database]:
+        """Get several databases by ID in one query."""
+        pass
+
     @abstractmethod
     async def get_by_user_id(self, user_id: UUID) -> List[Database]:
         """Get all databases for a specific user."""
@@ -24,6 +30,11 @@ class IDatabaseRepository(ABC):
         """Get all active databases for background collection."""
         pass
 
+    @abstractmethod
+    async def get_due_for_collection(self, now: datetime, limit: int = 1000) -> List[Database]:
+        """Lock and return active databases whose next collection is due, skipping locked ones."""
+        pass
+
     @abstractmethod
     async def save(self, database: Database) -> Database:
         """Save a new database or update an existing one."""
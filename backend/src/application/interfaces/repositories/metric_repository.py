@@ -1,10 +1,10 @@
 """Metric repository interface."""
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from src.domain.entities.metric import Metric
+from src.domain.entities.metric import Metric, MetricResolution, MetricType
 
 
 class IMetricRepository(ABC):
@@ -17,6 +17,24 @@ class IMetricRepository(ABC):
         """Get metrics for a specific database and time range."""
         pass
 
+    @abstractmethod
+    async def get_rollups(
+        self,
+        db_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+        resolution: MetricResolution,
+    ) -> List[Metric]:
+        """Get metrics of a time range aggregated into buckets of ``resolution``."""
+        pass
+
+    @abstractmethod
+    async def get_latest(
+        self, db_id: UUID, metric_type: MetricType, since: datetime
+    ) -> Optional[Metric]:
+        """Get the most recent metric of a type recorded after ``since``."""
+        pass
+
     @abstractmethod
     async def save(self, metric: Metric) -> Metric:
         """Save a new metric."""
@@ -26,3 +44,13 @@ class IMetricRepository(ABC):
     async def save_all(self, metrics: List[Metric]) -> List[Metric]:
         """Save multiple metrics."""
         pass
+
+    @abstractmethod
+    async def ingest(self, metrics: List[Metric]) -> None:
+        """Buffer metrics for a bulk write, flushed by size or age and on commit."""
+        pass
+
+    @abstractmethod
+    async def flush(self) -> int:
+        """Write the buffered metrics and return how many were written."""
+        pass
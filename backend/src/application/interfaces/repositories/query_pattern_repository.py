@@ -0,0 +1,49 @@
+"""Query pattern repository interface."""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from src.domain.entities.query_pattern import QueryPattern
+
+
+class IQueryPatternRepository(ABC):
+    """Interface for per-fingerprint running statistics."""
+
+    @abstractmethod
+    async def upsert_all(self, patterns: List[QueryPattern]) -> None:
+        """Merge the statistics of new samples into the stored patterns."""
+        pass
+
+    @abstractmethod
+    async def rebuild_from_samples(self) -> None:
+        """Recompute every pattern from the stored query samples."""
+        pass
+
+    @abstractmethod
+    async def renormalize(self, db_id: UUID, version: int) -> int:
+        """Move a database's outdated fingerprints to ``version`` rules, from the pattern texts."""
+        pass
+
+    @abstractmethod
+    async def get_by_fingerprint(self, db_id: UUID, fingerprint_hash: int) -> Optional[QueryPattern]:
+        """Get the pattern of one fingerprint."""
+        pass
+
+    @abstractmethod
+    async def get_by_database_id(
+        self, db_id: UUID, since: Optional[datetime] = None, limit: int = 50
+    ) -> List[QueryPattern]:
+        """Get the patterns seen since a time, by total execution time."""
+        pass
+
+    @abstractmethod
+    async def get_regression_ratios(
+        self,
+        db_ids: List[UUID],
+        since: datetime,
+        min_samples: int = 5,
+        min_increase_ms: float = 50.0,
+    ) -> Dict[UUID, float]:
+        """Get the worst recent/running mean latency ratio of each database."""
+        pass
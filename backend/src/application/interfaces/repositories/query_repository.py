@@ -1,6 +1,6 @@
 """Query repository interface."""
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from src.domain.entities.query import Query
@@ -31,5 +31,10 @@ class IQueryRepository(ABC):
 
     @abstractmethod
     async def get_aggregated_metrics(self, db_id: UUID, hours: int = 24) -> List[dict]:
-        """Get aggregated metrics grouped by normalized_sql."""
+        """Get aggregated metrics grouped by fingerprint hash."""
+        pass
+
+    @abstractmethod
+    async def get_latest_plans(self, db_id: UUID, fingerprint_hashes: List[int]) -> Dict[int, dict]:
+        """Get the most recent EXPLAIN plan of each fingerprint that has one."""
         pass
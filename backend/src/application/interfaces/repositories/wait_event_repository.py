@@ -0,0 +1,30 @@
+"""Wait event sample repository interface."""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List
+from uuid import UUID
+
+from src.domain.entities.wait_event import WaitEventSample
+
+
+class IWaitEventRepository(ABC):
+    """Interface for Active Session History storage."""
+
+    @abstractmethod
+    async def save_all(self, samples: List[WaitEventSample]) -> List[WaitEventSample]:
+        """Save multiple aggregated samples."""
+        pass
+
+    @abstractmethod
+    async def get_breakdown_by_fingerprint(
+        self, db_id: UUID, start_time: datetime, end_time: datetime
+    ) -> List[dict]:
+        """Get sampled session time per fingerprint and wait event."""
+        pass
+
+    @abstractmethod
+    async def get_timeline(
+        self, db_id: UUID, start_time: datetime, end_time: datetime, bucket_seconds: int
+    ) -> List[dict]:
+        """Get sampled session time per time bucket and wait event type."""
+        pass
@@ -4,7 +4,9 @@ from abc import ABC, abstractmethod
 from src.application.interfaces.repositories.user_repository import IUserRepository
 from src.application.interfaces.repositories.database_repository import IDatabaseRepository
 from src.application.interfaces.repositories.query_repository import IQueryRepository
+from src.application.interfaces.repositories.query_pattern_repository import IQueryPatternRepository
 from src.application.interfaces.repositories.metric_repository import IMetricRepository
+from src.application.interfaces.repositories.wait_event_repository import IWaitEventRepository
 
 
 class IUnitOfWork(ABC):
@@ -13,7 +15,9 @@ class IUnitOfWork(ABC):
     users: IUserRepository
     databases: IDatabaseRepository
     queries: IQueryRepository
+    query_patterns: IQueryPatternRepository
     metrics: IMetricRepository
+    wait_events: IWaitEventRepository
 
     async def __aenter__(self):
         return self
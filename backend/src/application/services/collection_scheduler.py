@@ -0,0 +1,95 @@
+"""Adaptive per-database collection scheduling policy."""
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from src.domain.entities.database import ConnectionStatus
+from src.domain.entities.user import PlanTier
+
+# Collection interval of a healthy database with ordinary activity
+TIER_BASE_INTERVAL_SECONDS = {
+    PlanTier.FREE: 900.0,
+    PlanTier.STARTER: 300.0,
+    PlanTier.PRO: 120.0,
+    PlanTier.ENTERPRISE: 60.0,
+}
+
+# Databases with an ongoing regression are collected more often
+REGRESSION_FACTORS = {
+    "CRITICAL": 0.25,
+    "HIGH": 0.5,
+    "MEDIUM": 0.75,
+}
+
+
+class CollectionScheduler:
+    """
+    Decides when each database should be collected next.
+
+    The interval starts from the plan tier and is shortened for busy
+    databases and databases with regressions, stretched for idle ones, and
+    backs off exponentially while a database is offline. Due times are
+    jittered so databases drift apart instead of being collected together.
+    """
+
+    def __init__(
+        self,
+        min_interval_seconds: float = 60.0,
+        max_interval_seconds: float = 3600.0,
+        max_backoff_seconds: float = 6 * 3600.0,
+        idle_calls_per_second: float = 0.1,
+        busy_calls_per_second: float = 100.0,
+        jitter: float = 0.1,
+        rng: Optional[random.Random] = None,
+    ):
+        self.min_interval_seconds = min_interval_seconds
+        self.max_interval_seconds = max_interval_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.idle_calls_per_second = idle_calls_per_second
+        self.busy_calls_per_second = busy_calls_per_second
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+    def next_interval(
+        self,
+        tier: PlanTier,
+        connection_status: ConnectionStatus = ConnectionStatus.UNKNOWN,
+        consecutive_failures: int = 0,
+        calls_per_second: Optional[float] = None,
+        regression_severity: Optional[str] = None,
+    ) -> float:
+        """
+        Compute the interval until the next collection, before jitter.
+
+        Args:
+            tier: Plan tier of the database owner.
+            connection_status: Result of the last collection or check.
+            consecutive_failures: Failed collections/checks in a row.
+            calls_per_second: pg_stat_statements calls per second over the
+                last collection interval (None when unknown).
+            regression_severity: Worst regression severity (see analyze_trends.regression_severity).
+
+        Returns:
+            Interval in seconds.
+        """
+        base = TIER_BASE_INTERVAL_SECONDS.get(tier, TIER_BASE_INTERVAL_SECONDS[PlanTier.FREE])
+
+        if connection_status == ConnectionStatus.OFFLINE and consecutive_failures > 0:
+            # Exponential backoff; activity and regressions are stale while offline
+            backoff = base * 2 ** min(consecutive_failures, 16)
+            return min(backoff, self.max_backoff_seconds)
+
+        interval = base
+        if calls_per_second is not None:
+            if calls_per_second < self.idle_calls_per_second:
+                interval *= 3
+            elif calls_per_second >= self.busy_calls_per_second:
+                interval *= 0.5
+        interval *= REGRESSION_FACTORS.get(regression_severity, 1.0)
+
+        return max(self.min_interval_seconds, min(interval, self.max_interval_seconds))
+
+    def next_due(self, now: datetime, interval_seconds: float) -> datetime:
+        """Return ``now`` plus the interval, jittered by +/- ``jitter``."""
+        spread = interval_seconds * self.jitter
+        return now + timedelta(seconds=interval_seconds + self.rng.uniform(-spread, spread))
@@ -0,0 +1,85 @@
+"""Largest-Triangle-Three-Buckets downsampling of metric series."""
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+from src.domain.entities.metric import Metric, MetricType
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Pick at most ``max_points`` indices of a series with LTTB.
+
+    The first and last points are always kept. The points in between are
+    split into ``max_points - 2`` buckets, and each bucket keeps the point
+    forming the largest triangle with the previously kept point and the
+    average of the next bucket, which preserves peaks and dips that plain
+    striding or averaging would flatten. Bucket averages and triangle areas
+    are computed with NumPy; only the walk over buckets is a Python loop.
+
+    Args:
+        x: Strictly increasing x values (e.g. epoch seconds).
+        y: Values, same length as ``x``.
+        max_points: Maximum number of points to keep.
+
+    Returns:
+        Sorted indices into ``x`` and ``y``.
+    """
+    n = len(x)
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 3:
+        return np.array([0, n - 1][:max(max_points, 0)], dtype=np.intp)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    buckets = max_points - 2
+    # Bucket i holds interior points edges[i] .. edges[i + 1] - 1
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.intp)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    # Third vertex of bucket i: the mean of bucket i + 1, or the last point
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(buckets):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        # Twice the triangle area; the constant factor does not change argmax
+        areas = np.abs(
+            (ax - next_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[i] - ay)
+        )
+        a = lo + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_metrics(metrics: List[Metric], max_points: int) -> List[Metric]:
+    """
+    Downsample each metric type's series to at most ``max_points`` points.
+
+    Args:
+        metrics: Metrics ordered by timestamp, possibly of several types.
+        max_points: Maximum number of points per metric type.
+
+    Returns:
+        The kept metrics, ordered by timestamp within each type.
+    """
+    series: Dict[MetricType, List[Metric]] = defaultdict(list)
+    for metric in metrics:
+        series[metric.metric_type].append(metric)
+
+    kept: List[Metric] = []
+    for points in series.values():
+        if len(points) <= max_points:
+            kept.extend(points)
+            continue
+        x = np.fromiter((m.timestamp.timestamp() for m in points), dtype=np.float64, count=len(points))
+        y = np.fromiter((m.value for m in points), dtype=np.float64, count=len(points))
+        kept.extend(points[i] for i in lttb_indices(x, y, max_points))
+    return kept
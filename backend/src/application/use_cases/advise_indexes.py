@@ -0,0 +1,95 @@
+"""Use case for planning indexes across the whole workload of a database."""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from src.application.interfaces.unit_of_work import IUnitOfWork
+from src.infrastructure.analyzers.plan_metrics import root_plan
+from src.infrastructure.analyzers.workload_index_advisor import WorkloadIndexAdvisor
+from src.infrastructure.collectors.catalog_snapshot import CatalogSnapshot
+from src.infrastructure.collectors.connection_pool import get_pool_registry
+from src.infrastructure.collectors.plan_cache import extract_relations
+from src.infrastructure.collectors.postgres_collector import PostgresCollector
+
+logger = logging.getLogger(__name__)
+
+class AdviseIndexesUseCase:
+    """Builds one ranked index plan per database from all of its fingerprints."""
+
+    def __init__(self, uow: IUnitOfWork):
+        self.uow = uow
+
+    async def execute(
+        self,
+        database_id: UUID,
+        hours: int = 168,
+        max_indexes: int = 5,
+        max_bytes: int = 0,
+        max_fingerprints: int = 500,
+    ) -> Dict[str, Any]:
+        """
+        Plan indexes for the fingerprints seen in the last ``hours``.
+        
+        Each fingerprint's latest EXPLAIN plan contributes candidates weighted
+        by the fingerprint's total execution time (see WorkloadIndexAdvisor).
+        When the target database is reachable, a catalog snapshot of the
+        planned tables filters out indexes that already exist.
+        
+        Args:
+            database_id: Database to plan for.
+            hours: Only fingerprints seen this recently count.
+            max_indexes: Index count budget.
+            max_bytes: Estimated size budget, 0 for none.
+            max_fingerprints: Heaviest fingerprints to consider.
+        """
+        async with self.uow:
+            database = await self.uow.databases.get_by_id(database_id)
+            patterns = await self.uow.query_patterns.get_by_database_id(
+                database_id,
+                since=datetime.utcnow() - timedelta(hours=hours),
+                limit=max_fingerprints,
+            )
+            plans = await self.uow.queries.get_latest_plans(
+                database_id, [p.fingerprint_hash for p in patterns]
+            )
+
+        catalog = await self._catalog(database, plans.values()) if database else None
+        advisor = WorkloadIndexAdvisor(max_indexes=max_indexes, max_bytes=max_bytes, catalog=catalog)
+        for pattern in patterns:
+            plan = plans.get(pattern.fingerprint_hash)
+            if plan:
+                advisor.add_plan(pattern.fingerprint_hash, plan, pattern.total_exec_time_ms)
+            else:
+                # No plan: the time still counts towards the workload total
+                advisor.workload_ms += pattern.total_exec_time_ms
+
+        indexes = advisor.plan()
+        logger.info(
+            f"Index plan for {database_id}: {len(indexes)} indexes from "
+            f"{len(plans)} of {len(patterns)} fingerprints with plans"
+        )
+        return {
+            "database_id": database_id,
+            "fingerprints": len(patterns),
+            "fingerprints_with_plans": len(plans),
+            "candidates": len(advisor.candidates),
+            "catalog": catalog is not None,
+            "indexes": indexes,
+        }
+
+    async def _catalog(self, database: Any, plans: Iterable[Any]) -> Optional[CatalogSnapshot]:
+        """Catalog snapshot of every relation the plans scan, None if unavailable."""
+        relations = sorted({r for plan in plans for r in extract_relations(root_plan(plan))})
+        if not relations:
+            return None
+        collector = PostgresCollector(
+            database.encrypted_connection_string,
+            database_id=database.id,
+            pool_registry=get_pool_registry(),
+        )
+        try:
+            return await collector.get_catalog_snapshot(relations)
+        except Exception as e:
+            logger.warning(f"Planning indexes for {database.id} without catalog snapshot: {e}")
+            return None
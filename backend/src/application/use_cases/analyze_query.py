@@ -1,15 +1,20 @@
 """Use case for analyzing a query and generating recommendations."""
 import logging
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from src.application.interfaces.repositories.database_repository import IDatabaseRepository
 from src.application.interfaces.repositories.query_repository import IQueryRepository
 from src.application.interfaces.repositories.recommendation_repository import IRecommendationRepository
 from src.infrastructure.collectors.postgres_collector import PostgresCollector
+from src.infrastructure.collectors.connection_pool import get_pool_registry
+from src.infrastructure.collectors.catalog_snapshot import CatalogSnapshot
+from src.infrastructure.collectors.plan_cache import extract_relations
 from src.infrastructure.analyzers.explain_analyzer import ExplainAnalyzer
-from src.infrastructure.analyzers.index_analyzer import IndexAnalyzer
+from src.infrastructure.analyzers.index_analyzer import INDEX_CANDIDATE_RULES, IndexAnalyzer
 from src.infrastructure.analyzers.basic_query_analyzer import BasicQueryAnalyzer
 from src.domain.entities.recommendation import Recommendation, RecommendationStatus
+from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -50,15 +55,32 @@ class AnalyzeQueryUseCase:
 
         # 2. Get EXPLAIN plan using safe method
         # Note: In production, we'd handle connection strings more securely
-        collector = PostgresCollector(database.encrypted_connection_string)
+        collector = PostgresCollector(
+            database.encrypted_connection_string,
+            database_id=database.id,
+            pool_registry=get_pool_registry(),
+        )
         
         # We only analyze SELECT queries for now to be safe
         if not query_entity.sql_text.strip().upper().startswith("SELECT"):
             logger.info(f"Skipping analysis for non-SELECT query {query_id}")
             return
 
-        # Try to get EXPLAIN plan (handles parameterized queries)
-        explain_plan = await collector.get_explain_plan_safe(query_entity.sql_text)
+        # Try to get EXPLAIN plan (handles parameterized queries).
+        # ANALYZE re-executes a statement known to be slow, so it only runs
+        # when the estimated cost is within budget and under a statement_timeout.
+        # Plans are reused per fingerprint until the schema or statistics change.
+        settings = get_settings()
+        explain_plan = await collector.get_explain_plan_cached(
+            query_entity.normalized_sql or query_entity.sql_text,
+            query_entity.sql_text,
+            cost_budget=(
+                database.explain_cost_budget
+                if database.explain_cost_budget is not None
+                else settings.explain_cost_budget
+            ),
+            timeout_ms=database.explain_timeout_ms or settings.explain_timeout_ms,
+        )
         
         recs_to_save = []
         
@@ -69,7 +91,10 @@ class AnalyzeQueryUseCase:
 
             # 3. Analyze with EXPLAIN-based analyzers
             explain_findings = self.explain_analyzer.analyze(explain_plan)
-            index_recommendations = self.index_analyzer.analyze(query_entity.sql_text, explain_findings)
+            catalog = await self._catalog(collector, explain_plan, explain_findings)
+            index_recommendations = self.index_analyzer.analyze(
+                query_entity.sql_text, explain_findings, catalog
+            )
 
             # 4. Save recommendations from EXPLAIN analysis
             # Add explain findings as recommendations (mostly rewrite or schema suggestions)
@@ -82,6 +107,7 @@ class AnalyzeQueryUseCase:
                         rec_type=finding["type"],
                         title=finding["title"],
                         description=finding["description"],
+                        sql_suggestion=finding.get("sql_suggestion"),
                         estimated_impact=finding["impact"] * 100,
                         confidence=finding["confidence"]
                     ))
@@ -119,3 +145,23 @@ class AnalyzeQueryUseCase:
         if recs_to_save:
             await self.rec_repo.save_all(recs_to_save)
             logger.info(f"Saved {len(recs_to_save)} recommendations for query {query_id}")
+
+    async def _catalog(
+        self,
+        collector: PostgresCollector,
+        explain_plan: Dict[str, Any],
+        explain_findings: List[Dict[str, Any]],
+    ) -> Optional[CatalogSnapshot]:
+        """
+        Existing indexes and column statistics of the scanned tables, if useful.
+
+        Only fetched when a finding can lead to an index recommendation; the
+        snapshot is optional input, so any failure falls back to None.
+        """
+        if not any(f.get("rule") in INDEX_CANDIDATE_RULES for f in explain_findings):
+            return None
+        try:
+            return await collector.get_catalog_snapshot(extract_relations(explain_plan))
+        except Exception as e:
+            logger.warning(f"Analyzing without catalog snapshot for {collector.pool_key}: {e}")
+            return None
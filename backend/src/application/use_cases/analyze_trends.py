@@ -1,13 +1,29 @@
 """Use case for identifying performance trends and regressions."""
 import logging
 from uuid import UUID
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
 from src.application.interfaces.unit_of_work import IUnitOfWork
 
 logger = logging.getLogger(__name__)
 
+# A regression is > 30% slower AND > 50ms slower than the baseline
+REGRESSION_MIN_RATIO = 1.3
+REGRESSION_MIN_INCREASE_MS = 50.0
+
+
+def regression_severity(ratio: float) -> Optional[str]:
+    """Severity of a regression from its recent/baseline latency ratio."""
+    if ratio > 5:
+        return "CRITICAL"
+    if ratio > 2:
+        return "HIGH"
+    if ratio > REGRESSION_MIN_RATIO:
+        return "MEDIUM"
+    return None
+
+
 class AnalyzeTrendsUseCase:
     """Detects queries that are getting slower over time."""
 
@@ -31,15 +47,15 @@ class AnalyzeTrendsUseCase:
             # but for simplicity we'll just take the 7-day average)
             baseline_metrics = await self.uow.queries.get_aggregated_metrics(database_id, hours=168) # 7 days
             
-            # Index baseline by normalized_sql for fast lookup
-            baseline_map = {m["normalized_sql"]: m for m in baseline_metrics}
+            # Index baseline by fingerprint hash for fast lookup
+            baseline_map = {m["fingerprint_hash"]: m for m in baseline_metrics}
             
             regressions = []
             
             # 3. Compare and detect degradation
             for recent in recent_metrics:
                 fingerprint = recent["normalized_sql"]
-                baseline = baseline_map.get(fingerprint)
+                baseline = baseline_map.get(recent["fingerprint_hash"])
                 
                 if not baseline or baseline["count"] < 5:
                     # Not enough data for a reliable baseline
@@ -49,18 +65,15 @@ class AnalyzeTrendsUseCase:
                 baseline_avg = baseline["avg_exec_time_ms"]
                 
                 # Check for significant degradation (e.g., > 30% increase AND > 50ms absolute increase)
-                if recent_avg > baseline_avg * 1.3 and (recent_avg - baseline_avg) > 50:
+                if (
+                    recent_avg > baseline_avg * REGRESSION_MIN_RATIO
+                    and (recent_avg - baseline_avg) > REGRESSION_MIN_INCREASE_MS
+                ):
                     increase_pct = ((recent_avg / baseline_avg) - 1) * 100
-                    
-                    # Determine severity
-                    if recent_avg > baseline_avg * 5:
-                        severity = "CRITICAL"
-                    elif recent_avg > baseline_avg * 2:
-                        severity = "HIGH"
-                    else:
-                        severity = "MEDIUM"
+                    severity = regression_severity(recent_avg / baseline_avg)
                     
                     regressions.append({
+                        "fingerprint_hash": recent["fingerprint_hash"],
                         "normalized_sql": fingerprint,
                         "sample_sql": recent.get("sample_sql", fingerprint),
                         "recent_avg_ms": recent_avg,
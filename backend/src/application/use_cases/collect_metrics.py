@@ -1,13 +1,18 @@
 """Use case for collecting metrics and slow queries from a database."""
+import asyncio
 import logging
-from datetime import datetime
-from typing import List
+from typing import Any, Dict, List
 from uuid import UUID
 
 from src.application.interfaces.unit_of_work import IUnitOfWork
-from src.infrastructure.services.sql_normalizer import SqlNormalizer
+from src.infrastructure.services.sql_normalizer import NORMALIZATION_VERSION, SqlNormalizer
 from src.infrastructure.collectors.postgres_collector import PostgresCollector
+from src.infrastructure.collectors.connection_pool import get_pool_registry
+from src.infrastructure.collectors.snapshot_store import get_snapshot_store
+from src.infrastructure.collectors.statement_snapshots import select_slow_statements
+from src.domain.entities.database import Database
 from src.domain.entities.query import Query
+from src.domain.entities.query_pattern import QueryPattern
 from src.domain.entities.metric import Metric, MetricType
 
 logger = logging.getLogger(__name__)
@@ -35,73 +40,15 @@ class CollectMetricsUseCase:
                 logger.warning(f"Database {database_id} not found or inactive.")
                 return []
 
-            # 2. Initialize collector
-            collector = PostgresCollector(database.encrypted_connection_string)
-
             try:
-                # 3. Set status to SYNCING
+                # 2. Set status to SYNCING
                 database.set_syncing()
                 await self.uow.databases.save(database)
                 await self.uow.commit() # Commit SYNCING status immediately
 
-                # 4. Collect slow queries
-                slow_queries_data = await collector.collect_slow_queries(threshold_ms=10.0, limit=20)
-                
-                queries_to_save = []
-                for q_data in slow_queries_data:
-                    # Generate a consistent fingerprint
-                    normalized_sql = SqlNormalizer.normalize(q_data["sql_text"])
-                    
-                    query = Query(
-                        database_id=database_id,
-                        sql_text=q_data["sql_text"],
-                        normalized_sql=normalized_sql, 
-                        execution_time_ms=q_data["mean_exec_time_ms"],
-                        timestamp=datetime.utcnow()
-                    )
-                    queries_to_save.append(query)
-                
-                new_query_ids = []
-                if queries_to_save:
-                    saved_queries = await self.uow.queries.save_all(queries_to_save)
-                    new_query_ids = [q.id for q in saved_queries]
-                    logger.info(f"Collected {len(queries_to_save)} queries for DB {database_id}")
-
-                # 5. Collect enhanced metrics
-                timestamp = datetime.utcnow()
-                metrics_to_save = []
-                
-                # QPS metric (query count)
-                metrics_to_save.append(Metric(
-                    database_id=database_id,
-                    metric_type=MetricType.QPS,
-                    value=float(len(slow_queries_data)),
-                    timestamp=timestamp,
-                    metadata={"captured_queries": len(slow_queries_data)}
-                ))
-                
-                # Average execution time
-                if slow_queries_data:
-                    avg_exec_time = sum(q["mean_exec_time_ms"] for q in slow_queries_data) / len(slow_queries_data)
-                    metrics_to_save.append(Metric(
-                        database_id=database_id,
-                        metric_type=MetricType.AVG_EXEC_TIME,
-                        value=avg_exec_time,
-                        timestamp=timestamp,
-                        metadata={"query_count": len(slow_queries_data)}
-                    ))
-                
-                # Save all metrics
-                for metric in metrics_to_save:
-                    await self.uow.metrics.save(metric)
-                
-                logger.info(f"Saved {len(metrics_to_save)} metrics for DB {database_id}")
-                
-                # 6. Update last collection timestamps and status
-                database.update_last_connected()
-                database.update_last_collection()
-                database.set_online()
-                await self.uow.databases.save(database)
+                # 3. Collect from the target, then persist
+                result = await self.gather(database)
+                new_query_ids = await self.persist(database, result)
 
                 await self.uow.commit()
                 return new_query_ids
@@ -122,3 +69,256 @@ class CollectMetricsUseCase:
                         logger.error(f"Failed to set offline status: {inner_e}")
 
                 raise
+
+    async def gather(self, database: Database) -> Dict[str, Any]:
+        """
+        Collect slow queries and metrics from the target database.
+        
+        Only talks to the monitored database; nothing is written to our own
+        database, so many targets can be gathered concurrently.
+        
+        Args:
+            database: Database to collect from.
+        
+        Returns:
+            Dict with the "queries" and "metrics" entities to persist.
+        """
+        database_id = database.id
+        collector = PostgresCollector(
+            database.encrypted_connection_string,
+            database_id=database_id,
+            pool_registry=get_pool_registry(),
+            snapshot_store=get_snapshot_store(),
+        )
+
+        # 1. Collect pg_stat_statements activity since the previous snapshot
+        interval = await collector.collect_statement_deltas()
+        slow_queries_data = []
+        metrics_to_save = []
+
+        if interval is None:
+            logger.info(f"Baseline snapshot taken for DB {database_id}, nothing to persist yet")
+        else:
+            slow_queries_data = select_slow_statements(
+                interval["statements"], threshold_ms=10.0, limit=20
+            )
+            # Only slow statements need their text, mostly served from cache
+            texts = await collector.get_query_texts(
+                [q["query_id"] for q in slow_queries_data]
+            )
+            slow_queries_data = [
+                {**q, "sql_text": texts[q["query_id"]]}
+                for q in slow_queries_data
+                if q["query_id"] in texts
+            ]
+        
+        # Generate consistent fingerprints (memoized, so only new texts are parsed)
+        normalized = SqlNormalizer.normalize_many([q["sql_text"] for q in slow_queries_data])
+        
+        queries_to_save = []
+        for q_data, normalized_sql in zip(slow_queries_data, normalized, strict=True):
+            query = Query(
+                database_id=database_id,
+                sql_text=q_data["sql_text"],
+                normalized_sql=normalized_sql, 
+                execution_time_ms=q_data["mean_exec_time_ms"],
+                timestamp=interval["collected_at"],
+                calls=q_data["calls"],
+                pg_query_id=int(q_data["query_id"]),
+                normalization_version=NORMALIZATION_VERSION,
+                fingerprint_hash=SqlNormalizer.fingerprint_hash(normalized_sql),
+            )
+            queries_to_save.append(query)
+
+        # 2. Collect interval rates
+        if interval is not None:
+            timestamp = interval["collected_at"]
+            interval_seconds = interval["interval_seconds"]
+            
+            # QPS: executions of all statements during the interval
+            metrics_to_save.append(Metric(
+                database_id=database_id,
+                metric_type=MetricType.QPS,
+                value=interval["calls"] / interval_seconds,
+                timestamp=timestamp,
+                metadata={
+                    "calls": interval["calls"],
+                    "interval_seconds": interval_seconds,
+                    "dealloc_gap": interval["dealloc_gap"],
+                }
+            ))
+            
+            # Average execution time, weighted by calls
+            if interval["calls"]:
+                metrics_to_save.append(Metric(
+                    database_id=database_id,
+                    metric_type=MetricType.AVG_EXEC_TIME,
+                    value=interval["total_exec_time_ms"] / interval["calls"],
+                    timestamp=timestamp,
+                    metadata={
+                        "calls": interval["calls"],
+                        "statement_count": len(interval["statements"]),
+                    }
+                ))
+        
+        # 3. Server-level gauges and rates
+        server_stats = await collector.collect_server_stats()
+        metrics_to_save.extend(self._server_metrics(database_id, server_stats))
+
+        return {"queries": queries_to_save, "metrics": metrics_to_save}
+
+    async def persist(self, database: Database, result: Dict[str, Any]) -> List[UUID]:
+        """
+        Save gathered queries and metrics and mark the database online.
+        
+        Does not commit, so several databases can share one transaction.
+        
+        Returns:
+            List of new slow query IDs.
+        """
+        new_query_ids = []
+        if result["queries"]:
+            # Texts and running statistics go to the fingerprint's pattern;
+            # the queries table keeps the per-interval samples.
+            await self.uow.query_patterns.upsert_all(QueryPattern.from_samples(result["queries"]))
+            saved_queries = await self.uow.queries.save_all(result["queries"])
+            new_query_ids = [q.id for q in saved_queries]
+            logger.info(f"Collected {len(saved_queries)} queries for DB {database.id}")
+
+        if result["metrics"]:
+            # Buffered and COPYed in batches, at the latest on commit
+            await self.uow.metrics.ingest(result["metrics"])
+        logger.info(f"Saved {len(result['metrics'])} metrics for DB {database.id}")
+        
+        # Update last collection timestamps and status
+        database.update_last_connected()
+        database.update_last_collection()
+        database.set_online()
+        await self.uow.databases.save(database)
+        return new_query_ids
+
+    def _server_metrics(self, database_id: UUID, stats: dict) -> List[Metric]:
+        """Map server stats to metrics. Rates are skipped until a baseline exists."""
+        timestamp = stats["collected_at"]
+        interval = {"interval_seconds": stats["interval_seconds"]}
+        metrics = [
+            Metric(
+                database_id=database_id,
+                metric_type=MetricType.CONN_COUNT,
+                value=float(stats["conn_count"]),
+                timestamp=timestamp,
+                metadata={
+                    "active": stats["active_connections"],
+                    "idle_in_transaction": stats["idle_in_transaction"],
+                }
+            ),
+            Metric(
+                database_id=database_id,
+                metric_type=MetricType.LOCK_WAIT_TIME,
+                value=stats["lock_wait_time_ms"],
+                timestamp=timestamp,
+                metadata={
+                    "waiters": stats["lock_waiters"],
+                    "locks_not_granted": stats["locks_not_granted"],
+                }
+            ),
+        ]
+
+        if stats["tps"] is not None:
+            metrics.append(Metric(
+                database_id=database_id,
+                metric_type=MetricType.TPS,
+                value=stats["tps"],
+                timestamp=timestamp,
+                metadata={**interval, "commits": stats["commits"], "rollbacks": stats["rollbacks"]}
+            ))
+        if stats["deadlocks"] is not None:
+            metrics.append(Metric(
+                database_id=database_id,
+                metric_type=MetricType.DEADLOCKS,
+                value=float(stats["deadlocks"]),
+                timestamp=timestamp,
+                metadata=interval
+            ))
+        if stats["cache_hit_ratio"] is not None:
+            metrics.append(Metric(
+                database_id=database_id,
+                metric_type=MetricType.CACHE_HIT_RATIO,
+                value=stats["cache_hit_ratio"],
+                timestamp=timestamp,
+                metadata={**interval, "table_cache_hit_ratio": stats["table_cache_hit_ratio"]}
+            ))
+        if stats["disk_reads_per_second"] is not None:
+            metrics.append(Metric(
+                database_id=database_id,
+                metric_type=MetricType.DISK_IO,
+                value=stats["disk_reads_per_second"],
+                timestamp=timestamp,
+                metadata={
+                    **interval,
+                    "read_bytes_per_second": stats["disk_read_bytes_per_second"],
+                    "read_time_ms": stats["blk_read_time_ms"],
+                    "temp_bytes": stats["temp_bytes"],
+                }
+            ))
+        return metrics
+
+
+class CollectShardUseCase:
+    """UseCase for collecting a shard of databases concurrently in one event loop."""
+
+    def __init__(self, uow: IUnitOfWork, concurrency: int = 50, timeout_seconds: float = 60.0):
+        self.uow = uow
+        self.concurrency = concurrency
+        self.timeout_seconds = timeout_seconds
+        self.collect = CollectMetricsUseCase(uow)
+
+    async def execute(self, database_ids: List[UUID]) -> Dict[UUID, List[UUID]]:
+        """
+        Gather every database concurrently, then persist all results at once.
+        
+        Network I/O is bounded by a semaphore and each target by a timeout.
+        Results, including OFFLINE statuses of failed targets, are written in
+        a single transaction.
+        
+        Args:
+            database_ids: IDs of the databases in this shard.
+        
+        Returns:
+            New slow query IDs per collected database.
+        """
+        async with self.uow:
+            databases = [
+                db for db in await self.uow.databases.get_by_ids(database_ids) if db.is_active
+            ]
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def gather_one(database: Database) -> Dict[str, Any]:
+                async with semaphore:
+                    return await asyncio.wait_for(
+                        self.collect.gather(database), timeout=self.timeout_seconds
+                    )
+
+            results = await asyncio.gather(
+                *(gather_one(db) for db in databases), return_exceptions=True
+            )
+
+            new_query_ids: Dict[UUID, List[UUID]] = {}
+            for database, result in zip(databases, results, strict=True):
+                if isinstance(result, BaseException):
+                    error = (
+                        f"Collection timed out after {self.timeout_seconds:.0f}s"
+                        if isinstance(result, asyncio.TimeoutError) else str(result)
+                    )
+                    logger.error(f"Error collecting from database {database.id}: {error}")
+                    database.set_offline(error)
+                    await self.uow.databases.save(database)
+                    continue
+                new_query_ids[database.id] = await self.collect.persist(database, result)
+
+            await self.uow.commit()
+
+        logger.info(
+            f"Collected {len(new_query_ids)} of {len(databases)} databases in shard"
+        )
+        return new_query_ids
@@ -1,8 +1,8 @@
 """Database management use cases."""
-from typing import List
+from typing import List, Optional
 from uuid import uuid4, UUID
 
-from src.application.dto.database_dto import DatabaseCreate, DatabaseRead
+from src.application.dto.database_dto import DatabaseCreate, DatabaseRead, DatabaseUpdate
 from src.application.interfaces.repositories.database_repository import IDatabaseRepository
 from src.domain.entities.database import Database
 
@@ -23,7 +23,9 @@ class RegisterDatabaseUseCase:
             name=db_create.name,
             db_type=db_create.type,
             encrypted_connection_string=db_create.connection_string,
-            database_id=uuid4()
+            database_id=uuid4(),
+            explain_cost_budget=db_create.explain_cost_budget,
+            explain_timeout_ms=db_create.explain_timeout_ms
         )
 
         saved_db = await self.db_repo.save(database)
@@ -42,6 +44,30 @@ class GetDatabasesUseCase:
         return [DatabaseRead.model_validate(db) for db in databases]
 
 
+class UpdateDatabaseUseCase:
+    """UseCase for updating a database's settings."""
+
+    def __init__(self, db_repo: IDatabaseRepository):
+        self.db_repo = db_repo
+
+    async def execute(
+        self, user_id: UUID, database_id: UUID, db_update: DatabaseUpdate
+    ) -> Optional[DatabaseRead]:
+        """Execute update. Returns None when the database does not exist."""
+        database = await self.db_repo.get_by_id(database_id)
+        if not database:
+            return None
+
+        if database.user_id != user_id:
+            raise PermissionError("User does not own this database")
+
+        for field, value in db_update.model_dump(exclude_unset=True).items():
+            setattr(database, field, value)
+
+        saved_db = await self.db_repo.save(database)
+        return DatabaseRead.model_validate(saved_db)
+
+
 class DeleteDatabaseUseCase:
     """UseCase for deleting a database."""
 
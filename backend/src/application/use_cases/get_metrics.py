@@ -1,22 +1,50 @@
 from datetime import datetime, timedelta
-from typing import List
+from typing import Optional
 from uuid import UUID
 
 from src.application.dto.metric_dto import MetricRead, MetricsResponse
 from src.application.interfaces.repositories.metric_repository import IMetricRepository
+from src.application.services.downsampling import downsample_metrics
+from src.domain.entities.metric import MetricResolution
+
+# Rollups are read with this many times the point budget, so LTTB has the
+# detail to keep peaks that a coarser bucket would average away.
+DOWNSAMPLE_OVERSAMPLING = 10
 
 class GetMetricsUseCase:
     def __init__(self, metric_repo: IMetricRepository):
         self._metric_repo = metric_repo
 
-    async def execute(self, db_id: UUID, hours: int = 1) -> MetricsResponse:
-        """Get metrics for a database for the last X hours."""
+    async def execute(
+        self,
+        db_id: UUID,
+        hours: int = 1,
+        resolution: Optional[timedelta] = None,
+        max_points: Optional[int] = None,
+    ) -> MetricsResponse:
+        """
+        Get metrics for a database for the last X hours.
+
+        Reads the coarsest rollup that meets ``resolution`` (widest acceptable
+        bucket) and ``DOWNSAMPLE_OVERSAMPLING * max_points``, then downsamples
+        each metric type to ``max_points`` with LTTB, so the response size
+        does not grow with the range. Without either, raw metrics are
+        returned.
+        """
         end_time = datetime.utcnow()
         start_time = end_time - timedelta(hours=hours)
+        chosen = MetricResolution.for_range(
+            (end_time - start_time).total_seconds(),
+            resolution_seconds=resolution.total_seconds() if resolution else None,
+            max_points=max_points * DOWNSAMPLE_OVERSAMPLING if max_points else None,
+        )
         
-        metrics = await self._metric_repo.get_by_database_id(db_id, start_time, end_time)
+        metrics = await self._metric_repo.get_rollups(db_id, start_time, end_time, chosen)
+        if max_points:
+            metrics = downsample_metrics(metrics, max_points)
         
         return MetricsResponse(
             database_id=db_id,
+            resolution=chosen,
             metrics=[MetricRead.from_orm(m) for m in metrics]
         )
@@ -0,0 +1,84 @@
+"""Use case for sampling active sessions (Active Session History)."""
+import asyncio
+import logging
+from typing import Dict, List
+from uuid import UUID
+
+from src.application.interfaces.unit_of_work import IUnitOfWork
+from src.domain.entities.database import Database
+from src.domain.entities.wait_event import WaitEventSample
+from src.infrastructure.collectors.ash_sampler import ActiveSessionSampler
+from src.infrastructure.collectors.connection_pool import get_pool_registry
+from src.infrastructure.collectors.postgres_collector import PostgresCollector
+
+logger = logging.getLogger(__name__)
+
+
+class SampleActiveSessionsUseCase:
+    """UseCase for sampling pg_stat_activity on a group of databases."""
+
+    def __init__(
+        self,
+        uow: IUnitOfWork,
+        interval_seconds: float = 1.0,
+        window_seconds: float = 55.0,
+        bucket_seconds: int = 60,
+        buffer_size: int = 100_000,
+    ):
+        self.uow = uow
+        self.interval_seconds = interval_seconds
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.buffer_size = buffer_size
+
+    async def execute(self, database_ids: List[UUID]) -> Dict[str, int]:
+        """
+        Sample every database concurrently for one window and persist aggregates.
+
+        Args:
+            database_ids: IDs of the databases to sample.
+
+        Returns:
+            Number of aggregated rows saved per database ID.
+        """
+        async with self.uow:
+            databases = []
+            for database_id in database_ids:
+                database = await self.uow.databases.get_by_id(database_id)
+                if database and database.is_active:
+                    databases.append(database)
+
+            results = await asyncio.gather(
+                *(self._sample(database) for database in databases),
+                return_exceptions=True,
+            )
+
+            saved = {}
+            for database, result in zip(databases, results, strict=True):
+                if isinstance(result, Exception):
+                    logger.warning(f"ASH sampling failed for DB {database.id}: {result}")
+                    continue
+                await self.uow.wait_events.save_all(result)
+                saved[str(database.id)] = len(result)
+
+            await self.uow.commit()
+            return saved
+
+    async def _sample(self, database: Database) -> List[WaitEventSample]:
+        """Sample one database for the configured window."""
+        collector = PostgresCollector(
+            database.encrypted_connection_string,
+            database_id=database.id,
+            pool_registry=get_pool_registry(),
+        )
+        sampler = ActiveSessionSampler(collector, buffer_size=self.buffer_size)
+        await sampler.run(self.window_seconds, interval_seconds=self.interval_seconds)
+
+        return [
+            WaitEventSample(
+                database_id=database.id,
+                sample_interval_seconds=self.interval_seconds,
+                **aggregate,
+            )
+            for aggregate in sampler.drain(self.bucket_seconds)
+        ]
@@ -0,0 +1,86 @@
+"""Use case for dispatching collections that are due under the adaptive schedule."""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from src.application.interfaces.unit_of_work import IUnitOfWork
+from src.application.services.collection_scheduler import CollectionScheduler
+from src.application.use_cases.analyze_trends import (
+    REGRESSION_MIN_INCREASE_MS,
+    regression_severity,
+)
+from src.domain.entities.metric import MetricType
+from src.domain.entities.user import PlanTier
+
+logger = logging.getLogger(__name__)
+
+
+class DispatchDueCollectionsUseCase:
+    """Picks the databases that are due and schedules their next collection."""
+
+    def __init__(self, uow: IUnitOfWork, scheduler: CollectionScheduler):
+        self.uow = uow
+        self.scheduler = scheduler
+
+    async def execute(self, now: Optional[datetime] = None, limit: int = 1000) -> List[UUID]:
+        """
+        Claim the due databases and compute when each is due again.
+
+        Due rows are locked (skipping rows a concurrent dispatch holds) until
+        every next due time is written in one commit, so overlapping
+        dispatches never claim the same database. Inputs are plan tier,
+        latest QPS and, as a cheap regression signal, how much slower the
+        recent samples are than each fingerprint's running mean (one query
+        for all due databases). Setting the next due time before collecting
+        also keeps the next dispatch from picking the same database up while
+        it is being collected.
+
+        Args:
+            now: Current time (defaults to utcnow).
+            limit: Maximum number of databases to dispatch.
+
+        Returns:
+            IDs of the databases to collect now.
+        """
+        now = now or datetime.utcnow()
+        async with self.uow:
+            due = await self.uow.databases.get_due_for_collection(now, limit=limit)
+            if not due:
+                return []
+
+            tiers: Dict[UUID, PlanTier] = {}
+            intervals: Dict[UUID, float] = {}
+            activity_since = now - timedelta(seconds=self.scheduler.max_interval_seconds * 2)
+            regression_ratios = await self.uow.query_patterns.get_regression_ratios(
+                [database.id for database in due],
+                activity_since,
+                min_increase_ms=REGRESSION_MIN_INCREASE_MS,
+            )
+
+            for database in due:
+                if database.user_id not in tiers:
+                    user = await self.uow.users.get_by_id(database.user_id)
+                    tiers[database.user_id] = user.plan_tier if user else PlanTier.FREE
+
+                qps = await self.uow.metrics.get_latest(database.id, MetricType.QPS, activity_since)
+                ratio = regression_ratios.get(database.id)
+
+                intervals[database.id] = self.scheduler.next_interval(
+                    tiers[database.user_id],
+                    connection_status=database.connection_status,
+                    consecutive_failures=database.consecutive_failures,
+                    calls_per_second=qps.value if qps else None,
+                    regression_severity=regression_severity(ratio) if ratio else None,
+                )
+
+            for database in due:
+                database.schedule_next_collection(
+                    self.scheduler.next_due(now, intervals[database.id])
+                )
+                await self.uow.databases.save(database)
+
+            await self.uow.commit()
+
+        logger.info(f"Dispatching {len(due)} due collections")
+        return [database.id for database in due]
@@ -62,6 +62,57 @@ class Settings(BaseSettings):
     # Rate Limiting
     rate_limit_per_minute: int = Field(default=60, alias="RATE_LIMIT_PER_MINUTE")
     
+    # Collector connection pools (per monitored database)
+    collector_pool_max_size: int = Field(default=2, alias="COLLECTOR_POOL_MAX_SIZE")
+    collector_pool_idle_timeout_seconds: float = Field(
+        default=600.0, alias="COLLECTOR_POOL_IDLE_TIMEOUT_SECONDS"
+    )
+    collector_pool_ping_interval_seconds: float = Field(
+        default=60.0, alias="COLLECTOR_POOL_PING_INTERVAL_SECONDS"
+    )
+    collector_connect_timeout_seconds: float = Field(
+        default=10.0, alias="COLLECTOR_CONNECT_TIMEOUT_SECONDS"
+    )
+    
+    # Collection mode: "per_database" (one task per database) or "sharded"
+    # (one task collects a shard of databases concurrently)
+    collection_mode: str = Field(default="per_database", alias="COLLECTION_MODE")
+    collection_shard_size: int = Field(default=200, alias="COLLECTION_SHARD_SIZE")
+    collection_concurrency: int = Field(default=50, alias="COLLECTION_CONCURRENCY")
+    collection_timeout_seconds: float = Field(default=60.0, alias="COLLECTION_TIMEOUT_SECONDS")
+    
+    # Adaptive collection schedule (base interval comes from the plan tier)
+    collection_min_interval_seconds: float = Field(default=60.0, alias="COLLECTION_MIN_INTERVAL_SECONDS")
+    collection_max_interval_seconds: float = Field(default=3600.0, alias="COLLECTION_MAX_INTERVAL_SECONDS")
+    collection_max_backoff_seconds: float = Field(default=21600.0, alias="COLLECTION_MAX_BACKOFF_SECONDS")
+    collection_jitter: float = Field(default=0.1, alias="COLLECTION_JITTER")
+    
+    # EXPLAIN safety defaults (overridable per database)
+    explain_cost_budget: float = Field(default=10000.0, alias="EXPLAIN_COST_BUDGET")
+    explain_timeout_ms: int = Field(default=5000, alias="EXPLAIN_TIMEOUT_MS")
+    
+    # Active Session History (pg_stat_activity sampling)
+    ash_sample_interval_seconds: float = Field(default=1.0, alias="ASH_SAMPLE_INTERVAL_SECONDS")
+    ash_sample_window_seconds: float = Field(default=55.0, alias="ASH_SAMPLE_WINDOW_SECONDS")
+    ash_bucket_seconds: int = Field(default=60, alias="ASH_BUCKET_SECONDS")
+    ash_buffer_size: int = Field(default=100_000, alias="ASH_BUFFER_SIZE")
+    ash_shard_size: int = Field(default=50, alias="ASH_SHARD_SIZE")
+    
+    # Metric ingestion: buffered metrics are COPYed when either limit is hit
+    metric_ingest_batch_size: int = Field(default=5000, alias="METRIC_INGEST_BATCH_SIZE")
+    metric_ingest_max_latency_seconds: float = Field(
+        default=5.0, alias="METRIC_INGEST_MAX_LATENCY_SECONDS"
+    )
+    
+    # TimescaleDB policies for the metrics hypertable (retention 0 keeps everything,
+    # otherwise it must exceed the 7-day rollup refresh window)
+    metrics_compress_after_hours: int = Field(default=24, alias="METRICS_COMPRESS_AFTER_HOURS")
+    metrics_retention_days: int = Field(default=90, alias="METRICS_RETENTION_DAYS")
+    
+    # Workload index advisor budget per database (max bytes 0 = count only)
+    index_advisor_max_indexes: int = Field(default=5, alias="INDEX_ADVISOR_MAX_INDEXES")
+    index_advisor_max_bytes: int = Field(default=0, alias="INDEX_ADVISOR_MAX_BYTES")
+    
     @property
     def is_production(self) -> bool:
         """Check if environment is production."""
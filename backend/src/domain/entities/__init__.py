@@ -1,21 +1,26 @@
 """Domain entities."""
 from .database import Database, DatabaseType, ConnectionStatus
-from .metric import Metric, MetricType
+from .metric import Metric, MetricResolution, MetricType
 from .query import Query, QueryStatus
+from .query_pattern import QueryPattern
 from .recommendation import Recommendation, RecommendationType, RecommendationStatus
 from .user import User, PlanTier
+from .wait_event import WaitEventSample
 
 __all__ = [
     "Database",
     "DatabaseType",
     "ConnectionStatus",
     "Metric",
+    "MetricResolution",
     "MetricType",
     "Query",
     "QueryStatus",
+    "QueryPattern",
     "Recommendation",
     "RecommendationType",
     "RecommendationStatus",
     "User",
     "PlanTier",
+    "WaitEventSample",
 ]
@@ -36,6 +36,10 @@ class Database:
         connection_status: ConnectionStatus = ConnectionStatus.UNKNOWN,
         connection_error: Optional[str] = None,
         last_checked_at: Optional[datetime] = None,
+        explain_cost_budget: Optional[float] = None,
+        explain_timeout_ms: Optional[int] = None,
+        next_collection_at: Optional[datetime] = None,
+        consecutive_failures: int = 0,
     ):
         self.id = database_id or uuid4()
         self.user_id = user_id
@@ -46,6 +50,12 @@ class Database:
         self.connection_status = connection_status
         self.connection_error = connection_error
         self.last_checked_at = last_checked_at
+        # EXPLAIN ANALYZE limits for this database (None uses the global defaults)
+        self.explain_cost_budget = explain_cost_budget
+        self.explain_timeout_ms = explain_timeout_ms
+        # Adaptive collection schedule (None means due now)
+        self.next_collection_at = next_collection_at
+        self.consecutive_failures = consecutive_failures
         self.created_at = datetime.utcnow()
         self.last_connected_at: Optional[datetime] = None
         self.last_collection_at: Optional[datetime] = None
@@ -70,12 +80,14 @@ class Database:
         """Set connection status to ONLINE."""
         self.connection_status = ConnectionStatus.ONLINE
         self.connection_error = None
+        self.consecutive_failures = 0
         self.last_checked_at = datetime.utcnow()
     
     def set_offline(self, error: str) -> None:
         """Set connection status to OFFLINE with error message."""
         self.connection_status = ConnectionStatus.OFFLINE
         self.connection_error = error
+        self.consecutive_failures += 1
         self.last_checked_at = datetime.utcnow()
     
     def set_syncing(self) -> None:
@@ -83,5 +95,9 @@ class Database:
         self.connection_status = ConnectionStatus.SYNCING
         self.last_checked_at = datetime.utcnow()
     
+    def schedule_next_collection(self, due_at: datetime) -> None:
+        """Set when the database should be collected next."""
+        self.next_collection_at = due_at
+    
     def __repr__(self) -> str:
         return f"<Database {self.name} ({self.type})>"
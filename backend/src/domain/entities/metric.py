@@ -17,6 +17,64 @@ class MetricType(str, Enum):
     DISK_IO = "disk_io"  # Disk I/O operations
 
 
+class MetricResolution(str, Enum):
+    """Time buckets metrics can be read at (raw rows or a rollup)."""
+    RAW = "raw"
+    MINUTE = "1m"
+    HOUR = "1h"
+    DAY = "1d"
+
+    @property
+    def seconds(self) -> int:
+        """Bucket width in seconds (0 for raw rows)."""
+        return _RESOLUTION_SECONDS[self]
+
+    @classmethod
+    def for_range(
+        cls,
+        range_seconds: float,
+        resolution_seconds: Optional[float] = None,
+        max_points: Optional[int] = None,
+    ) -> "MetricResolution":
+        """
+        Pick the coarsest resolution that still meets the request.
+
+        A requested resolution allows any bucket no wider than it (5 minutes
+        reads the 1m rollup). A point budget requires buckets at least
+        ``range_seconds / max_points`` wide, per metric type. When both are
+        given the budget wins, so responses never exceed it.
+
+        Args:
+            range_seconds: Length of the requested time range.
+            resolution_seconds: Widest acceptable bucket.
+            max_points: Maximum number of points per metric type.
+
+        Returns:
+            RAW when neither limit is given.
+        """
+        ordered = list(cls)
+        choice = cls.RAW
+        if resolution_seconds is not None:
+            choice = max(
+                (r for r in ordered if r.seconds <= resolution_seconds),
+                key=lambda r: r.seconds,
+            )
+        if max_points:
+            needed = range_seconds / max_points
+            budget = next((r for r in ordered if r.seconds >= needed), cls.DAY)
+            if budget.seconds > choice.seconds:
+                choice = budget
+        return choice
+
+
+_RESOLUTION_SECONDS = {
+    MetricResolution.RAW: 0,
+    MetricResolution.MINUTE: 60,
+    MetricResolution.HOUR: 3600,
+    MetricResolution.DAY: 86400,
+}
+
+
 class Metric:
     """Metric entity for storing time-series performance data."""
     
@@ -27,12 +27,20 @@ class Query:
         timestamp: datetime,
         explain_plan: Optional[Dict] = None,
         query_id: Optional[UUID] = None,
+        calls: Optional[int] = None,
+        pg_query_id: Optional[int] = None,
+        normalization_version: int = 1,
+        fingerprint_hash: Optional[int] = None,
     ):
         self.id = query_id or uuid4()
         self.database_id = database_id
         self.sql_text = sql_text
         self.normalized_sql = normalized_sql
-        self.execution_time_ms = execution_time_ms
+        self.execution_time_ms = execution_time_ms  # Mean latency over the collection interval
+        self.calls = calls  # Executions during the collection interval
+        self.pg_query_id = pg_query_id  # pg_stat_statements queryid on the target
+        self.normalization_version = normalization_version  # Rules that produced normalized_sql
+        self.fingerprint_hash = fingerprint_hash  # 64-bit key of normalized_sql for grouping
         self.explain_plan = explain_plan
         self.timestamp = timestamp
         self.status = QueryStatus.SLOW if execution_time_ms > 10.0 else QueryStatus.NORMAL
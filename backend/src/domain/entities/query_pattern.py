@@ -0,0 +1,117 @@
+"""Query pattern entity: running statistics of one fingerprint."""
+import math
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from src.domain.entities.query import Query
+
+
+class QueryPattern:
+    """Rolling statistics of a fingerprint on one database.
+
+    Each collected sample is a per-interval mean latency over ``calls``
+    executions, so sums are weighted by calls: the mean is per execution and
+    the standard deviation is that of the interval means.
+    """
+
+    def __init__(
+        self,
+        database_id: UUID,
+        fingerprint_hash: int,
+        normalized_sql: str,
+        sample_sql: str,
+        first_seen: datetime,
+        last_seen: datetime,
+        sample_count: int = 0,
+        total_calls: int = 0,
+        total_exec_time_ms: float = 0.0,
+        sum_sq_exec_time_ms: float = 0.0,
+        min_exec_time_ms: Optional[float] = None,
+        max_exec_time_ms: Optional[float] = None,
+    ):
+        self.database_id = database_id
+        self.fingerprint_hash = fingerprint_hash
+        self.normalized_sql = normalized_sql
+        self.sample_sql = sample_sql  # Latest raw text, for display and EXPLAIN
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.sample_count = sample_count
+        self.total_calls = total_calls
+        self.total_exec_time_ms = total_exec_time_ms  # sum(mean * calls)
+        self.sum_sq_exec_time_ms = sum_sq_exec_time_ms  # sum(mean^2 * calls)
+        self.min_exec_time_ms = min_exec_time_ms
+        self.max_exec_time_ms = max_exec_time_ms
+
+    @classmethod
+    def from_samples(cls, queries: List[Query]) -> List["QueryPattern"]:
+        """Fold query samples into one pattern per (database, fingerprint)."""
+        patterns: Dict[Tuple[UUID, int], QueryPattern] = {}
+        for query in queries:
+            key = (query.database_id, query.fingerprint_hash)
+            pattern = patterns.get(key)
+            if pattern is None:
+                pattern = patterns[key] = cls(
+                    database_id=query.database_id,
+                    fingerprint_hash=query.fingerprint_hash,
+                    normalized_sql=query.normalized_sql,
+                    sample_sql=query.sql_text,
+                    first_seen=query.timestamp,
+                    last_seen=query.timestamp,
+                )
+            pattern.record(query)
+        return list(patterns.values())
+
+    def record(self, query: Query) -> None:
+        """Add one per-interval sample."""
+        calls = query.calls or 1  # Legacy samples without a call count weigh as one
+        latency = query.execution_time_ms
+
+        self.sample_count += 1
+        self.total_calls += calls
+        self.total_exec_time_ms += latency * calls
+        self.sum_sq_exec_time_ms += latency * latency * calls
+        self.min_exec_time_ms = latency if self.min_exec_time_ms is None else min(self.min_exec_time_ms, latency)
+        self.max_exec_time_ms = latency if self.max_exec_time_ms is None else max(self.max_exec_time_ms, latency)
+        self.first_seen = min(self.first_seen, query.timestamp)
+        if query.timestamp >= self.last_seen:
+            self.last_seen = query.timestamp
+            self.sample_sql = query.sql_text
+
+    def merge(self, other: "QueryPattern") -> None:
+        """Add the statistics of another pattern, e.g. an older fingerprint of the same statement."""
+        self.sample_count += other.sample_count
+        self.total_calls += other.total_calls
+        self.total_exec_time_ms += other.total_exec_time_ms
+        self.sum_sq_exec_time_ms += other.sum_sq_exec_time_ms
+        if other.min_exec_time_ms is not None:
+            self.min_exec_time_ms = (
+                other.min_exec_time_ms if self.min_exec_time_ms is None
+                else min(self.min_exec_time_ms, other.min_exec_time_ms)
+            )
+        if other.max_exec_time_ms is not None:
+            self.max_exec_time_ms = (
+                other.max_exec_time_ms if self.max_exec_time_ms is None
+                else max(self.max_exec_time_ms, other.max_exec_time_ms)
+            )
+        self.first_seen = min(self.first_seen, other.first_seen)
+        if other.last_seen >= self.last_seen:
+            self.last_seen = other.last_seen
+            self.sample_sql = other.sample_sql
+
+    @property
+    def mean_exec_time_ms(self) -> float:
+        """Mean latency per execution."""
+        return self.total_exec_time_ms / self.total_calls if self.total_calls else 0.0
+
+    @property
+    def stddev_exec_time_ms(self) -> float:
+        """Call-weighted standard deviation of the interval means."""
+        if not self.total_calls:
+            return 0.0
+        mean = self.mean_exec_time_ms
+        # Clamp float rounding below zero
+        return math.sqrt(max(self.sum_sq_exec_time_ms / self.total_calls - mean * mean, 0.0))
+
+    def __repr__(self) -> str:
+        return f"<QueryPattern {self.fingerprint_hash} x{self.total_calls}>"
@@ -17,6 +17,7 @@ class RecommendationType(str, Enum):
     AVOID_N_PLUS_ONE = "avoid_n_plus_one"  # Fix N+1 query pattern
     SCALING = "scaling"  # Scale database resources
     SCHEMA_CHANGE = "schema_change"  # Change table schema (e.g. data type)
+    CONFIGURATION = "configuration"  # Tune a server setting (e.g. work_mem)
 
 
 class RecommendationStatus(str, Enum):
@@ -0,0 +1,42 @@
+"""Wait event sample entity for Active Session History."""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+
+class WaitEventSample:
+    """Aggregated pg_stat_activity samples for one time bucket.
+
+    Each row counts how many times a session was seen running a statement
+    (query_id) in a given state and wait event during the bucket.
+    """
+    
+    def __init__(
+        self,
+        database_id: UUID,
+        bucket_start: datetime,
+        state: str,
+        sample_count: int,
+        sample_interval_seconds: float,
+        query_id: Optional[int] = None,
+        wait_event_type: Optional[str] = None,
+        wait_event: Optional[str] = None,
+        sample_id: Optional[UUID] = None,
+    ):
+        self.id = sample_id or uuid4()
+        self.database_id = database_id
+        self.bucket_start = bucket_start
+        self.query_id = query_id  # pg_stat_statements queryid (PostgreSQL 14+)
+        self.state = state
+        self.wait_event_type = wait_event_type  # None while running on CPU
+        self.wait_event = wait_event
+        self.sample_count = sample_count
+        self.sample_interval_seconds = sample_interval_seconds
+    
+    @property
+    def db_time_seconds(self) -> float:
+        """Estimated session time represented by these samples."""
+        return self.sample_count * self.sample_interval_seconds
+    
+    def __repr__(self) -> str:
+        return f"<WaitEventSample {self.wait_event_type}:{self.wait_event} x{self.sample_count}>"
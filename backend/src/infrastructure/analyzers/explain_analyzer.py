@@ -1,119 +1,63 @@
 """EXPLAIN plan analyzer for identifying performance bottlenecks."""
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
-from src.domain.entities.recommendation import RecommendationType
+from src.infrastructure.analyzers.plan_metrics import compute_plan_metrics, plan_settings, root_plan
+from src.infrastructure.analyzers.plan_rules import PlanRuleRegistry, default_plan_rules
 
 logger = logging.getLogger(__name__)
 
 class ExplainAnalyzer:
     """Production-ready analyzer for PostgreSQL EXPLAIN plans (JSON format)."""
 
+    def __init__(self, rules: Optional[PlanRuleRegistry] = None):
+        self.rules = rules or default_plan_rules()
+        # Cumulative per-rule cost, keyed by "name@vN": calls, findings, seconds
+        self.rule_stats: Dict[str, Dict[str, float]] = {}
+
     def analyze(self, plan_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Analyze an EXPLAIN plan and return a list of performance findings.
         
+        Per-node metrics (exclusive time, buffers, estimate error, share of
+        the runtime) are computed once, then each node runs only the rules
+        registered for its node type. Impact is the node's share of the
+        runtime (of the cost without ANALYZE), weighted by the rule.
+
         Args:
-            plan_data: The full JSON output from EXPLAIN (FORMAT JSON, ANALYZE)
+            plan_data: The full JSON output from EXPLAIN (FORMAT JSON, ANALYZE,
+                BUFFERS, SETTINGS); BUFFERS and SETTINGS feed the spill rules
         """
         findings = []
+        elapsed: Dict[Any, List[float]] = {}
+        clock = time.perf_counter
         
-        # PostgreSQL puts the plan under a "Plan" key in the first element of the list
-        plan = plan_data.get("Plan", plan_data)
-        if isinstance(plan_data, list) and plan_data:
-            plan = plan_data[0].get("Plan", plan_data[0])
-
-        self._analyze_node(plan, findings)
+        for m in compute_plan_metrics(root_plan(plan_data), plan_settings(plan_data)):
+            for rule in self.rules.rules_for(m.node_type):
+                started = clock()
+                finding = rule.check(m)
+                stats = elapsed.get(rule)
+                if stats is None:
+                    stats = elapsed[rule] = [0, 0, 0.0]
+                stats[0] += 1
+                stats[2] += clock() - started
+                if finding is not None:
+                    stats[1] += 1
+                    findings.append(finding)
+
+        self._record_stats(elapsed)
         
         # Sort findings by impact (descending)
         findings.sort(key=lambda x: x["impact"], reverse=True)
         return findings
 
-    def _analyze_node(self, node: Dict[str, Any], findings: List[Dict[str, Any]]):
-        """Recursively analyze nodes in the plan tree."""
-        node_type = node.get("Node Type")
-        
-        # 1. Sequential Scans on large tables
-        if node_type == "Seq Scan":
-            plan_rows = node.get("Plan Rows", 0)
-            if plan_rows > 1000:
-                findings.append({
-                    "type": RecommendationType.INDEX,
-                    "title": f"Sequential Scan on {node.get('Relation Name')}",
-                    "description": (
-                        f"The query is performing a full table scan on {node.get('Relation Name')}. "
-                        f"Estimated {plan_rows} rows will be processed. Adding an index could "
-                        "significantly speed up this operation."
-                    ),
-                    "impact": self._calculate_impact(node, weight=0.8),
-                    "confidence": 0.9,
-                    "node_details": node
-                })
-
-        # 2. Large Nested Loops
-        elif node_type == "Nested Loop":
-            actual_rows = node.get("Actual Rows", node.get("Plan Rows", 0))
-            if actual_rows > 5000:
-                findings.append({
-                    "type": RecommendationType.REWRITE,
-                    "title": "Expensive Nested Loop Join",
-                    "description": (
-                        f"A Nested Loop join is processing {actual_rows} rows. This is often "
-                        "inefficient for large datasets. Consider using a Hash Join or Merge Join "
-                        "by ensuring indexes are available on join columns."
-                    ),
-                    "impact": self._calculate_impact(node, weight=0.7),
-                    "confidence": 0.75,
-                    "node_details": node
-                })
-
-        # 3. Mismatched Statistics (Outdated Stats)
-        plan_rows = node.get("Plan Rows", 0)
-        actual_rows = node.get("Actual Rows", None)
-        if actual_rows is not None and plan_rows > 0:
-            ratio = max(actual_rows, 1) / max(plan_rows, 1)
-            if ratio > 10 or ratio < 0.1:
-                findings.append({
-                    "type": RecommendationType.REWRITE,  # Changed from SCHEMA_CHANGE
-                    "title": f"Outdated Statistics for {node.get('Relation Name', node_type)}",
-                    "description": (
-                        f"The query planner estimated {plan_rows} rows but actually processed {actual_rows}. "
-                        "Stale statistics can lead to poor execution plans. Running ANALYZE on this "
-                        "table is recommended."
-                    ),
-                    "impact": 0.5,
-                    "confidence": 0.8,
-                    "node_details": node
-                })
-
-        # 4. Sorting in Memory (Large Sorts)
-        if node_type == "Sort":
-            actual_rows = node.get("Actual Rows", node.get("Plan Rows", 0))
-            if actual_rows > 10000:
-                findings.append({
-                    "type": RecommendationType.INDEX,
-                    "title": f"Large Memory Sort ({actual_rows} rows)",
-                    "description": (
-                        "The query is sorting a large amount of data in memory. An index on the "
-                        "ORDER BY columns could eliminate the need for an explicit sort."
-                    ),
-                    "impact": self._calculate_impact(node, weight=0.6),
-                    "confidence": 0.85,
-                    "node_details": node
-                })
-
-        # Recursively analyze children
-        if "Plans" in node:
-            for child in node["Plans"]:
-                self._analyze_node(child, findings)
-
-    def _calculate_impact(self, node: Dict[str, Any], weight: float) -> float:
-        """Calculate a normalized impact score (0-1)."""
-        # Base impact from cost
-        total_cost = node.get("Total Cost", 0)
-        # Logarithmic scaling for cost to keep impact sensible
-        # A cost of 1000 -> approx 0.3, 100,000 -> approx 0.8
-        import math
-        cost_score = min(math.log10(max(total_cost, 1)) / 6, 1.0)
-        
-        return round(cost_score * weight, 2)
+    def _record_stats(self, elapsed: Dict[Any, List[float]]) -> None:
+        for rule, (calls, found, seconds) in elapsed.items():
+            key = f"{rule.name}@v{rule.version}"
+            stats = self.rule_stats.setdefault(key, {"calls": 0, "findings": 0, "seconds": 0.0})
+            stats["calls"] += calls
+            stats["findings"] += found
+            stats["seconds"] += seconds
+            if seconds > 0.05:
+                logger.warning(f"Plan rule {key} took {seconds * 1000:.0f} ms on {calls} nodes")
@@ -1,50 +1,34 @@
 """Index recommendation engine for generating CREATE INDEX suggestions."""
 import re
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from src.domain.entities.recommendation import RecommendationType
+from src.infrastructure.collectors.catalog_snapshot import CatalogSnapshot, TableCatalog
 
-from src.domain.entities.recommendation import RecommendationType
+# Finding rules candidates() turns into index column sets
+INDEX_CANDIDATE_RULES = frozenset({"seq_scan", "large_sort", "sort_spill"})
 
 class IndexAnalyzer:
     """Production-ready index recommendation engine."""
 
-    def analyze(self, sql_text: str, explain_findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def analyze(
+        self,
+        sql_text: str,
+        explain_findings: List[Dict[str, Any]],
+        catalog: Optional[CatalogSnapshot] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Analyze a query and its EXPLAIN findings to recommend indexes.
         
         Args:
             sql_text: Original SQL query text
             explain_findings: Findings from ExplainAnalyzer
+            catalog: Catalog of the scanned tables, see candidates()
         """
-        recommendations = []
-        
-        # We focus on Seq Scans and Sorts from the ExplainAnalyzer
-        for finding in explain_findings:
-            node = finding["node_details"]
-            node_type = node.get("Node Type")
-            
-            if node_type == "Seq Scan":
-                table_name = node.get("Relation Name")
-                filter_text = node.get("Filter", "")
-                
-                if not table_name:
-                    continue
-                    
-                columns = self._extract_columns_from_filter(filter_text)
-                if columns:
-                    recommendations.append(self._create_index_rec(table_name, columns, "cost reduction"))
-            
-            elif node_type == "Sort":
-                # Check for Sort Key
-                sort_keys = node.get("Sort Key", [])
-                # If there's a child Seq Scan, we can optimize the sort by adding an index
-                # This is a simplification; in reality, we'd check the entire branch
-                table_name = self._find_target_table(node)
-                if table_name and sort_keys:
-                    columns = self._extract_columns_from_sort_keys(sort_keys)
-                    if columns:
-                        recommendations.append(self._create_index_rec(table_name, columns, "sort optimization"))
+        recommendations = [
+            self._create_index_rec(table_name, columns, reason)
+            for table_name, columns, reason, _ in self.candidates(explain_findings, catalog)
+        ]
         
         # Deduplicate recommendations by title
         unique_recs = []
@@ -56,6 +40,71 @@ class IndexAnalyzer:
                 
         return unique_recs
 
+    def candidates(
+        self,
+        explain_findings: List[Dict[str, Any]],
+        catalog: Optional[CatalogSnapshot] = None,
+    ) -> List[Tuple[str, List[str], str, Dict[str, Any]]]:
+        """
+        Index column sets the findings point to, in finding order.
+        
+        With a catalog snapshot, columns the table does not have are dropped,
+        equality filter columns are ordered most selective first (ahead of
+        range columns), and candidates an existing index already covers as a
+        key prefix are skipped.
+        
+        Args:
+            explain_findings: Findings from ExplainAnalyzer
+            catalog: Catalog of the scanned tables, if available
+        
+        Returns:
+            (table, columns, reason, finding) tuples; columns are in index order.
+        """
+        candidates = []
+        
+        # We focus on the Seq Scan and Sort findings of the ExplainAnalyzer
+        for finding in explain_findings:
+            node = finding["node_details"]
+            rule = finding.get("rule")
+            table_name = finding.get("relation")
+            if not table_name:
+                continue
+            table = catalog.table(table_name, node.get("Schema")) if catalog else None
+            
+            if rule == "seq_scan":
+                filter_text = node.get("Filter", "")
+                columns = self._known_columns(table, self._extract_columns_from_filter(filter_text))
+                if not columns:
+                    continue
+                if table is not None:
+                    equality = set(self._extract_equality_columns(filter_text))
+                    columns = table.order_by_selectivity(
+                        [c for c in columns if c in equality]
+                    ) + [c for c in columns if c not in equality]
+                    if table.covering_index(columns, ordered=False):
+                        continue
+                candidates.append((table_name, columns, "cost reduction", finding))
+            
+            elif rule in ("large_sort", "sort_spill"):
+                # Sort rules report the first relation scanned below the sort
+                sort_keys = node.get("Sort Key", [])
+                columns = self._extract_columns_from_sort_keys(sort_keys) if sort_keys else []
+                columns = self._known_columns(table, columns)
+                if not columns:
+                    continue
+                if table is not None and table.covering_index(columns):
+                    continue
+                candidates.append((table_name, columns, "sort optimization", finding))
+        
+        return candidates
+
+    @staticmethod
+    def _known_columns(table: Optional[TableCatalog], columns: List[str]) -> List[str]:
+        """Drop extracted names that are not columns of the table, when known."""
+        if table is None or not table.columns:
+            return columns
+        return [c for c in columns if c in table.columns]
+
     def _create_index_rec(self, table_name: str, columns: List[str], reason: str) -> Dict[str, Any]:
         """Helper to create a recommendation dictionary."""
         index_cols = ", ".join(columns)
@@ -94,26 +143,19 @@ class IndexAnalyzer:
                 seen.add(c)
         return unique_cols
 
+    def _extract_equality_columns(self, filter_text: str) -> List[str]:
+        """Columns compared with = (including = ANY lists) in a filter string."""
+        clean_text = re.sub(r'::\w+', '', filter_text or "")
+        return [col.lower() for col in re.findall(r'(\w+)\s*=(?!=)', clean_text)]
+
     def _extract_columns_from_sort_keys(self, sort_keys: Any) -> List[str]:
         """Extract column names from sort keys (e.g. ['(id DESC)', 'name'])."""
         import re
         cols = []
         keys = [sort_keys] if isinstance(sort_keys, str) else sort_keys
         for key in keys:
-            # Match first word that looks like an identifier
-            match = re.search(r'(\w+)', key)
+            # Match first word that looks like an identifier, past any table alias
+            match = re.search(r'(?:\w+\.)?(\w+)', key)
             if match:
                 cols.append(match.group(1).lower())
         return cols
-
-    def _find_target_table(self, node: Dict[str, Any]) -> Optional[str]:
-        """Recursively search for a Relation Name in the children of a node."""
-        if "Relation Name" in node:
-            return node["Relation Name"]
-        
-        if "Plans" in node:
-            for child in node["Plans"]:
-                table = self._find_target_table(child)
-                if table:
-                    return table
-        return None
@@ -0,0 +1,182 @@
+"""Derived per-node metrics of an EXPLAIN (FORMAT JSON) plan."""
+from typing import Any, Dict, List, Optional
+
+# Cumulative buffer counters EXPLAIN (BUFFERS) reports per node
+BUFFER_KEYS = (
+    "Shared Hit Blocks",
+    "Shared Read Blocks",
+    "Shared Dirtied Blocks",
+    "Shared Written Blocks",
+    "Local Hit Blocks",
+    "Local Read Blocks",
+    "Temp Read Blocks",
+    "Temp Written Blocks",
+)
+BUFFER_KEYS_SET = frozenset(BUFFER_KEYS)
+
+
+class PlanNodeMetrics:
+    """
+    Metrics of one plan node, derived from the node and its children.
+
+    Times and rows are totals over all loops. Inclusive values cover the
+    node's subtree, exclusive values the node alone (inclusive minus the
+    children's inclusive values). Without ANALYZE, the time fields are None
+    and shares are computed from costs instead. Shares are fractions of the
+    whole plan's execution time (or cost).
+    """
+
+    __slots__ = (
+        "node", "parent", "depth", "node_type", "loops",
+        "plan_rows", "actual_rows", "rows",
+        "inclusive_time_ms", "inclusive_cost", "row_estimate_ratio", "inclusive_share",
+        "subtree_relation", "settings",
+        "_exclusive_time", "_exclusive_cost", "_buffers", "_total",
+    )
+
+    def __init__(
+        self,
+        node: Dict[str, Any],
+        parent: Optional[int] = None,
+        depth: int = 0,
+        total: Optional[float] = None,
+        settings: Optional[Dict[str, str]] = None,
+    ):
+        get = node.get
+        self.node = node
+        self.parent = parent  # index of the parent in the metrics list
+        self.depth = depth
+        self.node_type: str = get("Node Type", "")
+        loops = self.loops = get("Actual Loops", 1) or 1
+
+        # Estimates are per loop as well as actuals
+        plan_rows = get("Plan Rows", 0)
+        self.plan_rows: float = plan_rows * loops
+        actual = get("Actual Rows")
+        self.actual_rows: Optional[float] = None
+        self.row_estimate_ratio: Optional[float] = None
+        self.rows: float = self.plan_rows
+        if actual is not None:
+            self.rows = self.actual_rows = actual * loops
+            if plan_rows > 0:
+                self.row_estimate_ratio = (actual if actual > 1 else 1) / (plan_rows if plan_rows > 1 else 1)
+
+        time = get("Actual Total Time")
+        self.inclusive_time_ms: Optional[float] = time * loops if time is not None else None
+        self.inclusive_cost: float = get("Total Cost", 0.0)
+        self._exclusive_time = self.inclusive_time_ms
+        self._exclusive_cost = self.inclusive_cost
+        keys = BUFFER_KEYS_SET.intersection(node)
+        self._buffers: Dict[str, int] = {key: node[key] for key in keys} if keys else {}
+
+        # Plan total: root execution time, or root cost without ANALYZE
+        if total is None:
+            total = self.inclusive_time_ms if self.inclusive_time_ms is not None else self.inclusive_cost
+        self._total = total
+        inclusive = self.inclusive_time_ms if self.inclusive_time_ms is not None else self.inclusive_cost
+        self.inclusive_share: float = min(inclusive / total, 1.0) if total else 0.0
+        # Own relation, or the first one below in plan order (set by compute_plan_metrics)
+        self.subtree_relation: Optional[str] = get("Relation Name")
+        # Non-default settings of the plan (EXPLAIN SETTINGS), shared by all nodes
+        self.settings: Dict[str, str] = settings if settings is not None else {}
+
+    def _subtract_child(self, child: "PlanNodeMetrics") -> None:
+        if self._exclusive_time is not None and child.inclusive_time_ms is not None:
+            self._exclusive_time -= child.inclusive_time_ms
+        self._exclusive_cost -= child.inclusive_cost
+        if self._buffers and child._buffers:
+            for key in self._buffers.keys() & child._buffers.keys():
+                self._buffers[key] -= child._buffers[key]
+
+    # Parallel workers and rounding can make children exceed the parent,
+    # so exclusive values are clamped at zero.
+
+    @property
+    def exclusive_time_ms(self) -> Optional[float]:
+        if self._exclusive_time is None:
+            return None
+        return self._exclusive_time if self._exclusive_time > 0 else 0.0
+
+    @property
+    def exclusive_cost(self) -> float:
+        return self._exclusive_cost if self._exclusive_cost > 0 else 0.0
+
+    @property
+    def exclusive_buffers(self) -> Dict[str, int]:
+        return {key: max(blocks, 0) for key, blocks in self._buffers.items()}
+
+    def exclusive_blocks(self, key: str) -> int:
+        """One exclusive buffer counter (0 if not reported)."""
+        blocks = self._buffers.get(key, 0)
+        return blocks if blocks > 0 else 0
+
+    @property
+    def share(self) -> float:
+        """Fraction of the plan's time (or cost) spent in this node alone."""
+        if not self._total:
+            return 0.0
+        exclusive = self.exclusive_time_ms
+        if exclusive is None:
+            exclusive = self.exclusive_cost
+        return min(exclusive / self._total, 1.0)
+
+    @property
+    def relation(self) -> Optional[str]:
+        return self.node.get("Relation Name")
+
+    def __repr__(self) -> str:
+        return f"<PlanNodeMetrics {self.node_type} share={self.share:.2f}>"
+
+
+def root_plan(plan_data: Any) -> Dict[str, Any]:
+    """Top plan node of EXPLAIN JSON output (list, document or bare node)."""
+    if isinstance(plan_data, list):
+        plan_data = plan_data[0] if plan_data else {}
+    return plan_data.get("Plan", plan_data)
+
+
+def plan_settings(plan_data: Any) -> Dict[str, str]:
+    """Non-default settings reported by EXPLAIN (SETTINGS), if any."""
+    if isinstance(plan_data, list):
+        plan_data = plan_data[0] if plan_data else {}
+    return plan_data.get("Settings") or {}
+
+
+def compute_plan_metrics(
+    plan: Dict[str, Any], settings: Optional[Dict[str, str]] = None
+) -> List[PlanNodeMetrics]:
+    """
+    Compute PlanNodeMetrics for every node of a plan, parents first.
+
+    Walks the tree once with an explicit stack (deep plans cannot hit the
+    recursion limit). Each node's inclusive time, cost and buffers are
+    subtracted from its parent as it is visited, so exclusive values are
+    complete once the walk ends.
+
+    Args:
+        plan: Root plan node (see root_plan()).
+        settings: Settings of the plan (see plan_settings()).
+
+    Returns:
+        Metrics in pre-order; ``parent`` indexes into this list.
+    """
+    root = PlanNodeMetrics(plan, settings=settings if settings is not None else {})
+    metrics: List[PlanNodeMetrics] = [root]
+    stack = [(child, 0) for child in reversed(plan.get("Plans", ()))]
+    while stack:
+        node, parent = stack.pop()
+        index = len(metrics)
+        m = PlanNodeMetrics(node, parent, metrics[parent].depth + 1, root._total, root.settings)
+        metrics.append(m)
+        metrics[parent]._subtract_child(m)
+        if m.subtree_relation is not None:
+            # Ancestors already set keep their earlier relation, so this
+            # stops early and every node is set at most once
+            ancestor = parent
+            while ancestor is not None and metrics[ancestor].subtree_relation is None:
+                metrics[ancestor].subtree_relation = m.subtree_relation
+                ancestor = metrics[ancestor].parent
+        # Reversed so children are visited in plan order
+        for child in reversed(node.get("Plans", ())):
+            stack.append((child, index))
+    return metrics
@@ -0,0 +1,428 @@
+"""Plan analysis rules and the registry that dispatches them by node type."""
+import math
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from src.domain.entities.recommendation import RecommendationType
+from src.infrastructure.analyzers.plan_metrics import PlanNodeMetrics
+
+
+class PlanRule(ABC):
+    """
+    A check on single plan nodes.
+
+    Subclasses set ``name``, bump ``version`` whenever their logic or
+    thresholds change (findings record both), and list the ``node_types``
+    they apply to; ``None`` runs the rule on every node.
+    """
+
+    name: str = ""
+    version: int = 1
+    node_types: Optional[FrozenSet[str]] = None
+
+    @abstractmethod
+    def check(self, m: PlanNodeMetrics) -> Optional[Dict[str, Any]]:
+        """Return a finding for the node, or None."""
+        pass
+
+    def finding(
+        self,
+        m: PlanNodeMetrics,
+        rec_type: RecommendationType,
+        title: str,
+        description: str,
+        impact: float,
+        confidence: float,
+        **extra: Any,
+    ) -> Dict[str, Any]:
+        """Build a finding tagged with the rule that produced it."""
+        return {
+            "type": rec_type,
+            "title": title,
+            "description": description,
+            "impact": round(impact, 2),
+            "confidence": confidence,
+            "rule": self.name,
+            "rule_version": self.version,
+            # Fraction of the plan's time (or cost) spent in this node
+            "share": m.share,
+            "node_details": m.node,
+            **extra,
+        }
+
+    def __repr__(self) -> str:
+        return f"<PlanRule {self.name} v{self.version}>"
+
+
+class PlanRuleRegistry:
+    """
+    Rules indexed by the node types they apply to.
+
+    The dispatch table from node type to rules is built once per node type
+    and reused until a rule is registered, so the cost per node does not
+    grow with rules that do not apply to it.
+    """
+
+    def __init__(self, rules: Iterable[PlanRule] = ()):
+        self._rules: List[PlanRule] = []
+        self._dispatch: Dict[str, Tuple[PlanRule, ...]] = {}
+        for rule in rules:
+            self.register(rule)
+
+    def register(self, rule: PlanRule) -> PlanRule:
+        """Add a rule; rule names must be unique."""
+        if any(r.name == rule.name for r in self._rules):
+            raise ValueError(f"Plan rule already registered: {rule.name}")
+        self._rules.append(rule)
+        self._dispatch.clear()
+        return rule
+
+    @property
+    def rules(self) -> List[PlanRule]:
+        return list(self._rules)
+
+    def rules_for(self, node_type: str) -> Tuple[PlanRule, ...]:
+        """Rules to run on nodes of a type, in registration order."""
+        rules = self._dispatch.get(node_type)
+        if rules is None:
+            rules = self._dispatch[node_type] = tuple(
+                r for r in self._rules if r.node_types is None or node_type in r.node_types
+            )
+        return rules
+
+
+BLOCK_KB = 8
+DEFAULT_WORK_MEM_KB = 4096
+# Default since PostgreSQL 15 (1.0 before)
+DEFAULT_HASH_MEM_MULTIPLIER = 2.0
+# An in-memory sort needs more room than the same tuples took on disk
+SORT_MEMORY_FACTOR = 2
+# Nodes whose spills the sort and hash rules already explain
+SPILL_NODE_TYPES = frozenset({"Sort", "Incremental Sort", "Hash", "Hash Join", "Aggregate"})
+
+MEMORY_UNITS_KB = {"kb": 1, "mb": 1024, "gb": 1024 ** 2, "tb": 1024 ** 3}
+MEMORY_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]b)?\s*$", re.IGNORECASE)
+
+
+def parse_memory_kb(value: Optional[str]) -> Optional[float]:
+    """Parse a memory setting ("64MB", "512kB", or plain kB) into kB."""
+    match = MEMORY_PATTERN.match(value or "")
+    if not match:
+        return None
+    return float(match.group(1)) * MEMORY_UNITS_KB[(match.group(2) or "kb").lower()]
+
+
+def format_memory(kb: float) -> str:
+    """Whole megabytes, rounded up, as a setting value."""
+    return f"{max(math.ceil(kb / 1024), 1)}MB"
+
+
+def work_mem_kb(m: PlanNodeMetrics) -> float:
+    return parse_memory_kb(m.settings.get("work_mem")) or DEFAULT_WORK_MEM_KB
+
+
+def hash_mem_multiplier(m: PlanNodeMetrics) -> float:
+    try:
+        return float(m.settings.get("hash_mem_multiplier", DEFAULT_HASH_MEM_MULTIPLIER))
+    except ValueError:
+        return DEFAULT_HASH_MEM_MULTIPLIER
+
+
+def work_mem_advice(m: PlanNodeMetrics, needed_kb: float) -> Dict[str, Any]:
+    """Description sentence and finding fields for a work_mem that avoids a spill."""
+    current = work_mem_kb(m)
+    needed = max(needed_kb, current + 1024)
+    suggested = format_memory(needed)
+    return {
+        "text": (
+            f"Raising work_mem from {format_memory(current)} to about {suggested} "
+            f"(+{format_memory(needed - current)}) would keep it in memory; "
+            "set it for this query or role rather than globally, as every sort "
+            "and hash of every session may use that much."
+        ),
+        "sql_suggestion": f"SET work_mem = '{suggested}';",
+        "work_mem_kb": math.ceil(needed),
+    }
+
+
+def rows_text(m: PlanNodeMetrics) -> str:
+    if m.actual_rows is not None:
+        return f"{int(m.actual_rows)} rows"
+    return f"Estimated {int(m.plan_rows)} rows"
+
+
+def time_text(m: PlanNodeMetrics) -> str:
+    if m.exclusive_time_ms is None:
+        return ""
+    return f" ({m.exclusive_time_ms:.1f} ms, {m.share:.0%} of the execution time)"
+
+
+class SeqScanRule(PlanRule):
+    """Sequential scans on large tables."""
+
+    name = "seq_scan"
+    version = 2
+    node_types = frozenset({"Seq Scan"})
+
+    def check(self, m: PlanNodeMetrics) -> Optional[Dict[str, Any]]:
+        # Rows read, not returned: a selective filter is what an index replaces
+        removed = m.node.get("Rows Removed by Filter", 0) * m.loops
+        scanned = m.rows + removed
+        if scanned <= 1000:
+            return None
+        scanned_text = f"{int(scanned)} rows" if m.actual_rows is not None else rows_text(m)
+        return self.finding(
+            m,
+            RecommendationType.INDEX,
+            f"Sequential Scan on {m.relation}",
+            f"The query is performing a full table scan on {m.relation}. "
+            f"{scanned_text} will be processed{time_text(m)}. "
+            "Adding an index could significantly speed up this operation.",
+            impact=m.share * 0.8,
+            confidence=0.9,
+            relation=m.relation,
+        )
+
+
+class NestedLoopRule(PlanRule):
+    """Nested loops over many rows."""
+
+    name = "nested_loop"
+    node_types = frozenset({"Nested Loop"})
+
+    def check(self, m: PlanNodeMetrics) -> Optional[Dict[str, Any]]:
+        if m.rows <= 5000:
+            return None
+        return self.finding(
+            m,
+            RecommendationType.REWRITE,
+            "Expensive Nested Loop Join",
+            f"A Nested Loop join is processing {int(m.rows)} rows{time_text(m)}. "
+            "This is often inefficient for large datasets. Consider using a Hash Join "
+            "or Merge Join by ensuring indexes are available on join columns.",
+            impact=m.inclusive_share * 0.7,
+            confidence=0.75,
+        )
+
+
+class RowEstimateRule(PlanRule):
+    """Row estimates off by more than 10x (stale statistics)."""
+
+    name = "row_estimate"
+
+    def check(self, m: PlanNodeMetrics) -> Optional[Dict[str, Any]]:
+        ratio = m.row_estimate_ratio
+        if ratio is None or 0.1 <= ratio <= 10:
+            return None
+        return self.finding(
+            m,
+            RecommendationType.REWRITE,
+            f"Outdated Statistics for {m.relation or m.node_type}",
+            f"The query planner estimated {m.node.get('Plan Rows', 0)} rows but actually "
+            f"processed {m.node.get('Actual Rows')} per loop. "
+            "Stale statistics can lead to poor execution plans. Running ANALYZE on this "
+            "table is recommended.",
+            # A misestimate steers the plan of the whole subtree above it
+            impact=m.inclusive_share * 0.5,
+            confidence=0.8,
+            relation=m.relation,
+        )
+
+
+class LargeSortRule(PlanRule):
+    """Explicit in-memory sorts of many rows."""
+
+    name = "large_sort"
+    version = 2
+    node_types = frozenset({"Sort"})
+
+    def check(self, m: PlanNodeMetrics) -> Optional[Dict[str, Any]]:
+        if m.rows <= 10000 or _sort_spilled(m.node):
+            # Spilled sorts are reported by SortSpillRule
+            return None
+        if m.exclusive_time_ms is not None and m.share < 0.05:
+            # Measured and cheap: an index would not pay for itself
+            return None
+        return self.finding(
+            m,
+            RecommendationType.INDEX,
+            f"Large Memory Sort ({int(m.rows)} rows)",
+            f"The query is sorting a large amount of data in memory{time_text(m)}. "
+            "An index on the ORDER BY columns could eliminate the need for an explicit sort.",
+            impact=m.share * 0.6,
+            confidence=0.85,
+            relation=m.subtree_relation,
+        )
+
+
+# Incremental sorts report sort methods and space per kind of group
+INCREMENTAL_SORT_GROUPS = ("Full-sort Groups", "Pre-sorted Groups")
+
+
+def _sort_entries(node: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Parallel workers sort their share separately
+    return [node, *node.get("Workers", ())]
+
+
+def _sort_methods(entry: Dict[str, Any]) -> List[str]:
+    methods = [entry["Sort Method"]] if "Sort Method" in entry else []
+    for group in INCREMENTAL_SORT_GROUPS:
+        methods.extend(entry.get(group, {}).get("Sort Methods Used", ()))
+    return methods
+
+
+def _sort_disk_kb(entry: Dict[str, Any]) -> float:
+    if entry.get("Sort Space Type") == "Disk":
+        return entry.get("Sort Space Used", 0)
+    return max(
+        entry.get(group, {}).get("Sort Space Disk", {}).get("Peak Sort Space Used", 0)
+        for group in INCREMENTAL_SORT_GROUPS
+    )
+
+
+def _sort_spilled(node: Dict[str, Any]) -> bool:
+    return any(
+        "external" in method for entry in _sort_entries(node) for method in _sort_methods(entry)
+    )
+
+
+class SortSpillRule(PlanRule):
+    """Sorts and incremental sorts that spilled to disk (external merge or external sort)."""
+
+    name = "sort_spill"
+    version = 2
+    node_types = frozenset({"Sort", "Incremental Sort"})
+
+    def check(self, m: PlanNodeMetrics) -> Optional[Dict[str, Any]]:
+        if not _sort_spilled(m.node):
+            return None
+        # The largest share of a parallel sort decides
+        entries = _sort_entries(m.node)
+        disk_kb = max(_sort_disk_kb(entry) for entry in entries)
+        methods = dict.fromkeys(method for entry in entries for method in _sort_methods(entry))
+        advice = work_mem_advice(m, disk_kb * SORT_MEMORY_FACTOR)
+        return self.finding(
+            m,
+            RecommendationType.CONFIGURATION,
+            f"Sort spilled to disk ({format_memory(disk_kb)})",
+            f"Sorting {rows_text(m)} used {', '.join(methods)} with "
+            f"{disk_kb} kB on disk{time_text(m)}. {advice['text']}",
+            impact=m.share * 0.7,
+            confidence=0.85,
+            relation=m.subtree_relation,
+            sql_suggestion=advice["sql_suggestion"],
+            work_mem_kb=advice["work_mem_kb"],
+        )
+
+
+class HashSpillRule(PlanRule):
+    """Hash joins and hash aggregates that needed more than one batch."""
+
+    name = "hash_spill"
+    node_types = frozenset({"Hash", "Aggregate"})
+
+    def check(self, m: PlanNodeMetrics) -> Optional[Dict[str, Any]]:
+        node = m.node
+        peak_kb = node.get("Peak Memory Usage", 0)
+        if m.node_type == "Hash":
+            batches = node.get("Hash Batches", 1)
+            # Every batch holds about as much as the one kept in memory
+            needed_kb = peak_kb * batches
+            what = "Hash table"
+        else:
+            batches = node.get("HashAgg Batches", 1)
+            needed_kb = peak_kb + node.get("Disk Usage", 0)
+            what = "Hash aggregate"
+        if batches <= 1:
+            return None
+
+        advice = work_mem_advice(m, needed_kb / hash_mem_multiplier(m))
+        return self.finding(
+            m,
+            RecommendationType.CONFIGURATION,
+            f"{what} spilled to disk ({batches} batches)",
+            f"{what} over {rows_text(m)} was split into {batches} batches "
+            f"(peak {peak_kb} kB in memory){time_text(m)}, writing the rest to temporary "
+            f"files. Hash tables may use work_mem x hash_mem_multiplier. {advice['text']}",
+            # Batching slows the join or aggregate above the hash table too
+            impact=m.inclusive_share * 0.7,
+            confidence=0.8,
+            relation=m.subtree_relation,
+            sql_suggestion=advice["sql_suggestion"],
+            work_mem_kb=advice["work_mem_kb"],
+        )
+
+
+class TempIoRule(PlanRule):
+    """Temporary file I/O of nodes other than sorts and hashes (materialize, CTE, window)."""
+
+    name = "temp_io"
+
+    def check(self, m: PlanNodeMetrics) -> Optional[Dict[str, Any]]:
+        if m.node_type in SPILL_NODE_TYPES:
+            return None
+        written = m.exclusive_blocks("Temp Written Blocks")
+        if not written:
+            return None
+
+        temp_kb = written * BLOCK_KB
+        advice = work_mem_advice(m, work_mem_kb(m) + temp_kb)
+        return self.finding(
+            m,
+            RecommendationType.CONFIGURATION,
+            f"Temporary files written by {m.node_type} ({format_memory(temp_kb)})",
+            f"{m.node_type} wrote {written} and read {m.exclusive_blocks('Temp Read Blocks')} "
+            f"temporary blocks{time_text(m)}. {advice['text']}",
+            impact=m.share * 0.6,
+            confidence=0.7,
+            relation=m.subtree_relation,
+            sql_suggestion=advice["sql_suggestion"],
+            work_mem_kb=advice["work_mem_kb"],
+        )
+
+
+class SharedReadRule(PlanRule):
+    """Nodes that read many blocks from outside shared buffers."""
+
+    name = "shared_read"
+    # 1000 blocks of 8 kB
+    min_read_blocks = 1000
+    max_hit_ratio = 0.9
+
+    def check(self, m: PlanNodeMetrics) -> Optional[Dict[str, Any]]:
+        read = m.exclusive_blocks("Shared Read Blocks")
+        if read < self.min_read_blocks:
+            return None
+        hit = m.exclusive_blocks("Shared Hit Blocks")
+        hit_ratio = hit / (hit + read)
+        if hit_ratio >= self.max_hit_ratio:
+            return None
+
+        io_time = m.node.get("I/O Read Time")
+        io_text = f" taking {io_time:.1f} ms" if io_time is not None else ""
+        return self.finding(
+            m,
+            RecommendationType.CONFIGURATION,
+            f"Cache misses on {m.relation or m.node_type} ({hit_ratio:.0%} hit ratio)",
+            f"{m.node_type} read {read} blocks ({format_memory(read * BLOCK_KB)}) from disk or "
+            f"the OS cache{io_text} and found {hit} in shared buffers. Reading fewer blocks "
+            "(a more selective index) or a larger shared_buffers would avoid the I/O.",
+            impact=m.share * 0.5,
+            confidence=0.7,
+            relation=m.relation,
+        )
+
+
+def default_plan_rules() -> PlanRuleRegistry:
+    """Registry with the built-in rules."""
+    return PlanRuleRegistry([
+        SeqScanRule(),
+        NestedLoopRule(),
+        RowEstimateRule(),
+        LargeSortRule(),
+        SortSpillRule(),
+        HashSpillRule(),
+        TempIoRule(),
+        SharedReadRule(),
+    ])
@@ -19,6 +19,8 @@ def test_index_analyzer():
             "type": RecommendationType.INDEX,
             "title": "Sequential Scan detected on users",
             "description": "...",
+            "rule": "seq_scan",
+            "relation": "users",
             "node_details": {
                 "Node Type": "Seq Scan",
                 "Relation Name": "users",
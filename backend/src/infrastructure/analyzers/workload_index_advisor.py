@@ -0,0 +1,217 @@
+"""Workload-level index advisor: one ranked index plan per database."""
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from src.infrastructure.analyzers.explain_analyzer import ExplainAnalyzer
+from src.infrastructure.analyzers.index_analyzer import IndexAnalyzer
+from src.infrastructure.collectors.catalog_snapshot import CatalogSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Rough B-tree entry size: tuple header and item pointer, plus 8 bytes per column
+INDEX_TUPLE_OVERHEAD_BYTES = 16
+INDEX_COLUMN_BYTES = 8
+
+
+class IndexCandidate:
+    """Columns of one table an analyzed plan would like an index on."""
+
+    def __init__(
+        self,
+        table: str,
+        columns: Sequence[str],
+        weight_ms: float,
+        fingerprints: Optional[Set[int]] = None,
+        reasons: Optional[Set[str]] = None,
+        table_rows: float = 0,
+    ):
+        self.table = table
+        self.columns = tuple(columns)
+        self.weight_ms = weight_ms
+        self.fingerprints = fingerprints or set()
+        self.reasons = reasons or set()
+        self.table_rows = table_rows
+
+
+class IndexProposal:
+    """A composite (optionally covering) index serving several candidates."""
+
+    def __init__(self, table: str, columns: Sequence[str]):
+        self.table = table
+        self.columns: List[str] = list(columns)
+        self.include: List[str] = []
+        self.weight_ms = 0.0
+        self.fingerprints: Set[int] = set()
+        self.reasons: Set[str] = set()
+        self.table_rows = 0.0
+        self.merged = 0
+
+    @property
+    def estimated_bytes(self) -> int:
+        """Leaf size estimate from the largest row count seen for the table."""
+        width = INDEX_TUPLE_OVERHEAD_BYTES + INDEX_COLUMN_BYTES * (len(self.columns) + len(self.include))
+        return int(self.table_rows * width)
+
+    @property
+    def sql(self) -> str:
+        name = f"idx_{self.table}_{'_'.join(self.columns)}"[:63]
+        include = f" INCLUDE ({', '.join(self.include)})" if self.include else ""
+        return f"CREATE INDEX CONCURRENTLY {name} ON {self.table} ({', '.join(self.columns)}){include};"
+
+    def absorb(self, candidate: IndexCandidate, fraction: float = 1.0) -> None:
+        self.weight_ms += candidate.weight_ms * fraction
+        self.fingerprints |= candidate.fingerprints
+        self.reasons |= candidate.reasons
+        self.table_rows = max(self.table_rows, candidate.table_rows)
+        self.merged += 1
+
+    def to_dict(self, workload_ms: float) -> Dict[str, Any]:
+        return {
+            "table": self.table,
+            "columns": self.columns,
+            "include": self.include,
+            "sql_suggestion": self.sql,
+            "weight_ms": round(self.weight_ms, 2),
+            "workload_share": round(self.weight_ms / workload_ms, 4) if workload_ms else 0.0,
+            "estimated_bytes": self.estimated_bytes,
+            "fingerprints": len(self.fingerprints),
+            "candidates_merged": self.merged,
+            "reasons": sorted(self.reasons),
+        }
+
+
+def _common_prefix(a: Sequence[str], b: Sequence[str]) -> int:
+    n = 0
+    for x, y in zip(a, b, strict=False):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+class WorkloadIndexAdvisor:
+    """
+    Chooses a small set of indexes that serves the whole workload of a database.
+
+    Every fingerprint's plan contributes candidate column sets (through
+    ExplainAnalyzer and IndexAnalyzer), weighted by the fingerprint's total
+    execution time times the share of the plan spent in the node the index
+    would replace. Candidates of a table are merged when they share a
+    leading column:
+
+    - a candidate that is a prefix of another is served by it entirely;
+    - otherwise the longer key is kept and the other's remaining columns are
+      added as INCLUDE columns (covering), crediting the fraction of its
+      columns the shared prefix can use.
+
+    The merged indexes are then picked greedily by weight (by weight per
+    byte when a byte budget is set) until the budget is used up.
+
+    With a catalog snapshot, candidates already served by an existing index
+    are dropped, composite keys lead with the most selective equality
+    columns, and sizes are estimated from the table's reltuples.
+    """
+
+    def __init__(
+        self,
+        max_indexes: int = 5,
+        max_bytes: int = 0,
+        explain_analyzer: Optional[ExplainAnalyzer] = None,
+        index_analyzer: Optional[IndexAnalyzer] = None,
+        catalog: Optional[CatalogSnapshot] = None,
+    ):
+        self.max_indexes = max_indexes
+        self.max_bytes = max_bytes  # 0 for no byte budget
+        self.explain_analyzer = explain_analyzer or ExplainAnalyzer()
+        self.index_analyzer = index_analyzer or IndexAnalyzer()
+        self.catalog = catalog
+        self.candidates: List[IndexCandidate] = []
+        self.workload_ms = 0.0
+
+    def add_plan(self, fingerprint_hash: int, plan: Any, total_exec_time_ms: float) -> int:
+        """
+        Collect the index candidates of one fingerprint's plan.
+
+        Returns:
+            Number of candidates added.
+        """
+        self.workload_ms += total_exec_time_ms
+        findings = self.explain_analyzer.analyze(plan)
+        added = 0
+        for table, columns, reason, finding in self.index_analyzer.candidates(findings, self.catalog):
+            node = finding["node_details"]
+            loops = node.get("Actual Loops", 1) or 1
+            scanned = (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * loops
+            table_catalog = self.catalog.table(table, node.get("Schema")) if self.catalog else None
+            if table_catalog is not None and table_catalog.reltuples:
+                scanned = table_catalog.reltuples
+            self.candidates.append(IndexCandidate(
+                table,
+                # An index column may appear once
+                list(dict.fromkeys(columns)),
+                total_exec_time_ms * finding.get("share", 1.0),
+                fingerprints={fingerprint_hash},
+                reasons={reason},
+                table_rows=max(scanned, node.get("Plan Rows", 0)),
+            ))
+            added += 1
+        return added
+
+    def merge(self) -> List[IndexProposal]:
+        """Merge the candidates of each table into composite/covering indexes."""
+        proposals: List[IndexProposal] = []
+        by_table: Dict[str, List[IndexCandidate]] = {}
+        for candidate in self.candidates:
+            by_table.setdefault(candidate.table, []).append(candidate)
+
+        for table, candidates in by_table.items():
+            merged: List[IndexProposal] = []
+            # Longest and heaviest first, so shorter candidates fold into them
+            for c in sorted(candidates, key=lambda c: (-len(c.columns), -c.weight_ms)):
+                best, best_prefix = None, 0
+                for p in merged:
+                    prefix = _common_prefix(p.columns, c.columns)
+                    if prefix > best_prefix:
+                        best, best_prefix = p, prefix
+                if best is None:
+                    proposal = IndexProposal(table, c.columns)
+                    proposal.absorb(c)
+                    merged.append(proposal)
+                elif best_prefix == len(c.columns):
+                    best.absorb(c)
+                else:
+                    for column in c.columns[best_prefix:]:
+                        if column not in best.columns and column not in best.include:
+                            best.include.append(column)
+                    best.absorb(c, best_prefix / len(c.columns))
+            proposals.extend(merged)
+        return proposals
+
+    def plan(self) -> List[Dict[str, Any]]:
+        """
+        Ranked index plan within the budget.
+
+        Returns:
+            Index proposals, most valuable first.
+        """
+        proposals = self.merge()
+        if self.max_bytes:
+            proposals.sort(key=lambda p: p.weight_ms / max(p.estimated_bytes, 1), reverse=True)
+        else:
+            proposals.sort(key=lambda p: p.weight_ms, reverse=True)
+
+        chosen: List[IndexProposal] = []
+        used_bytes = 0
+        for proposal in proposals:
+            if len(chosen) >= self.max_indexes:
+                break
+            if self.max_bytes and used_bytes + proposal.estimated_bytes > self.max_bytes:
+                continue
+            chosen.append(proposal)
+            used_bytes += proposal.estimated_bytes
+
+        logger.debug(
+            f"Index plan: {len(chosen)} of {len(proposals)} indexes from {len(self.candidates)} candidates"
+        )
+        chosen.sort(key=lambda p: p.weight_ms, reverse=True)
+        return [p.to_dict(self.workload_ms) for p in chosen]
@@ -0,0 +1,116 @@
+"""Active Session History sampler built on pg_stat_activity."""
+import asyncio
+import calendar
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Tuple
+
+import asyncpg
+
+from src.infrastructure.collectors.postgres_collector import PostgresCollector
+
+logger = logging.getLogger(__name__)
+
+# pg_stat_activity.query_id was added in PostgreSQL 14
+SAMPLE_QUERY = """
+    SELECT {query_id} AS query_id, state, wait_event_type, wait_event
+    FROM pg_stat_activity
+    WHERE datname = current_database()
+      AND backend_type = 'client backend'
+      AND state IS NOT NULL
+      AND state <> 'idle'
+      AND pid <> pg_backend_pid()
+"""
+
+# (sampled_at, query_id, state, wait_event_type, wait_event)
+SessionSample = Tuple[datetime, Any, str, Any, Any]
+
+
+class ActiveSessionSampler:
+    """
+    Polls pg_stat_activity about once per second over a single pooled connection.
+
+    Samples are kept in a bounded ring buffer (oldest samples are dropped when
+    it is full) and drained into per-bucket aggregates for persistence.
+    """
+
+    def __init__(self, collector: PostgresCollector, buffer_size: int = 100_000):
+        self.collector = collector
+        self.buffer: Deque[SessionSample] = deque(maxlen=buffer_size)
+        self.samples_taken = 0
+
+    async def run(self, duration_seconds: float, interval_seconds: float = 1.0) -> int:
+        """
+        Sample for ``duration_seconds``, one poll every ``interval_seconds``.
+
+        Returns:
+            Number of polls taken.
+        """
+        deadline = time.monotonic() + duration_seconds
+        polls = 0
+        async with self.collector._acquire() as conn:
+            query = SAMPLE_QUERY.format(
+                query_id="query_id" if conn.get_server_version().major >= 14 else "NULL::bigint"
+            )
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                try:
+                    await self.sample_once(conn, query)
+                    polls += 1
+                except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                    logger.warning(f"ASH sample failed for {self.collector.pool_key}: {e}")
+                    break
+                elapsed = time.monotonic() - started
+                await asyncio.sleep(max(interval_seconds - elapsed, 0))
+        return polls
+
+    async def sample_once(self, conn: asyncpg.Connection, query: str) -> int:
+        """Take one pg_stat_activity sample and append it to the ring buffer."""
+        sampled_at = datetime.utcnow()
+        rows = await conn.fetch(query)
+        for row in rows:
+            self.buffer.append((
+                sampled_at,
+                row["query_id"],
+                row["state"],
+                row["wait_event_type"],
+                row["wait_event"],
+            ))
+        self.samples_taken += 1
+        return len(rows)
+
+    def drain(self, bucket_seconds: int = 60) -> List[Dict[str, Any]]:
+        """
+        Empty the buffer into compact per-bucket aggregates.
+
+        Args:
+            bucket_seconds: Width of the time buckets.
+
+        Returns:
+            One dict per (bucket, query_id, state, wait_event_type, wait_event)
+            with the number of samples observed.
+        """
+        counts: Dict[Tuple, int] = {}
+        while self.buffer:
+            sampled_at, query_id, state, wait_event_type, wait_event = self.buffer.popleft()
+            # Sample times are naive UTC; timestamp() would read them as local time
+            epoch = calendar.timegm(sampled_at.utctimetuple())
+            bucket = sampled_at - timedelta(
+                seconds=epoch % bucket_seconds, microseconds=sampled_at.microsecond
+            )
+            key = (bucket, query_id, state, wait_event_type, wait_event)
+            counts[key] = counts.get(key, 0) + 1
+
+        return [
+            {
+                "bucket_start": bucket,
+                "query_id": query_id,
+                "state": state,
+                "wait_event_type": wait_event_type,
+                "wait_event": wait_event,
+                "sample_count": count,
+            }
+            for (bucket, query_id, state, wait_event_type, wait_event), count in counts.items()
+        ]
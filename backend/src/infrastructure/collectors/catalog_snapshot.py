@@ -0,0 +1,241 @@
+"""Catalog snapshot of a monitored database: existing indexes and column statistics."""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.infrastructure.cache.lru import LRUCache
+from src.infrastructure.collectors.plan_cache import SCHEMA_VERSION_QUERY
+
+CATALOG_CACHE_SIZE = 1_000
+CATALOG_CACHE_TTL_SECONDS = 6 * 3600
+
+# Everything the index analyzers need about a set of relations, in one round
+# trip: size (reltuples, relpages), every index with its key and INCLUDE
+# columns (expression keys have no attname and come back as null), all
+# live columns, and the planner statistics of analyzed columns. The version
+# is the SCHEMA_VERSION_QUERY hash of the same relations, so the snapshot is
+# invalidated exactly when a cached plan would be.
+CATALOG_SNAPSHOT_QUERY = f"""
+    WITH rels AS (
+        SELECT c.oid, n.nspname, c.relname, c.reltuples, c.relpages
+        FROM unnest($1::text[]) AS r(name)
+        JOIN pg_class c ON c.oid = to_regclass(r.name)
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+    )
+    SELECT
+        ({SCHEMA_VERSION_QUERY}) AS version,
+        coalesce((SELECT json_agg(json_build_object(
+            'schema', rels.nspname,
+            'name', rels.relname,
+            'reltuples', rels.reltuples,
+            'relpages', rels.relpages,
+            'columns', (
+                SELECT coalesce(json_agg(a.attname ORDER BY a.attnum), '[]')
+                FROM pg_attribute a
+                WHERE a.attrelid = rels.oid AND a.attnum > 0 AND NOT a.attisdropped
+            ),
+            'indexes', (
+                SELECT coalesce(json_agg(json_build_object(
+                    'name', ic.relname,
+                    'method', am.amname,
+                    'unique', i.indisunique,
+                    'valid', i.indisvalid,
+                    'partial', i.indpred IS NOT NULL,
+                    'columns', (
+                        SELECT json_agg(a.attname ORDER BY k.ord)
+                        FROM unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+                        LEFT JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+                        WHERE k.ord <= i.indnkeyatts
+                    ),
+                    'include', (
+                        SELECT coalesce(json_agg(a.attname ORDER BY k.ord), '[]')
+                        FROM unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+                        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+                        WHERE k.ord > i.indnkeyatts
+                    )
+                ) ORDER BY ic.relname), '[]')
+                FROM pg_index i
+                JOIN pg_class ic ON ic.oid = i.indexrelid
+                JOIN pg_am am ON am.oid = ic.relam
+                WHERE i.indrelid = rels.oid
+            ),
+            -- Inheritance-tree rows sort first so the table's own row wins
+            'stats', (
+                SELECT coalesce(json_object_agg(s.attname, json_build_object(
+                    'n_distinct', s.n_distinct,
+                    'correlation', s.correlation,
+                    'null_frac', s.null_frac
+                ) ORDER BY s.inherited DESC), '{{}}')
+                FROM pg_stats s
+                WHERE s.schemaname = rels.nspname AND s.tablename = rels.relname
+            )
+        )) FROM rels), '[]') AS catalog
+"""
+
+
+def _unquote(name: str) -> str:
+    return name.replace('"', "")
+
+
+class IndexInfo:
+    """An existing index of a table."""
+
+    def __init__(
+        self,
+        name: str,
+        columns: Sequence[Optional[str]],
+        include: Sequence[str] = (),
+        method: str = "btree",
+        unique: bool = False,
+        valid: bool = True,
+        partial: bool = False,
+    ):
+        self.name = name
+        # None for expression keys
+        self.columns: List[Optional[str]] = list(columns)
+        self.include: List[str] = list(include)
+        self.method = method
+        self.unique = unique
+        self.valid = valid
+        self.partial = partial
+
+    def covers(self, columns: Sequence[str], ordered: bool = True) -> bool:
+        """
+        Whether this index already serves an index on ``columns``.
+
+        Only valid, non-partial B-tree indexes count. The columns must be a
+        prefix of the index key; with ``ordered=False`` (equality filters)
+        the leading key columns may come in any order.
+        """
+        if not columns or not self.valid or self.partial or self.method != "btree":
+            return False
+        leading = self.columns[:len(columns)]
+        if len(leading) < len(columns):
+            return False
+        if ordered:
+            return leading == list(columns)
+        return set(leading) == set(columns)
+
+    def __repr__(self) -> str:
+        return f"<IndexInfo {self.name} ({', '.join(str(c) for c in self.columns)})>"
+
+
+class TableCatalog:
+    """Size, columns, indexes and column statistics of one table."""
+
+    def __init__(
+        self,
+        schema: str,
+        name: str,
+        reltuples: float = 0,
+        relpages: int = 0,
+        columns: Sequence[str] = (),
+        indexes: Optional[List[IndexInfo]] = None,
+        stats: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        self.schema = schema
+        self.name = name
+        # -1 on PostgreSQL 14+ for tables never vacuumed or analyzed
+        self.reltuples = reltuples if reltuples > 0 else 0
+        self.relpages = relpages
+        self.columns = list(columns)
+        self.indexes = indexes or []
+        self.stats = stats or {}
+
+    def covering_index(self, columns: Sequence[str], ordered: bool = True) -> Optional[IndexInfo]:
+        """The first existing index that covers ``columns`` (see IndexInfo.covers)."""
+        for index in self.indexes:
+            if index.covers(columns, ordered):
+                return index
+        return None
+
+    def n_distinct(self, column: str) -> Optional[float]:
+        """
+        Estimated number of distinct values of a column, None without statistics.
+
+        pg_stats reports large cardinalities as a negative fraction of the
+        row count, which is scaled by reltuples here.
+        """
+        stats = self.stats.get(column)
+        if not stats or stats.get("n_distinct") is None:
+            return None
+        n_distinct = stats["n_distinct"]
+        if n_distinct < 0:
+            return -n_distinct * self.reltuples
+        return n_distinct
+
+    def order_by_selectivity(self, columns: Sequence[str]) -> List[str]:
+        """
+        Most selective columns first; columns without statistics keep their
+        order after the ones with statistics.
+        """
+        known = [c for c in columns if self.n_distinct(c) is not None]
+        unknown = [c for c in columns if self.n_distinct(c) is None]
+        return sorted(known, key=lambda c: -self.n_distinct(c)) + unknown
+
+    def __repr__(self) -> str:
+        return f"<TableCatalog {self.schema}.{self.name} {len(self.indexes)} indexes>"
+
+
+class CatalogSnapshot:
+    """Catalog of the relations analyzed for one database, at one schema/statistics version."""
+
+    def __init__(self, relations: List[str], version: str, tables: List[TableCatalog]):
+        self.relations = relations
+        self.version = version
+        self.tables = tables
+        self.fetched_at = datetime.utcnow()
+        self._by_name: Dict[str, TableCatalog] = {}
+        for table in tables:
+            self._by_name[f"{table.schema}.{table.name}"] = table
+            # Unqualified names resolve to the first schema seen
+            self._by_name.setdefault(table.name, table)
+
+    @classmethod
+    def from_row(cls, relations: List[str], version: str, catalog: Any) -> "CatalogSnapshot":
+        """Build a snapshot from the row of CATALOG_SNAPSHOT_QUERY."""
+        if isinstance(catalog, str):
+            catalog = json.loads(catalog)
+        tables = [
+            TableCatalog(
+                schema=t["schema"],
+                name=t["name"],
+                reltuples=t.get("reltuples") or 0,
+                relpages=t.get("relpages") or 0,
+                columns=t.get("columns") or [],
+                indexes=[
+                    IndexInfo(
+                        i["name"],
+                        i.get("columns") or [],
+                        i.get("include") or [],
+                        method=i.get("method", "btree"),
+                        unique=i.get("unique", False),
+                        valid=i.get("valid", True),
+                        partial=i.get("partial", False),
+                    )
+                    for i in t.get("indexes") or []
+                ],
+                stats=t.get("stats") or {},
+            )
+            for t in catalog or []
+        ]
+        return cls(relations, version, tables)
+
+    def covers(self, relations: Sequence[str]) -> bool:
+        return set(relations).issubset(self.relations)
+
+    def table(self, name: str, schema: Optional[str] = None) -> Optional[TableCatalog]:
+        """Look a table up by (possibly quoted or schema-qualified) name."""
+        name = _unquote(name)
+        if schema:
+            name = f"{_unquote(schema)}.{name}"
+        return self._by_name.get(name)
+
+    def __repr__(self) -> str:
+        return f"<CatalogSnapshot {len(self.tables)} tables @ {self.version[:8]}>"
+
+
+# Latest snapshot per pool_key, shared by analysis runs in this process
+catalog_cache: LRUCache[CatalogSnapshot] = LRUCache(
+    maxsize=CATALOG_CACHE_SIZE, ttl=CATALOG_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,209 @@
+"""Per-process registry of asyncpg pools for monitored databases."""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+class _PoolEntry:
+    """Bookkeeping for a single target pool."""
+
+    __slots__ = ("pool", "dsn", "last_used", "last_ping", "in_use")
+
+    def __init__(self, pool: asyncpg.Pool, dsn: str):
+        self.pool = pool
+        self.dsn = dsn
+        self.last_used = time.monotonic()
+        self.last_ping = time.monotonic()
+        self.in_use = 0
+
+
+class ConnectionPoolRegistry:
+    """
+    Keeps one small, long-lived asyncpg pool per monitored database.
+
+    Pools are keyed by database id (or DSN for ad-hoc targets) and bound to the
+    event loop that created them. Pools that have not been used for
+    ``idle_timeout`` seconds are closed, and connections are pinged with
+    ``SELECT 1`` before use when they have not been checked for
+    ``ping_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 2,
+        idle_timeout: float = 600.0,
+        ping_interval: float = 60.0,
+        connect_timeout: float = 10.0,
+        max_inactive_connection_lifetime: float = 300.0,
+    ):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.connect_timeout = connect_timeout
+        self.max_inactive_connection_lifetime = max_inactive_connection_lifetime
+        self._pools: Dict[str, _PoolEntry] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._last_sweep = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def _bind_loop(self) -> asyncio.Lock:
+        """Drop pools created on a different (closed or replaced) event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._pools:
+                logger.warning(
+                    f"Event loop changed, discarding {len(self._pools)} collector pools"
+                )
+                for entry in self._pools.values():
+                    entry.pool.terminate()
+                self._pools.clear()
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def get_pool(self, key: str, dsn: str) -> asyncpg.Pool:
+        """Return the pool for a target, creating it on first use."""
+        lock = self._bind_loop()
+        await self._maybe_sweep()
+
+        async with lock:
+            entry = self._pools.get(key)
+            if entry is not None and entry.dsn != dsn:
+                # Connection string was edited: replace the stale pool
+                logger.info(f"Connection string changed for {key}, recreating pool")
+                self._pools.pop(key)
+                await self._close_entry(entry)
+                entry = None
+
+            if entry is None:
+                pool = await asyncpg.create_pool(
+                    dsn,
+                    min_size=0,
+                    max_size=self.max_size,
+                    timeout=self.connect_timeout,
+                    max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+                )
+                entry = _PoolEntry(pool, dsn)
+                self._pools[key] = entry
+                logger.debug(f"Created collector pool for {key}")
+
+            entry.last_used = time.monotonic()
+            return entry.pool
+
+    @asynccontextmanager
+    async def acquire(self, key: str, dsn: str) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Acquire a healthy connection for a target.
+
+        Args:
+            key: Registry key (database id or DSN).
+            dsn: asyncpg compatible connection URL.
+        """
+        pool = await self.get_pool(key, dsn)
+        entry = self._pools[key]
+        entry.in_use += 1
+        try:
+            conn = await pool.acquire(timeout=self.connect_timeout)
+        except Exception:
+            entry.in_use -= 1
+            raise
+        try:
+            if time.monotonic() - entry.last_ping > self.ping_interval:
+                if not await self._ping(conn):
+                    # Dead connection: hand it back before replacing the pool's connections
+                    released, conn = conn, None
+                    await pool.release(released)
+                    await pool.expire_connections()
+                    conn = await pool.acquire(timeout=self.connect_timeout)
+                entry.last_ping = time.monotonic()
+            yield conn
+        finally:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            if conn is not None:
+                await pool.release(conn)
+
+    async def _ping(self, conn: asyncpg.Connection) -> bool:
+        """Health-check a pooled connection."""
+        try:
+            await conn.execute("SELECT 1")
+            return True
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            logger.warning(f"Pooled connection failed health ping, reconnecting: {e}")
+            return False
+
+    async def _maybe_sweep(self) -> None:
+        """Evict idle pools at most once per ping interval."""
+        if time.monotonic() - self._last_sweep >= self.ping_interval:
+            self._last_sweep = time.monotonic()
+            await self.evict_idle()
+
+    async def evict_idle(self) -> int:
+        """Close pools that have been idle for longer than ``idle_timeout``."""
+        now = time.monotonic()
+        idle_keys = [
+            key for key, entry in self._pools.items()
+            if entry.in_use == 0 and now - entry.last_used > self.idle_timeout
+        ]
+        for key in idle_keys:
+            entry = self._pools.pop(key)
+            await self._close_entry(entry)
+        if idle_keys:
+            logger.info(f"Evicted {len(idle_keys)} idle collector pools")
+        return len(idle_keys)
+
+    async def close(self, key: str) -> None:
+        """Close the pool for a single target (e.g. when a database is deleted)."""
+        entry = self._pools.pop(key, None)
+        if entry is not None:
+            await self._close_entry(entry)
+
+    async def close_all(self) -> None:
+        """Close every pool. Called on API and worker shutdown."""
+        entries = list(self._pools.values())
+        self._pools.clear()
+        for entry in entries:
+            await self._close_entry(entry)
+        if entries:
+            logger.info(f"Closed {len(entries)} collector pools")
+
+    async def _close_entry(self, entry: _PoolEntry) -> None:
+        try:
+            await asyncio.wait_for(entry.pool.close(), timeout=self.connect_timeout)
+        except Exception as e:
+            logger.warning(f"Error closing collector pool, terminating: {e}")
+            entry.pool.terminate()
+
+
+_registry: Optional[ConnectionPoolRegistry] = None
+
+
+def get_pool_registry() -> ConnectionPoolRegistry:
+    """Get the process-wide pool registry, configured from settings."""
+    global _registry
+    if _registry is None:
+        from src.config import get_settings
+
+        settings = get_settings()
+        _registry = ConnectionPoolRegistry(
+            max_size=settings.collector_pool_max_size,
+            idle_timeout=settings.collector_pool_idle_timeout_seconds,
+            ping_interval=settings.collector_pool_ping_interval_seconds,
+            connect_timeout=settings.collector_connect_timeout_seconds,
+        )
+    return _registry
+
+
+async def close_pool_registry() -> None:
+    """Close all pools held by the process-wide registry."""
+    if _registry is not None:
+        await _registry.close_all()
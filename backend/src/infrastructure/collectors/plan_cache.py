@@ -0,0 +1,79 @@
+"""EXPLAIN plan cache keyed by fingerprint and schema/statistics version."""
+from datetime import datetime
+from typing import Any, Dict, List
+
+from src.infrastructure.cache.lru import LRUCache
+
+PLAN_CACHE_SIZE = 5_000
+PLAN_CACHE_TTL_SECONDS = 6 * 3600
+
+# Version of the relations a plan depends on. relfilenode changes on
+# rewrites (VACUUM FULL, TRUNCATE, CLUSTER, ALTER TYPE), reltuples and the
+# last (auto)analyze time change with planner statistics, and the index list
+# changes when indexes are created or dropped. Relations that no longer
+# resolve are reported as missing.
+SCHEMA_VERSION_QUERY = """
+    SELECT md5(coalesce(string_agg(
+        r.name || ':' || coalesce(
+            c.relfilenode::text || ':' || c.reltuples::bigint::text || ':'
+            || coalesce(greatest(s.last_analyze, s.last_autoanalyze)::text, '') || ':'
+            || coalesce((
+                SELECT string_agg(i.indexrelid::text, ',' ORDER BY i.indexrelid)
+                FROM pg_index i
+                WHERE i.indrelid = c.oid
+            ), ''),
+            'missing'
+        ),
+        ',' ORDER BY r.name
+    ), '')) AS version
+    FROM unnest($1::text[]) AS r(name)
+    LEFT JOIN pg_class c ON c.oid = to_regclass(r.name)
+    LEFT JOIN pg_stat_all_tables s ON s.relid = c.oid
+"""
+
+
+class CachedPlan:
+    """An EXPLAIN plan and the version of the relations it was computed against."""
+
+    def __init__(self, plan: Dict[str, Any], relations: List[str], version: str):
+        self.plan = plan
+        self.relations = relations
+        self.version = version
+        self.cached_at = datetime.utcnow()
+
+    def __repr__(self) -> str:
+        return f"<CachedPlan {len(self.relations)} relations @ {self.version[:8]}>"
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def extract_relations(plan: Dict[str, Any]) -> List[str]:
+    """
+    List the relations scanned by an EXPLAIN (FORMAT JSON) plan.
+
+    Args:
+        plan: Plan as returned by EXPLAIN (top-level dict with a "Plan" key).
+
+    Returns:
+        Sorted, de-duplicated relation names (schema-qualified when known).
+    """
+    relations = set()
+    stack = [plan.get("Plan", plan)]
+    while stack:
+        node = stack.pop()
+        name = node.get("Relation Name")
+        if name:
+            schema = node.get("Schema")
+            relations.add(
+                f"{_quote_ident(schema)}.{_quote_ident(name)}" if schema else _quote_ident(name)
+            )
+        stack.extend(node.get("Plans", []))
+    return sorted(relations)
+
+
+# Plans per (pool_key, fingerprint), shared by analysis runs in this process
+plan_cache: LRUCache[CachedPlan] = LRUCache(
+    maxsize=PLAN_CACHE_SIZE, ttl=PLAN_CACHE_TTL_SECONDS
+)
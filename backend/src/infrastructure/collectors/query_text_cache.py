@@ -0,0 +1,8 @@
+"""Cache of pg_stat_statements queryid to SQL text."""
+from src.infrastructure.cache.lru import LRUCache
+
+# Keyed by (pool key, queryid). The text pg_stat_statements stores for a
+# queryid never changes, so entries only leave the cache through LRU eviction.
+QUERY_TEXT_CACHE_SIZE = 50_000
+
+query_texts: LRUCache[str] = LRUCache(maxsize=QUERY_TEXT_CACHE_SIZE)
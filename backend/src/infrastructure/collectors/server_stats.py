@@ -0,0 +1,173 @@
+"""Server-level statistics: one batched query and rates between snapshots."""
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Reads pg_stat_database, pg_stat_activity, pg_locks and pg_statio_user_tables
+# for the current database in a single round trip.
+SERVER_STATS_QUERY = """
+    SELECT
+        d.numbackends,
+        d.xact_commit,
+        d.xact_rollback,
+        d.deadlocks,
+        d.blks_read,
+        d.blks_hit,
+        d.blk_read_time,
+        d.temp_bytes,
+        d.stats_reset,
+        current_setting('block_size')::int AS block_size,
+        a.active_connections,
+        a.idle_in_transaction,
+        a.lock_waiters,
+        a.lock_wait_seconds,
+        l.locks_not_granted,
+        io.heap_blks_read,
+        io.heap_blks_hit,
+        io.idx_blks_read,
+        io.idx_blks_hit
+    FROM pg_stat_database d
+    CROSS JOIN (
+        SELECT
+            count(*) FILTER (WHERE state = 'active') AS active_connections,
+            count(*) FILTER (WHERE state LIKE 'idle in transaction%') AS idle_in_transaction,
+            count(*) FILTER (WHERE wait_event_type = 'Lock') AS lock_waiters,
+            coalesce(
+                sum(extract(epoch FROM clock_timestamp() - state_change))
+                    FILTER (WHERE wait_event_type = 'Lock'),
+                0
+            )::float8 AS lock_wait_seconds
+        FROM pg_stat_activity
+        WHERE datname = current_database() AND backend_type = 'client backend'
+    ) a
+    CROSS JOIN (
+        SELECT count(*) AS locks_not_granted
+        FROM pg_locks pl
+        JOIN pg_stat_activity pa ON pa.pid = pl.pid
+        WHERE NOT pl.granted AND pa.datname = current_database()
+    ) l
+    CROSS JOIN (
+        SELECT
+            coalesce(sum(heap_blks_read), 0)::bigint AS heap_blks_read,
+            coalesce(sum(heap_blks_hit), 0)::bigint AS heap_blks_hit,
+            coalesce(sum(idx_blks_read), 0)::bigint AS idx_blks_read,
+            coalesce(sum(idx_blks_hit), 0)::bigint AS idx_blks_hit
+        FROM pg_statio_user_tables
+    ) io
+    WHERE d.datname = current_database()
+"""
+
+# Cumulative counters that are turned into per-interval deltas
+SERVER_COUNTERS = (
+    "xact_commit",
+    "xact_rollback",
+    "deadlocks",
+    "blks_read",
+    "blks_hit",
+    "blk_read_time",
+    "temp_bytes",
+    "heap_blks_read",
+    "heap_blks_hit",
+    "idx_blks_read",
+    "idx_blks_hit",
+)
+
+
+class ServerStatsSnapshot:
+    """Raw server statistics for one database at a point in time."""
+
+    def __init__(self, taken_at: datetime, values: Dict[str, Any]):
+        self.taken_at = taken_at
+        self.values = values
+
+    @property
+    def stats_reset(self) -> Optional[datetime]:
+        return self.values.get("stats_reset")
+
+    def to_json(self) -> str:
+        """Serialize for the shared snapshot store."""
+        values = dict(self.values)
+        if values.get("stats_reset") is not None:
+            values["stats_reset"] = values["stats_reset"].isoformat()
+        return json.dumps({"taken_at": self.taken_at.isoformat(), "values": values}, default=float)
+
+    @classmethod
+    def from_json(cls, payload: str) -> "ServerStatsSnapshot":
+        data = json.loads(payload)
+        values = data["values"]
+        if values.get("stats_reset") is not None:
+            values["stats_reset"] = datetime.fromisoformat(values["stats_reset"])
+        return cls(taken_at=datetime.fromisoformat(data["taken_at"]), values=values)
+
+    def __repr__(self) -> str:
+        return f"<ServerStatsSnapshot at {self.taken_at}>"
+
+
+def compute_server_rates(
+    previous: Optional[ServerStatsSnapshot], current: ServerStatsSnapshot
+) -> Dict[str, Any]:
+    """
+    Turn a server stats snapshot into gauges and per-interval rates.
+
+    Gauges (connections, lock waits) are always reported. Rates need a
+    previous snapshot and are None on the first poll or after a stats reset.
+
+    Args:
+        previous: Snapshot from the previous poll, if any.
+        current: Snapshot that was just taken.
+    """
+    values = current.values
+    stats = {
+        "collected_at": current.taken_at,
+        "interval_seconds": None,
+        "conn_count": int(values["numbackends"]),
+        "active_connections": int(values["active_connections"]),
+        "idle_in_transaction": int(values["idle_in_transaction"]),
+        "lock_waiters": int(values["lock_waiters"]),
+        "locks_not_granted": int(values["locks_not_granted"]),
+        "lock_wait_time_ms": float(values["lock_wait_seconds"]) * 1000,
+        "tps": None,
+        "deadlocks": None,
+        "cache_hit_ratio": None,
+        "disk_reads_per_second": None,
+    }
+
+    if previous is None or previous.stats_reset != current.stats_reset:
+        return stats
+
+    interval_seconds = (current.taken_at - previous.taken_at).total_seconds()
+    if interval_seconds <= 0:
+        return stats
+
+    delta = {
+        counter: float(values[counter] or 0) - float(previous.values[counter] or 0)
+        for counter in SERVER_COUNTERS
+    }
+    if any(value < 0 for value in delta.values()):
+        logger.info("Server statistics counters went backwards, re-baselining")
+        return stats
+
+    block_size = int(values["block_size"])
+    block_accesses = delta["blks_hit"] + delta["blks_read"]
+    table_hits = delta["heap_blks_hit"] + delta["idx_blks_hit"]
+    table_reads = delta["heap_blks_read"] + delta["idx_blks_read"]
+
+    stats.update({
+        "interval_seconds": interval_seconds,
+        "tps": (delta["xact_commit"] + delta["xact_rollback"]) / interval_seconds,
+        "commits": int(delta["xact_commit"]),
+        "rollbacks": int(delta["xact_rollback"]),
+        "deadlocks": int(delta["deadlocks"]),
+        "cache_hit_ratio": delta["blks_hit"] / block_accesses if block_accesses else None,
+        "table_cache_hit_ratio": (
+            table_hits / (table_hits + table_reads) if table_hits + table_reads else None
+        ),
+        "disk_reads_per_second": delta["blks_read"] / interval_seconds,
+        "disk_read_bytes_per_second": delta["blks_read"] * block_size / interval_seconds,
+        "blk_read_time_ms": delta["blk_read_time"],
+        "temp_bytes": int(delta["temp_bytes"]),
+    })
+    return stats
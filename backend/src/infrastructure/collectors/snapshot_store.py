@@ -0,0 +1,114 @@
+"""Shared store for the previous counter snapshot of each monitored database."""
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Snapshots of databases that stop being collected are dropped after a week
+SNAPSHOT_TTL_SECONDS = 7 * 24 * 3600
+SNAPSHOT_KEY_PREFIX = "queryinsight:snapshot"
+
+# Atomically replace the stored snapshot with a newer one and return the one
+# it replaced. A snapshot that is not newer than the stored one is rejected,
+# so two collections of the same database can never diff against the same
+# baseline: their intervals chain instead of overlapping.
+SWAP_SNAPSHOT_LUA = """
+local stored_at = redis.call('HGET', KEYS[1], 'taken_at')
+if stored_at and tonumber(stored_at) >= tonumber(ARGV[1]) then
+    return {0, ''}
+end
+local previous = redis.call('HGET', KEYS[1], 'payload') or ''
+redis.call('HSET', KEYS[1], 'taken_at', ARGV[1], 'payload', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return {1, previous}
+"""
+
+
+def _epoch(taken_at: datetime) -> float:
+    # Snapshot times are naive UTC
+    return (taken_at - datetime(1970, 1, 1)).total_seconds()
+
+
+class SnapshotStore:
+    """
+    Process-local snapshot store, for ad-hoc collectors and tests.
+
+    Collection workers must share snapshots across processes (see
+    RedisSnapshotStore); this class defines the interface both implement.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    async def swap(self, key: str, taken_at: datetime, payload: str) -> Tuple[bool, Optional[str]]:
+        """
+        Store ``payload`` as the latest snapshot of ``key`` if it is newer.
+
+        Returns:
+            (accepted, previous payload). When not accepted, a newer snapshot
+            is already stored and the caller must not report a delta.
+        """
+        epoch = _epoch(taken_at)
+        with self._lock:
+            stored = self._data.get(key)
+            if stored is not None and stored[0] >= epoch:
+                return False, None
+            self._data[key] = (epoch, payload)
+        return True, stored[1] if stored is not None else None
+
+
+class RedisSnapshotStore(SnapshotStore):
+    """Snapshot store shared by every worker process through Redis."""
+
+    def __init__(self, redis_url: str, ttl_seconds: int = SNAPSHOT_TTL_SECONDS):
+        super().__init__()
+        self.redis_url = redis_url
+        self.ttl_seconds = ttl_seconds
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _redis(self):
+        """Redis client bound to the running event loop."""
+        from redis.asyncio import Redis
+
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = Redis.from_url(self.redis_url)
+            self._loop = loop
+        return self._client
+
+    async def swap(self, key: str, taken_at: datetime, payload: str) -> Tuple[bool, Optional[str]]:
+        accepted, previous = await self._redis().eval(
+            SWAP_SNAPSHOT_LUA,
+            1,
+            f"{SNAPSHOT_KEY_PREFIX}:{key}",
+            repr(_epoch(taken_at)),
+            payload,
+            self.ttl_seconds,
+        )
+        if not accepted:
+            return False, None
+        if isinstance(previous, bytes):
+            previous = previous.decode()
+        return True, previous or None
+
+
+_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Get the process-wide Redis snapshot store, configured from settings."""
+    global _store
+    if _store is None:
+        from src.config import get_settings
+
+        _store = RedisSnapshotStore(get_settings().redis_url)
+    return _store
+
+
+# Snapshots of collectors created without a shared store (one-off scripts)
+local_snapshot_store = SnapshotStore()
@@ -0,0 +1,163 @@
+"""Interval deltas between pg_stat_statements snapshots."""
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cumulative pg_stat_statements counters we turn into per-interval deltas
+STATEMENT_COUNTERS = (
+    "calls",
+    "total_exec_time",
+    "rows",
+    "shared_blks_hit",
+    "shared_blks_read",
+    "shared_blks_dirtied",
+    "shared_blks_written",
+    "temp_blks_read",
+    "temp_blks_written",
+)
+
+
+class StatementSnapshot:
+    """Cumulative pg_stat_statements counters for one database at a point in time."""
+
+    def __init__(
+        self,
+        taken_at: datetime,
+        entries: Dict[int, Dict[str, float]],
+        stats_reset: Optional[datetime] = None,
+        dealloc: Optional[int] = None,
+    ):
+        self.taken_at = taken_at
+        self.entries = entries  # queryid -> counters
+        self.stats_reset = stats_reset
+        self.dealloc = dealloc
+
+    def to_json(self) -> str:
+        """Serialize for the shared snapshot store."""
+        return json.dumps({
+            "taken_at": self.taken_at.isoformat(),
+            "entries": {str(query_id): counters for query_id, counters in self.entries.items()},
+            "stats_reset": self.stats_reset.isoformat() if self.stats_reset else None,
+            "dealloc": self.dealloc,
+        })
+
+    @classmethod
+    def from_json(cls, payload: str) -> "StatementSnapshot":
+        data = json.loads(payload)
+        return cls(
+            taken_at=datetime.fromisoformat(data["taken_at"]),
+            entries={int(query_id): counters for query_id, counters in data["entries"].items()},
+            stats_reset=datetime.fromisoformat(data["stats_reset"]) if data["stats_reset"] else None,
+            dealloc=data["dealloc"],
+        )
+
+    def __repr__(self) -> str:
+        return f"<StatementSnapshot {len(self.entries)} statements at {self.taken_at}>"
+
+
+def compute_statement_deltas(
+    previous: Optional[StatementSnapshot], current: StatementSnapshot
+) -> Optional[Dict[str, Any]]:
+    """
+    Compute per-interval counters between two snapshots of the same database.
+
+    Counters are cumulative since the last stats reset, so the delta between
+    any two snapshots is exact regardless of how far apart they were taken.
+
+    Returns None when there is no usable baseline (first poll, or
+    pg_stat_statements_reset() was called in between). Entries whose counters
+    went backwards were evicted and re-created between polls and are skipped.
+
+    Args:
+        previous: Snapshot from the previous poll, if any.
+        current: Snapshot that was just taken.
+
+    Returns:
+        Dict with interval totals and a ``statements`` list of per-queryid deltas.
+    """
+    if previous is None:
+        return None
+
+    if current.stats_reset is not None and previous.stats_reset != current.stats_reset:
+        logger.info("pg_stat_statements was reset since the last snapshot, re-baselining")
+        return None
+
+    interval_seconds = (current.taken_at - previous.taken_at).total_seconds()
+    if interval_seconds <= 0:
+        return None
+
+    # Entries evicted by pg_stat_statements.max may have been re-created with
+    # fresh counters; those that went backwards are detected below.
+    dealloc_gap = (
+        current.dealloc is not None
+        and previous.dealloc is not None
+        and current.dealloc > previous.dealloc
+    )
+
+    totals = {counter: 0.0 for counter in STATEMENT_COUNTERS}
+    statements: List[Dict[str, Any]] = []
+    skipped = 0
+
+    for query_id, counters in current.entries.items():
+        before = previous.entries.get(query_id)
+        if before is None:
+            # New since the last poll: all of its activity happened in this interval
+            delta = {c: float(counters.get(c) or 0) for c in STATEMENT_COUNTERS}
+        else:
+            delta = {
+                c: float(counters.get(c) or 0) - float(before.get(c) or 0)
+                for c in STATEMENT_COUNTERS
+            }
+            if any(value < 0 for value in delta.values()):
+                skipped += 1
+                continue
+
+        if delta["calls"] <= 0:
+            continue
+
+        for counter in STATEMENT_COUNTERS:
+            totals[counter] += delta[counter]
+
+        statements.append({
+            "query_id": str(query_id),
+            "calls": int(delta["calls"]),
+            "total_exec_time_ms": delta["total_exec_time"],
+            "mean_exec_time_ms": delta["total_exec_time"] / delta["calls"],
+            "total_rows": int(delta["rows"]),
+            "shared_blks_hit": int(delta["shared_blks_hit"]),
+            "shared_blks_read": int(delta["shared_blks_read"]),
+            "shared_blks_dirtied": int(delta["shared_blks_dirtied"]),
+            "shared_blks_written": int(delta["shared_blks_written"]),
+            "temp_blks_read": int(delta["temp_blks_read"]),
+            "temp_blks_written": int(delta["temp_blks_written"]),
+            "calls_per_second": delta["calls"] / interval_seconds,
+        })
+
+    if skipped:
+        logger.info(f"Skipped {skipped} statements whose counters were reset between polls")
+
+    return {
+        "interval_seconds": interval_seconds,
+        "collected_at": current.taken_at,
+        "dealloc_gap": dealloc_gap,
+        "skipped_statements": skipped,
+        "calls": int(totals["calls"]),
+        "total_exec_time_ms": totals["total_exec_time"],
+        "total_rows": int(totals["rows"]),
+        "shared_blks_hit": int(totals["shared_blks_hit"]),
+        "shared_blks_read": int(totals["shared_blks_read"]),
+        "temp_blks_written": int(totals["temp_blks_written"]),
+        "statements": statements,
+    }
+
+
+def select_slow_statements(
+    statements: List[Dict[str, Any]], threshold_ms: float, limit: int
+) -> List[Dict[str, Any]]:
+    """Pick the statements whose interval mean latency exceeds the threshold."""
+    slow = [s for s in statements if s["mean_exec_time_ms"] > threshold_ms]
+    slow.sort(key=lambda s: s["mean_exec_time_ms"], reverse=True)
+    return slow[:limit]
@@ -6,6 +6,7 @@ from .models import (
     QueryModel,
     MetricModel,
     RecommendationModel,
+    WaitEventSampleModel,
 )
 
 __all__ = [
@@ -15,4 +16,5 @@ __all__ = [
     "QueryModel",
     "MetricModel",
     "RecommendationModel",
+    "WaitEventSampleModel",
 ]
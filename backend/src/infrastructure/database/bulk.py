@@ -0,0 +1,104 @@
+"""Bulk writes: multi-row INSERT ... ON CONFLICT, or COPY for large batches."""
+import enum
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# asyncpg accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 32767
+# From this many rows COPY beats multi-row INSERT
+COPY_THRESHOLD = 5_000
+
+
+def _copy_value(value: Any, enum_class: Optional[Type[enum.Enum]] = None) -> Any:
+    """Encode a value the way the asyncpg codecs of SQLAlchemy expect it."""
+    if enum_class is not None and isinstance(value, str) and not isinstance(value, enum.Enum):
+        # Like the ORM, accept member values ("index") as well as names ("INDEX")
+        return value if value in enum_class.__members__ else enum_class(value).name
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy Enum columns store member names
+        return value.name
+    if isinstance(value, (dict, list)):
+        # JSON/JSONB codecs take serialized text
+        return json.dumps(value)
+    return value
+
+
+async def copy_rows(session: AsyncSession, model, rows: List[Dict[str, Any]]) -> None:
+    """
+    Write rows with COPY ... FROM STDIN (binary) on the session's connection.
+
+    Runs inside the session transaction. COPY has no ON CONFLICT, so the rows
+    must be new, and every NOT NULL column without a server default must be
+    given.
+    """
+    if not rows:
+        return
+
+    columns = list(rows[0])
+    enum_classes = [getattr(model.__table__.c[c].type, "enum_class", None) for c in columns]
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        model.__tablename__,
+        records=[
+            tuple(_copy_value(row[c], e) for c, e in zip(columns, enum_classes, strict=True))
+            for row in rows
+        ],
+        columns=columns,
+    )
+
+
+async def insert_rows(
+    session: AsyncSession,
+    model,
+    rows: List[Dict[str, Any]],
+    update_columns: Sequence[str] = (),
+    copy_threshold: int = COPY_THRESHOLD,
+) -> List[Any]:
+    """
+    Insert rows in as few round trips as possible and return their ids.
+
+    Batches below ``copy_threshold`` are written with multi-row
+    ``INSERT ... ON CONFLICT (id)``, chunked to the bind parameter limit:
+    conflicting rows get ``update_columns`` overwritten, or are skipped (and
+    not returned) when there are none. Larger batches are new rows by
+    construction (collection, backfills) and go through COPY.
+
+    Args:
+        session: Session whose transaction the rows are written in.
+        model: Mapped model class with an ``id`` primary key.
+        rows: Column values per row, all with the same keys.
+        update_columns: Columns to overwrite on conflict.
+        copy_threshold: Minimum number of rows for COPY.
+
+    Returns:
+        Ids of the inserted or updated rows.
+    """
+    if not rows:
+        return []
+
+    if len(rows) >= copy_threshold:
+        await copy_rows(session, model, rows)
+        return [row["id"] for row in rows]
+
+    ids: List[Any] = []
+    for chunk in _chunks(rows, max(1, MAX_BIND_PARAMS // len(rows[0]))):
+        stmt = insert(model).values(chunk)
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[model.id],
+                set_={column: stmt.excluded[column] for column in update_columns},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[model.id])
+        result = await session.execute(stmt.returning(model.id))
+        ids.extend(result.scalars().all())
+    return ids
+
+
+def _chunks(rows: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
@@ -4,12 +4,14 @@ from typing import Optional
 import uuid
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -72,6 +74,10 @@ class DatabaseModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     last_connected_at = Column(DateTime, nullable=True)
     last_collection_at = Column(DateTime, nullable=True)
+    explain_cost_budget = Column(Float, nullable=True)
+    explain_timeout_ms = Column(Integer, nullable=True)
+    next_collection_at = Column(DateTime, nullable=True, index=True)
+    consecutive_failures = Column(Integer, default=0, nullable=False)
 
     # Relationships
     user = relationship("UserModel", back_populates="databases")
@@ -86,17 +92,66 @@ class QueryModel(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     database_id = Column(UUID(as_uuid=True), ForeignKey("databases.id", ondelete="CASCADE"), nullable=False)
-    sql_text = Column(Text, nullable=False)
-    normalized_sql = Column(Text, nullable=False)
+    # Texts live in query_patterns; only rows from before it was introduced keep them
+    sql_text = Column(Text, nullable=True)
+    normalized_sql = Column(Text, nullable=True)
+    normalization_version = Column(Integer, default=1, server_default="1", nullable=False)
+    fingerprint_hash = Column(BigInteger, nullable=False)
     execution_time_ms = Column(Float, nullable=False)
+    calls = Column(BigInteger, nullable=True)
+    pg_query_id = Column(BigInteger, nullable=True)
     explain_plan = Column(JSONB, nullable=True)
     timestamp = Column(DateTime, nullable=False, index=True)
     status = Column(Enum(QueryStatus), default=QueryStatus.SLOW, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index(
+            "ix_queries_database_id_fingerprint_hash_timestamp",
+            "database_id",
+            "fingerprint_hash",
+            "timestamp",
+        ),
+    )
+
     # Relationships
     database = relationship("DatabaseModel", back_populates="queries")
     recommendations = relationship("RecommendationModel", back_populates="query", cascade="all, delete-orphan")
+    pattern = relationship(
+        "QueryPatternModel",
+        primaryjoin=(
+            "and_(foreign(QueryModel.database_id) == QueryPatternModel.database_id, "
+            "foreign(QueryModel.fingerprint_hash) == QueryPatternModel.fingerprint_hash)"
+        ),
+        uselist=False,
+        viewonly=True,
+        lazy="joined",
+    )
+
+
+class QueryPatternModel(Base):
+    """Running statistics per fingerprint, upserted on every collection."""
+
+    __tablename__ = "query_patterns"
+
+    database_id = Column(
+        UUID(as_uuid=True), ForeignKey("databases.id", ondelete="CASCADE"), primary_key=True
+    )
+    fingerprint_hash = Column(BigInteger, primary_key=True)
+    normalized_sql = Column(Text, nullable=False)
+    sample_sql = Column(Text, nullable=False)
+    sample_count = Column(BigInteger, nullable=False)
+    total_calls = Column(BigInteger, nullable=False)
+    total_exec_time_ms = Column(Float, nullable=False)
+    sum_sq_exec_time_ms = Column(Float, nullable=False)
+    min_exec_time_ms = Column(Float, nullable=False)
+    max_exec_time_ms = Column(Float, nullable=False)
+    first_seen = Column(DateTime, nullable=False)
+    last_seen = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_query_patterns_database_id_last_seen", "database_id", "last_seen"),
+    )
 
 
 class MetricModel(Base):
@@ -104,13 +159,23 @@ class MetricModel(Base):
 
     __tablename__ = "metrics"
 
+    # Unique keys of a hypertable must include its partitioning column
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     database_id = Column(UUID(as_uuid=True), ForeignKey("databases.id", ondelete="CASCADE"), nullable=False)
-    timestamp = Column(DateTime, nullable=False, index=True)
+    timestamp = Column(DateTime, primary_key=True, nullable=False, index=True)
     metric_type = Column(Enum(MetricType), nullable=False)
     value = Column(Float, nullable=False)
     extra_data = Column(JSONB, default=dict, nullable=True)
 
+    __table_args__ = (
+        Index(
+            "ix_metrics_database_id_metric_type_timestamp",
+            "database_id",
+            "metric_type",
+            timestamp.desc(),
+        ),
+    )
+
     # Relationships
     database = relationship("DatabaseModel", back_populates="metrics")
 
@@ -134,3 +199,24 @@ class RecommendationModel(Base):
 
     # Relationships
     query = relationship("QueryModel", back_populates="recommendations")
+
+
+class WaitEventSampleModel(Base):
+    """Active Session History aggregates (pg_stat_activity samples per bucket)."""
+
+    __tablename__ = "wait_event_samples"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    database_id = Column(UUID(as_uuid=True), ForeignKey("databases.id", ondelete="CASCADE"), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    query_id = Column(BigInteger, nullable=True)
+    state = Column(String(64), nullable=False)
+    wait_event_type = Column(String(64), nullable=True)
+    wait_event = Column(String(64), nullable=True)
+    sample_count = Column(Integer, nullable=False)
+    sample_interval_seconds = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_wait_event_samples_database_id_bucket_start", "database_id", "bucket_start"),
+    )
+
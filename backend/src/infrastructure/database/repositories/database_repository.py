@@ -1,8 +1,9 @@
 """SQLAlchemy implementation of database repository."""
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.interfaces.repositories.database_repository import IDatabaseRepository
@@ -24,6 +25,16 @@ class PostgresDatabaseRepository(IDatabaseRepository):
         model = result.scalar_one_or_none()
         return self._to_entity(model) if model else None
 
+    async def get_by_ids(self, db_ids: List[UUID]) -> List[Database]:
+        """Get several databases by ID in one query."""
+        if not db_ids:
+            return []
+        result = await self.session.execute(
+            select(DatabaseModel).where(DatabaseModel.id.in_(db_ids))
+        )
+        models = result.scalars().all()
+        return [self._to_entity(m) for m in models]
+
     async def get_by_user_id(self, user_id: UUID) -> List[Database]:
         """Get all databases for a specific user."""
         result = await self.session.execute(
@@ -40,6 +51,28 @@ class PostgresDatabaseRepository(IDatabaseRepository):
         models = result.scalars().all()
         return [self._to_entity(m) for m in models]
 
+    async def get_due_for_collection(self, now: datetime, limit: int = 1000) -> List[Database]:
+        """
+        Lock and return active databases whose next collection is due.
+
+        Rows stay locked until the caller's transaction ends, and rows locked
+        by a concurrent dispatch are skipped, so overlapping dispatches never
+        claim the same database.
+        """
+        result = await self.session.execute(
+            select(DatabaseModel)
+            .where(DatabaseModel.is_active == True)
+            .where(or_(
+                DatabaseModel.next_collection_at.is_(None),
+                DatabaseModel.next_collection_at <= now
+            ))
+            .order_by(DatabaseModel.next_collection_at.asc().nulls_first())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        models = result.scalars().all()
+        return [self._to_entity(m) for m in models]
+
     async def save(self, database: Database) -> Database:
         """Save a new database or update an existing one."""
         # Check if database already exists in DB
@@ -55,6 +88,14 @@ class PostgresDatabaseRepository(IDatabaseRepository):
             model.encrypted_connection_string = database.encrypted_connection_string
             model.is_active = database.is_active
             model.last_connected_at = database.last_connected_at
+            model.last_collection_at = database.last_collection_at
+            model.connection_status = database.connection_status
+            model.connection_error = database.connection_error
+            model.last_checked_at = database.last_checked_at
+            model.next_collection_at = database.next_collection_at
+            model.consecutive_failures = database.consecutive_failures
+            model.explain_cost_budget = database.explain_cost_budget
+            model.explain_timeout_ms = database.explain_timeout_ms
         else:
             # Create new model
             model = DatabaseModel(
@@ -66,7 +107,12 @@ class PostgresDatabaseRepository(IDatabaseRepository):
                 is_active=database.is_active,
                 created_at=database.created_at,
                 last_connected_at=database.last_connected_at,
-                last_collection_at=database.last_collection_at
+                last_collection_at=database.last_collection_at,
+                connection_status=database.connection_status,
+                next_collection_at=database.next_collection_at,
+                consecutive_failures=database.consecutive_failures,
+                explain_cost_budget=database.explain_cost_budget,
+                explain_timeout_ms=database.explain_timeout_ms
             )
             self.session.add(model)
 
@@ -85,11 +131,22 @@ class PostgresDatabaseRepository(IDatabaseRepository):
 
     def _to_entity(self, model: DatabaseModel) -> Database:
         """Convert DatabaseModel to Database entity."""
-        return Database(
+        entity = Database(
             user_id=model.user_id,
             name=model.name,
             db_type=model.type,
             encrypted_connection_string=model.encrypted_connection_string,
             is_active=model.is_active,
-            database_id=model.id
+            database_id=model.id,
+            connection_status=model.connection_status,
+            connection_error=model.connection_error,
+            last_checked_at=model.last_checked_at,
+            explain_cost_budget=model.explain_cost_budget,
+            explain_timeout_ms=model.explain_timeout_ms,
+            next_collection_at=model.next_collection_at,
+            consecutive_failures=model.consecutive_failures or 0
         )
+        entity.created_at = model.created_at
+        entity.last_connected_at = model.last_connected_at
+        entity.last_collection_at = model.last_collection_at
+        return entity
@@ -1,21 +1,69 @@
 """SQLAlchemy implementation of metric repository."""
-from datetime import datetime
-from typing import List
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select, and_
+from sqlalchemy import BigInteger, Float, column, func, literal_column, select, and_, desc, table, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.interfaces.repositories.metric_repository import IMetricRepository
-from src.domain.entities.metric import Metric, MetricType
+from src.config import get_settings
+from src.domain.entities.metric import Metric, MetricResolution, MetricType
+from src.infrastructure.database.bulk import copy_rows
 from src.infrastructure.database.models import MetricModel
+from src.infrastructure.database.timescale import METRIC_ROLLUPS
+
+logger = logging.getLogger(__name__)
+
+
+# date_bin() origin matching time_bucket() for minute, hour and day buckets
+BUCKET_ORIGIN = datetime(2000, 1, 3)
+# How often missing continuous aggregates are looked for again
+ROLLUP_RECHECK_SECONDS = 300
+
+
+def _rollup_view(name: str):
+    """Lightweight table for a continuous aggregate view."""
+    return table(
+        name,
+        column("bucket", MetricModel.timestamp.type),
+        column("database_id", MetricModel.database_id.type),
+        column("metric_type", MetricModel.metric_type.type),
+        column("avg_value", Float),
+        column("min_value", Float),
+        column("max_value", Float),
+        column("sample_count", BigInteger),
+    )
 
 
 class PostgresMetricRepository(IMetricRepository):
     """PostgreSQL implementation of IMetricRepository."""
 
-    def __init__(self, session: AsyncSession):
+    # Whether the continuous aggregates exist (TimescaleDB). Once found they are
+    # assumed to stay; while missing they are looked for every ROLLUP_RECHECK_SECONDS,
+    # so a migration applied after startup is picked up.
+    _rollups_available: bool = False
+    _rollups_checked_at: Optional[float] = None
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        batch_size: Optional[int] = None,
+        max_latency_seconds: Optional[float] = None,
+    ):
+        if batch_size is None or max_latency_seconds is None:
+            settings = get_settings()
+            batch_size = batch_size or settings.metric_ingest_batch_size
+            if max_latency_seconds is None:
+                max_latency_seconds = settings.metric_ingest_max_latency_seconds
         self.session = session
+        self.batch_size = batch_size
+        self.max_latency_seconds = max_latency_seconds
+        self._buffer: List[Dict[str, Any]] = []
+        self._oldest_at: Optional[float] = None  # monotonic time of the oldest buffered metric
 
     async def get_by_database_id(
         self, db_id: UUID, start_time: datetime, end_time: datetime
@@ -33,6 +81,118 @@ class PostgresMetricRepository(IMetricRepository):
         models = result.scalars().all()
         return [self._to_entity(m) for m in models]
 
+    async def get_rollups(
+        self,
+        db_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+        resolution: MetricResolution,
+    ) -> List[Metric]:
+        """
+        Get metrics of a time range aggregated into buckets of ``resolution``.
+
+        Reads the matching continuous aggregate, or aggregates raw metrics
+        with date_bin() when TimescaleDB (and so the aggregates) is missing.
+        Each returned metric is one bucket: its value is the average and its
+        metadata holds min, max and count.
+        """
+        if resolution == MetricResolution.RAW:
+            return await self.get_by_database_id(db_id, start_time, end_time)
+
+        if await self._has_rollups():
+            view = _rollup_view(METRIC_ROLLUPS[resolution].view)
+            stmt = select(
+                view.c.bucket,
+                view.c.metric_type,
+                view.c.avg_value,
+                view.c.min_value,
+                view.c.max_value,
+                view.c.sample_count,
+            ).where(
+                and_(
+                    view.c.database_id == db_id,
+                    # Include the bucket that contains start_time
+                    view.c.bucket > start_time - timedelta(seconds=resolution.seconds),
+                    view.c.bucket <= end_time
+                )
+            ).order_by(view.c.bucket)
+        else:
+            bucket = func.date_bin(
+                literal_column(f"INTERVAL '{resolution.seconds} seconds'"),
+                MetricModel.timestamp,
+                BUCKET_ORIGIN,
+            ).label("bucket")
+            stmt = select(
+                bucket,
+                MetricModel.metric_type,
+                func.avg(MetricModel.value),
+                func.min(MetricModel.value),
+                func.max(MetricModel.value),
+                func.count(),
+            ).where(
+                and_(
+                    MetricModel.database_id == db_id,
+                    MetricModel.timestamp >= start_time,
+                    MetricModel.timestamp <= end_time
+                )
+            ).group_by(bucket, MetricModel.metric_type).order_by(bucket)
+
+        result = await self.session.execute(stmt)
+        return [
+            Metric(
+                database_id=db_id,
+                metric_type=metric_type,
+                value=avg_value,
+                timestamp=bucket_start,
+                metadata={
+                    "resolution": resolution.value,
+                    "min": min_value,
+                    "max": max_value,
+                    "count": sample_count,
+                },
+            )
+            for bucket_start, metric_type, avg_value, min_value, max_value, sample_count in result.all()
+        ]
+
+    async def _has_rollups(self) -> bool:
+        cls = type(self)
+        if cls._rollups_available:
+            return True
+        now = time.monotonic()
+        checked_at = cls._rollups_checked_at
+        if checked_at is not None and now - checked_at < ROLLUP_RECHECK_SECONDS:
+            return False
+
+        views = [rollup.view for rollup in METRIC_ROLLUPS.values()]
+        missing = await self.session.scalar(
+            text(
+                "SELECT count(*) FROM unnest(CAST(:views AS text[])) AS v "
+                "WHERE to_regclass(v) IS NULL"
+            ),
+            {"views": views},
+        )
+        cls._rollups_checked_at = now
+        cls._rollups_available = missing == 0
+        if not cls._rollups_available:
+            logger.info("Metric rollups not found, aggregating raw metrics")
+        return cls._rollups_available
+
+    async def get_latest(
+        self, db_id: UUID, metric_type: MetricType, since: datetime
+    ) -> Optional[Metric]:
+        """Get the most recent metric of a type recorded after ``since``."""
+        result = await self.session.execute(
+            select(MetricModel).where(
+                and_(
+                    MetricModel.database_id == db_id,
+                    MetricModel.metric_type == metric_type,
+                    MetricModel.timestamp >= since
+                )
+            ).order_by(desc(MetricModel.timestamp)).limit(1)
+        )
+        model = result.scalar_one_or_none()
+        return self._to_entity(model) if model else None
+
     async def save(self, metric: Metric) -> Metric:
         """Save a new metric."""
         model = MetricModel(
@@ -60,6 +220,51 @@ class PostgresMetricRepository(IMetricRepository):
         await self.session.flush()
         return metrics
 
+    async def ingest(self, metrics: List[Metric]) -> None:
+        """
+        Buffer metrics for a bulk write, flushed by size or age and on commit.
+
+        Metrics from every database sharing this session (a collection shard)
+        accumulate in one buffer, which is written with binary COPY once it
+        holds ``batch_size`` metrics or its oldest metric has waited
+        ``max_latency_seconds``. SqlAlchemyUnitOfWork flushes the rest before
+        committing.
+        """
+        if not metrics:
+            return
+        if self._oldest_at is None:
+            self._oldest_at = time.monotonic()
+
+        self._buffer.extend(
+            {
+                "id": uuid.uuid4(),
+                "database_id": metric.database_id,
+                "timestamp": metric.timestamp,
+                "metric_type": metric.metric_type,
+                "value": metric.value,
+                "extra_data": metric.metadata,
+            }
+            for metric in metrics
+        )
+
+        if (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._oldest_at >= self.max_latency_seconds
+        ):
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write the buffered metrics with COPY and return how many were written."""
+        rows, self._buffer, self._oldest_at = self._buffer, [], None
+        if rows:
+            await copy_rows(self.session, MetricModel, rows)
+            logger.debug(f"Copied {len(rows)} metrics")
+        return len(rows)
+
+    def discard_buffer(self) -> None:
+        """Drop buffered metrics (the transaction is rolled back)."""
+        self._buffer, self._oldest_at = [], None
+
     def _to_entity(self, model: MetricModel) -> Metric:
         """Convert MetricModel to Metric entity."""
         return Metric(
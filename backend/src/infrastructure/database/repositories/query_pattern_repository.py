@@ -0,0 +1,281 @@
+"""SQLAlchemy implementation of query pattern repository."""
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, case, delete, desc, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.interfaces.repositories.query_pattern_repository import IQueryPatternRepository
+from src.domain.entities.query_pattern import QueryPattern
+from src.infrastructure.database.models import QueryModel, QueryPatternModel
+from src.infrastructure.services.sql_normalizer import NORMALIZATION_VERSION, SqlNormalizer
+
+# Recompute statistics from the stored samples. New patterns take their texts
+# from rows that still have them; existing patterns keep their texts.
+REBUILD_PATTERNS_SQL = """
+    INSERT INTO query_patterns (
+        database_id, fingerprint_hash, normalized_sql, sample_sql,
+        sample_count, total_calls, total_exec_time_ms, sum_sq_exec_time_ms,
+        min_exec_time_ms, max_exec_time_ms, first_seen, last_seen
+    )
+    SELECT
+        database_id,
+        fingerprint_hash,
+        coalesce(max(normalized_sql), ''),
+        coalesce(max(sql_text), ''),
+        count(*),
+        sum(coalesce(calls, 1)),
+        sum(execution_time_ms * coalesce(calls, 1)),
+        sum(execution_time_ms * execution_time_ms * coalesce(calls, 1)),
+        min(execution_time_ms),
+        max(execution_time_ms),
+        min(timestamp),
+        max(timestamp)
+    FROM queries
+    GROUP BY database_id, fingerprint_hash
+    ON CONFLICT (database_id, fingerprint_hash) DO UPDATE SET
+        sample_count = EXCLUDED.sample_count,
+        total_calls = EXCLUDED.total_calls,
+        total_exec_time_ms = EXCLUDED.total_exec_time_ms,
+        sum_sq_exec_time_ms = EXCLUDED.sum_sq_exec_time_ms,
+        min_exec_time_ms = EXCLUDED.min_exec_time_ms,
+        max_exec_time_ms = EXCLUDED.max_exec_time_ms,
+        first_seen = EXCLUDED.first_seen,
+        last_seen = EXCLUDED.last_seen
+"""
+
+DELETE_ORPHAN_PATTERNS_SQL = """
+    DELETE FROM query_patterns p
+    WHERE NOT EXISTS (
+        SELECT 1 FROM queries q
+        WHERE q.database_id = p.database_id AND q.fingerprint_hash = p.fingerprint_hash
+    )
+"""
+
+
+# Move the samples of a fingerprint to its new fingerprint. Samples recorded
+# since the texts moved to query_patterns have no normalized_sql of their own
+# and keep it NULL.
+REKEY_SAMPLES_SQL = """
+    UPDATE queries SET
+        fingerprint_hash = :new_hash,
+        normalized_sql = CASE WHEN normalized_sql IS NULL THEN NULL ELSE :normalized_sql END,
+        normalization_version = :version
+    WHERE database_id = :database_id
+      AND fingerprint_hash = :old_hash
+      AND normalization_version < :version
+"""
+
+
+class PostgresQueryPatternRepository(IQueryPatternRepository):
+    """PostgreSQL implementation of IQueryPatternRepository."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def upsert_all(self, patterns: List[QueryPattern]) -> None:
+        """
+        Merge the statistics of new samples into the stored patterns.
+
+        One INSERT ... ON CONFLICT DO UPDATE adds counts and sums and widens
+        min/max and first/last seen, so the texts are written once per
+        fingerprint instead of once per sample. Patterns must be distinct
+        per key (see QueryPattern.from_samples).
+        """
+        if not patterns:
+            return
+
+        # A stable key order keeps concurrent collections from deadlocking
+        patterns = sorted(patterns, key=lambda p: (str(p.database_id), p.fingerprint_hash))
+        stmt = insert(QueryPatternModel).values([
+            {
+                "database_id": p.database_id,
+                "fingerprint_hash": p.fingerprint_hash,
+                "normalized_sql": p.normalized_sql,
+                "sample_sql": p.sample_sql,
+                "sample_count": p.sample_count,
+                "total_calls": p.total_calls,
+                "total_exec_time_ms": p.total_exec_time_ms,
+                "sum_sq_exec_time_ms": p.sum_sq_exec_time_ms,
+                "min_exec_time_ms": p.min_exec_time_ms,
+                "max_exec_time_ms": p.max_exec_time_ms,
+                "first_seen": p.first_seen,
+                "last_seen": p.last_seen,
+            }
+            for p in patterns
+        ])
+        stored, new = QueryPatternModel, stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[QueryPatternModel.database_id, QueryPatternModel.fingerprint_hash],
+            set_={
+                # Keep the text of the most recent sample, whichever batch arrives last
+                "sample_sql": case(
+                    (new.last_seen >= stored.last_seen, new.sample_sql), else_=stored.sample_sql
+                ),
+                "sample_count": stored.sample_count + new.sample_count,
+                "total_calls": stored.total_calls + new.total_calls,
+                "total_exec_time_ms": stored.total_exec_time_ms + new.total_exec_time_ms,
+                "sum_sq_exec_time_ms": stored.sum_sq_exec_time_ms + new.sum_sq_exec_time_ms,
+                "min_exec_time_ms": func.least(stored.min_exec_time_ms, new.min_exec_time_ms),
+                "max_exec_time_ms": func.greatest(stored.max_exec_time_ms, new.max_exec_time_ms),
+                "first_seen": func.least(stored.first_seen, new.first_seen),
+                "last_seen": func.greatest(stored.last_seen, new.last_seen),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def rebuild_from_samples(self) -> None:
+        """Recompute every pattern from the queries table and drop unused ones."""
+        await self.session.execute(text(REBUILD_PATTERNS_SQL))
+        await self.session.execute(text(DELETE_ORPHAN_PATTERNS_SQL))
+
+    async def renormalize(self, db_id: UUID, version: int = NORMALIZATION_VERSION) -> int:
+        """
+        Move the fingerprints of a database's outdated samples to ``version`` rules.
+
+        The new fingerprint of each pattern is computed from its stored
+        sample_sql (samples no longer carry their own text). Samples are
+        re-keyed with it, and patterns that end up on the same fingerprint
+        are merged, into an existing pattern if there is one. Samples whose
+        fingerprint has no pattern with a text are left untouched.
+
+        Returns:
+            Number of fingerprints renormalized.
+        """
+        outdated = (
+            select(QueryModel.fingerprint_hash)
+            .where(QueryModel.database_id == db_id)
+            .where(QueryModel.normalization_version < version)
+            .distinct()
+        )
+        result = await self.session.execute(
+            select(QueryPatternModel)
+            .where(QueryPatternModel.database_id == db_id)
+            .where(QueryPatternModel.fingerprint_hash.in_(outdated))
+            .where(QueryPatternModel.sample_sql != "")
+        )
+        patterns = [self._to_entity(m) for m in result.scalars().all()]
+        if not patterns:
+            return 0
+
+        normalized = SqlNormalizer.normalize_many([p.sample_sql for p in patterns], version=version)
+        moved: Dict[int, QueryPattern] = {}
+        renames = []
+        for pattern, normalized_sql in zip(patterns, normalized, strict=True):
+            new_hash = SqlNormalizer.fingerprint_hash(normalized_sql)
+            renames.append({
+                "database_id": db_id,
+                "old_hash": pattern.fingerprint_hash,
+                "new_hash": new_hash,
+                "normalized_sql": normalized_sql,
+                "version": version,
+            })
+            if new_hash == pattern.fingerprint_hash:
+                continue
+            target = moved.get(new_hash)
+            if target is None:
+                moved[new_hash] = QueryPattern(
+                    database_id=db_id,
+                    fingerprint_hash=new_hash,
+                    normalized_sql=normalized_sql,
+                    sample_sql=pattern.sample_sql,
+                    first_seen=pattern.first_seen,
+                    last_seen=pattern.last_seen,
+                )
+                target = moved[new_hash]
+            target.merge(pattern)
+
+        await self.session.execute(text(REKEY_SAMPLES_SQL), renames)
+        old_keys = [
+            (db_id, r["old_hash"]) for r in renames if r["old_hash"] != r["new_hash"]
+        ]
+        if old_keys:
+            # Deleted before the upsert, so a pattern that is both renamed and
+            # a rename target only keeps what is merged into it
+            await self.session.execute(
+                delete(QueryPatternModel).where(
+                    tuple_(QueryPatternModel.database_id, QueryPatternModel.fingerprint_hash).in_(old_keys)
+                )
+            )
+            await self.upsert_all(list(moved.values()))
+        return len(renames)
+
+    async def get_regression_ratios(
+        self,
+        db_ids: List[UUID],
+        since: datetime,
+        min_samples: int = 5,
+        min_increase_ms: float = 50.0,
+    ) -> Dict[UUID, float]:
+        """
+        Get the worst recent/running mean latency ratio of each database.
+
+        Compares the samples recorded since ``since`` with each fingerprint's
+        running mean, for all databases in one query. Fingerprints with fewer
+        than ``min_samples`` samples, or less than ``min_increase_ms`` slower,
+        are ignored; databases without such a fingerprint are left out.
+        """
+        if not db_ids:
+            return {}
+        calls = func.coalesce(QueryModel.calls, 1)
+        recent = (
+            select(
+                QueryModel.database_id,
+                QueryModel.fingerprint_hash,
+                (func.sum(QueryModel.execution_time_ms * calls) / func.sum(calls)).label("avg_ms"),
+            )
+            .where(QueryModel.database_id.in_(db_ids))
+            .where(QueryModel.timestamp >= since)
+            .group_by(QueryModel.database_id, QueryModel.fingerprint_hash)
+            .subquery()
+        )
+        baseline = QueryPatternModel.total_exec_time_ms / QueryPatternModel.total_calls
+        result = await self.session.execute(
+            select(recent.c.database_id, func.max(recent.c.avg_ms / baseline))
+            .join(QueryPatternModel, and_(
+                QueryPatternModel.database_id == recent.c.database_id,
+                QueryPatternModel.fingerprint_hash == recent.c.fingerprint_hash,
+            ))
+            .where(QueryPatternModel.sample_count >= min_samples)
+            .where(QueryPatternModel.total_calls > 0)
+            .where(QueryPatternModel.total_exec_time_ms > 0)
+            .where(recent.c.avg_ms - baseline > min_increase_ms)
+            .group_by(recent.c.database_id)
+        )
+        return {database_id: ratio for database_id, ratio in result.all()}
+
+    async def get_by_fingerprint(self, db_id: UUID, fingerprint_hash: int) -> Optional[QueryPattern]:
+        """Get the pattern of one fingerprint."""
+        model = await self.session.get(QueryPatternModel, (db_id, fingerprint_hash))
+        return self._to_entity(model) if model else None
+
+    async def get_by_database_id(
+        self, db_id: UUID, since: Optional[datetime] = None, limit: int = 50
+    ) -> List[QueryPattern]:
+        """Get the patterns seen since a time, by total execution time."""
+        stmt = select(QueryPatternModel).where(QueryPatternModel.database_id == db_id)
+        if since is not None:
+            stmt = stmt.where(QueryPatternModel.last_seen >= since)
+        stmt = stmt.order_by(desc(QueryPatternModel.total_exec_time_ms)).limit(limit)
+
+        result = await self.session.execute(stmt)
+        return [self._to_entity(m) for m in result.scalars().all()]
+
+    def _to_entity(self, model: QueryPatternModel) -> QueryPattern:
+        """Convert QueryPatternModel to QueryPattern entity."""
+        return QueryPattern(
+            database_id=model.database_id,
+            fingerprint_hash=model.fingerprint_hash,
+            normalized_sql=model.normalized_sql,
+            sample_sql=model.sample_sql,
+            first_seen=model.first_seen,
+            last_seen=model.last_seen,
+            sample_count=model.sample_count,
+            total_calls=model.total_calls,
+            total_exec_time_ms=model.total_exec_time_ms,
+            sum_sq_exec_time_ms=model.sum_sq_exec_time_ms,
+            min_exec_time_ms=model.min_exec_time_ms,
+            max_exec_time_ms=model.max_exec_time_ms,
+        )
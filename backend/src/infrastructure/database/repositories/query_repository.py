@@ -1,13 +1,14 @@
 """SQLAlchemy implementation of query repository."""
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import select, desc, func, text
+from sqlalchemy import and_, select, desc, func, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.interfaces.repositories.query_repository import IQueryRepository
 from src.domain.entities.query import Query, QueryStatus
-from src.infrastructure.database.models import QueryModel
+from src.infrastructure.database.bulk import insert_rows
+from src.infrastructure.database.models import QueryModel, QueryPatternModel
 
 
 from sqlalchemy.orm import selectinload
@@ -51,9 +52,12 @@ class PostgresQueryRepository(IQueryRepository):
             model = QueryModel(
                 id=query.id,
                 database_id=query.database_id,
-                sql_text=query.sql_text,
-                normalized_sql=query.normalized_sql,
+                # The texts are stored once per fingerprint, in query_patterns
+                normalization_version=query.normalization_version,
+                fingerprint_hash=query.fingerprint_hash,
                 execution_time_ms=query.execution_time_ms,
+                calls=query.calls,
+                pg_query_id=query.pg_query_id,
                 explain_plan=query.explain_plan,
                 timestamp=query.timestamp,
                 status=query.status,
@@ -65,33 +69,82 @@ class PostgresQueryRepository(IQueryRepository):
         return query
 
     async def save_all(self, queries: List[Query]) -> List[Query]:
-        """Save multiple queries."""
-        for query in queries:
-            await self.save(query)
+        """
+        Save multiple queries in bulk.
+
+        One multi-row INSERT (COPY for large batches) instead of a lookup,
+        add and flush per row. Existing rows get their plan and status
+        updated, like save().
+        """
+        await insert_rows(
+            self.session,
+            QueryModel,
+            [
+                {
+                    "id": query.id,
+                    "database_id": query.database_id,
+                    # The texts are stored once per fingerprint, in query_patterns
+                    "normalization_version": query.normalization_version,
+                    "fingerprint_hash": query.fingerprint_hash,
+                    "execution_time_ms": query.execution_time_ms,
+                    "calls": query.calls,
+                    "pg_query_id": query.pg_query_id,
+                    "explain_plan": query.explain_plan,
+                    "timestamp": query.timestamp,
+                    "status": query.status,
+                    "created_at": query.created_at,
+                }
+                for query in queries
+            ],
+            update_columns=("explain_plan", "status"),
+        )
         return queries
 
     async def get_aggregated_metrics(self, db_id: UUID, hours: int = 24) -> List[dict]:
-        """Get aggregated metrics grouped by normalized_sql with enhanced pattern detection."""
+        """Get aggregated metrics grouped by fingerprint with enhanced pattern detection."""
         since = datetime.utcnow() - timedelta(hours=hours)
         
-        # Query to aggregate metrics by fingerprint
-        stmt = (
+        # Rows hold per-interval means, so weight them by the calls they represent.
+        # Legacy rows without a call count weigh as a single sample.
+        calls = func.coalesce(QueryModel.calls, 1)
+
+        # Aggregate by the 64-bit fingerprint hash
+        # (ix_queries_database_id_fingerprint_hash_timestamp), not the text
+        patterns = (
             select(
-                QueryModel.normalized_sql,
+                QueryModel.fingerprint_hash,
                 func.count(QueryModel.id).label("count"),
-                func.avg(QueryModel.execution_time_ms).label("avg_exec_time_ms"),
+                func.sum(calls).label("total_calls"),
+                (
+                    func.sum(QueryModel.execution_time_ms * calls) / func.sum(calls)
+                ).label("avg_exec_time_ms"),
                 func.max(QueryModel.execution_time_ms).label("max_exec_time_ms"),
                 func.min(QueryModel.execution_time_ms).label("min_exec_time_ms"),
                 func.max(QueryModel.timestamp).label("last_seen"),
-                # Get a sample SQL for display
-                func.max(QueryModel.sql_text).label("sample_sql")
             )
             .where(QueryModel.database_id == db_id)
             .where(QueryModel.timestamp >= since)
-            .group_by(QueryModel.normalized_sql)
+            .group_by(QueryModel.fingerprint_hash)
             .having(func.count(QueryModel.id) > 1)  # Only patterns that repeat
             .order_by(desc("count"))
             .limit(10)
+            .subquery()
+        )
+        # Texts are stored once per fingerprint
+        stmt = (
+            select(
+                patterns,
+                QueryPatternModel.normalized_sql,
+                QueryPatternModel.sample_sql,
+            )
+            .join(
+                QueryPatternModel,
+                and_(
+                    QueryPatternModel.database_id == db_id,
+                    QueryPatternModel.fingerprint_hash == patterns.c.fingerprint_hash,
+                ),
+            )
+            .order_by(desc(patterns.c.count))
         )
         
         result = await self.session.execute(stmt)
@@ -99,9 +152,11 @@ class PostgresQueryRepository(IQueryRepository):
         
         return [
             {
+                "fingerprint_hash": row.fingerprint_hash,
                 "normalized_sql": row.normalized_sql,
                 "sample_sql": row.sample_sql,
                 "count": row.count,
+                "total_calls": int(row.total_calls),
                 "avg_exec_time_ms": float(row.avg_exec_time_ms),
                 "max_exec_time_ms": float(row.max_exec_time_ms),
                 "min_exec_time_ms": float(row.min_exec_time_ms),
@@ -112,18 +167,41 @@ class PostgresQueryRepository(IQueryRepository):
             for row in rows
         ]
 
+    async def get_latest_plans(self, db_id: UUID, fingerprint_hashes: List[int]) -> Dict[int, dict]:
+        """Get the most recent EXPLAIN plan of each fingerprint that has one."""
+        if not fingerprint_hashes:
+            return {}
+        result = await self.session.execute(
+            select(QueryModel.fingerprint_hash, QueryModel.explain_plan)
+            .where(QueryModel.database_id == db_id)
+            .where(QueryModel.fingerprint_hash.in_(fingerprint_hashes))
+            .where(QueryModel.explain_plan.isnot(None))
+            .distinct(QueryModel.fingerprint_hash)
+            .order_by(QueryModel.fingerprint_hash, desc(QueryModel.timestamp))
+        )
+        return {row.fingerprint_hash: row.explain_plan for row in result.all()}
+
     def _to_entity(self, model: QueryModel) -> Query:
         """Convert QueryModel to Query entity."""
         from src.domain.entities.recommendation import Recommendation
+
+        # Samples without texts always have a pattern (upserted with them)
+        pattern = model.pattern
         
         q = Query(
             database_id=model.database_id,
-            sql_text=model.sql_text,
-            normalized_sql=model.normalized_sql,
+            sql_text=model.sql_text if model.sql_text is not None else pattern.sample_sql,
+            normalized_sql=(
+                model.normalized_sql if model.normalized_sql is not None else pattern.normalized_sql
+            ),
             execution_time_ms=model.execution_time_ms,
             explain_plan=model.explain_plan,
             timestamp=model.timestamp,
-            query_id=model.id
+            query_id=model.id,
+            calls=model.calls,
+            pg_query_id=model.pg_query_id,
+            normalization_version=model.normalization_version,
+            fingerprint_hash=model.fingerprint_hash,
         )
         q.status = model.status
         
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.interfaces.repositories.recommendation_repository import IRecommendationRepository
 from src.domain.entities.recommendation import Recommendation, RecommendationStatus
+from src.infrastructure.database.bulk import insert_rows
 from src.infrastructure.database.models import RecommendationModel, QueryModel
 
 
@@ -68,9 +69,42 @@ class PostgresRecommendationRepository(IRecommendationRepository):
         return recommendation
 
     async def save_all(self, recommendations: List[Recommendation]) -> List[Recommendation]:
-        """Save multiple recommendations."""
-        for rec in recommendations:
-            await self.save(rec)
+        """
+        Save multiple recommendations in one multi-row INSERT (COPY for large batches).
+
+        Recommendations that are already stored are updated, as with
+        individual saves.
+        """
+        await insert_rows(
+            self.session,
+            RecommendationModel,
+            [
+                {
+                    "id": rec.id,
+                    "query_id": rec.query_id,
+                    "type": rec.type,
+                    "title": rec.title,
+                    "description": rec.description,
+                    "sql_suggestion": rec.sql_suggestion,
+                    "estimated_impact": rec.estimated_impact,
+                    "confidence": rec.confidence,
+                    "status": rec.status,
+                    "created_at": rec.created_at,
+                    "applied_at": rec.applied_at,
+                }
+                for rec in recommendations
+            ],
+            update_columns=(
+                "type",
+                "title",
+                "description",
+                "sql_suggestion",
+                "estimated_impact",
+                "confidence",
+                "status",
+                "applied_at",
+            ),
+        )
         return recommendations
 
     async def update_status(self, recommendation_id: UUID, status: RecommendationStatus) -> None:
@@ -0,0 +1,149 @@
+"""SQLAlchemy implementation of wait event sample repository."""
+from datetime import datetime, timedelta
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import and_, desc, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.interfaces.repositories.wait_event_repository import IWaitEventRepository
+from src.domain.entities.wait_event import WaitEventSample
+from src.infrastructure.database.models import QueryModel, QueryPatternModel, WaitEventSampleModel
+
+# Sessions that are active without a wait event are running on CPU
+CPU_WAIT_EVENT = "CPU"
+
+
+class PostgresWaitEventRepository(IWaitEventRepository):
+    """PostgreSQL implementation of IWaitEventRepository."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def save_all(self, samples: List[WaitEventSample]) -> List[WaitEventSample]:
+        """Save multiple aggregated samples."""
+        for sample in samples:
+            self.session.add(WaitEventSampleModel(
+                id=sample.id,
+                database_id=sample.database_id,
+                bucket_start=sample.bucket_start,
+                query_id=sample.query_id,
+                state=sample.state,
+                wait_event_type=sample.wait_event_type,
+                wait_event=sample.wait_event,
+                sample_count=sample.sample_count,
+                sample_interval_seconds=sample.sample_interval_seconds,
+            ))
+        await self.session.flush()
+        return samples
+
+    def _range(self, db_id: UUID, start_time: datetime, end_time: datetime):
+        return and_(
+            WaitEventSampleModel.database_id == db_id,
+            WaitEventSampleModel.bucket_start >= start_time,
+            WaitEventSampleModel.bucket_start <= end_time,
+        )
+
+    @staticmethod
+    def _wait_event_type():
+        return func.coalesce(WaitEventSampleModel.wait_event_type, literal(CPU_WAIT_EVENT))
+
+    @staticmethod
+    def _db_time():
+        return func.sum(
+            WaitEventSampleModel.sample_count * WaitEventSampleModel.sample_interval_seconds
+        )
+
+    async def get_breakdown_by_fingerprint(
+        self, db_id: UUID, start_time: datetime, end_time: datetime
+    ) -> List[dict]:
+        """Get sampled session time per fingerprint and wait event."""
+        # Map pg_stat_statements queryids to the fingerprints we already store
+        fingerprints = (
+            select(
+                QueryModel.pg_query_id,
+                func.max(QueryModel.fingerprint_hash).label("fingerprint_hash"),
+            )
+            .where(QueryModel.database_id == db_id)
+            .where(QueryModel.pg_query_id.is_not(None))
+            .group_by(QueryModel.pg_query_id)
+            .subquery()
+        )
+        wait_event_type = self._wait_event_type().label("wait_event_type")
+        db_time = self._db_time().label("db_time_seconds")
+
+        stmt = (
+            select(
+                WaitEventSampleModel.query_id,
+                QueryPatternModel.normalized_sql,
+                wait_event_type,
+                WaitEventSampleModel.wait_event,
+                func.sum(WaitEventSampleModel.sample_count).label("samples"),
+                db_time,
+            )
+            .outerjoin(fingerprints, fingerprints.c.pg_query_id == WaitEventSampleModel.query_id)
+            .outerjoin(
+                QueryPatternModel,
+                and_(
+                    QueryPatternModel.database_id == db_id,
+                    QueryPatternModel.fingerprint_hash == fingerprints.c.fingerprint_hash,
+                ),
+            )
+            .where(self._range(db_id, start_time, end_time))
+            .group_by(
+                WaitEventSampleModel.query_id,
+                QueryPatternModel.normalized_sql,
+                wait_event_type,
+                WaitEventSampleModel.wait_event,
+            )
+            .order_by(desc("db_time_seconds"))
+            .limit(100)
+        )
+        result = await self.session.execute(stmt)
+
+        return [
+            {
+                "query_id": str(row.query_id) if row.query_id is not None else None,
+                "normalized_sql": row.normalized_sql,
+                "wait_event_type": row.wait_event_type,
+                "wait_event": row.wait_event,
+                "samples": int(row.samples),
+                "db_time_seconds": float(row.db_time_seconds),
+            }
+            for row in result.all()
+        ]
+
+    async def get_timeline(
+        self, db_id: UUID, start_time: datetime, end_time: datetime, bucket_seconds: int
+    ) -> List[dict]:
+        """Get sampled session time per time bucket and wait event type."""
+        bucket = func.date_bin(
+            timedelta(seconds=bucket_seconds), WaitEventSampleModel.bucket_start, start_time
+        ).label("bucket")
+        wait_event_type = self._wait_event_type().label("wait_event_type")
+        window_seconds = float(bucket_seconds)
+
+        stmt = (
+            select(
+                bucket,
+                wait_event_type,
+                func.sum(WaitEventSampleModel.sample_count).label("samples"),
+                self._db_time().label("db_time_seconds"),
+            )
+            .where(self._range(db_id, start_time, end_time))
+            .group_by(bucket, wait_event_type)
+            .order_by(bucket, wait_event_type)
+        )
+        result = await self.session.execute(stmt)
+
+        return [
+            {
+                "bucket": row.bucket,
+                "wait_event_type": row.wait_event_type,
+                "samples": int(row.samples),
+                "db_time_seconds": float(row.db_time_seconds),
+                # Average number of sessions in this state (average active sessions)
+                "average_active_sessions": float(row.db_time_seconds) / window_seconds,
+            }
+            for row in result.all()
+        ]
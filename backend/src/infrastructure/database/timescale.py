@@ -0,0 +1,125 @@
+"""TimescaleDB policies and continuous aggregates for the metrics hypertable."""
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+from src.domain.entities.metric import MetricResolution
+
+METRICS_HYPERTABLE = "metrics"
+
+HAS_TIMESCALEDB_SQL = text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+
+IS_HYPERTABLE_SQL = text(
+    "SELECT 1 FROM timescaledb_information.hypertables WHERE hypertable_name = :table"
+).bindparams(table=METRICS_HYPERTABLE)
+
+# Widest continuous aggregate refresh window (metrics_1d), in days
+ROLLUP_REFRESH_WINDOW_DAYS = 7
+
+
+def validate_metrics_retention(retention_days: int) -> None:
+    """
+    Reject a raw metrics retention that does not outlast the rollup refresh windows.
+
+    A refresh recomputes its whole window from raw metrics, so dropping raw
+    chunks inside the window would erase rollup buckets that are still
+    being refreshed.
+
+    Raises:
+        ValueError: If ``retention_days`` is negative or within the refresh window.
+    """
+    if retention_days < 0 or 0 < retention_days <= ROLLUP_REFRESH_WINDOW_DAYS:
+        raise ValueError(
+            f"METRICS_RETENTION_DAYS must be 0 (keep forever) or more than "
+            f"{ROLLUP_REFRESH_WINDOW_DAYS} days, the rollup refresh window; got {retention_days}"
+        )
+
+
+def metrics_policy_statements(compress_after_hours: int, retention_days: int) -> List[TextClause]:
+    """
+    Statements that (re)set the compression and retention policies of metrics.
+
+    Existing policies are removed first, so running them again applies changed
+    settings. A retention of 0 days keeps metrics forever.
+
+    Args:
+        compress_after_hours: Age after which chunks are compressed.
+        retention_days: Age after which chunks are dropped.
+
+    Returns:
+        Statements to execute in order, on a database where metrics is a hypertable.
+
+    Raises:
+        ValueError: If ``retention_days`` is invalid (see validate_metrics_retention).
+    """
+    validate_metrics_retention(retention_days)
+    statements = [
+        text("SELECT remove_compression_policy(CAST(:table AS regclass), if_exists => true)"),
+        text(
+            "SELECT add_compression_policy(CAST(:table AS regclass), make_interval(hours => :hours))"
+        ).bindparams(hours=compress_after_hours),
+        text("SELECT remove_retention_policy(CAST(:table AS regclass), if_exists => true)"),
+    ]
+    if retention_days > 0:
+        statements.append(
+            text(
+                "SELECT add_retention_policy(CAST(:table AS regclass), make_interval(days => :days))"
+            ).bindparams(days=retention_days)
+        )
+    return [statement.bindparams(table=METRICS_HYPERTABLE) for statement in statements]
+
+
+class MetricRollup:
+    """A continuous aggregate of metrics at one bucket width."""
+
+    def __init__(
+        self,
+        view: str,
+        bucket: str,
+        start_offset: str,
+        end_offset: str,
+        schedule_interval: str,
+    ):
+        self.view = view
+        self.bucket = bucket
+        # Refresh window and cadence of the refresh policy
+        self.start_offset = start_offset
+        self.end_offset = end_offset
+        self.schedule_interval = schedule_interval
+
+    def create_sql(self) -> str:
+        """CREATE MATERIALIZED VIEW statement (no data, so it runs in a transaction)."""
+        return (
+            f"CREATE MATERIALIZED VIEW {self.view} "
+            "WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS "
+            f"SELECT time_bucket(INTERVAL '{self.bucket}', timestamp) AS bucket, "
+            "database_id, metric_type, "
+            "avg(value) AS avg_value, min(value) AS min_value, "
+            "max(value) AS max_value, count(*) AS sample_count "
+            f"FROM {METRICS_HYPERTABLE} "
+            "GROUP BY bucket, database_id, metric_type "
+            "WITH NO DATA"
+        )
+
+    def policy_sql(self) -> str:
+        """Statement adding the refresh policy."""
+        return (
+            f"SELECT add_continuous_aggregate_policy('{self.view}', "
+            f"start_offset => INTERVAL '{self.start_offset}', "
+            f"end_offset => INTERVAL '{self.end_offset}', "
+            f"schedule_interval => INTERVAL '{self.schedule_interval}', "
+            "if_not_exists => true)"
+        )
+
+
+# Rollups by resolution. Refresh windows stay inside the raw retention (see
+# validate_metrics_retention), so refreshing never erases buckets whose raw
+# chunks were already dropped.
+METRIC_ROLLUPS: Dict[MetricResolution, MetricRollup] = {
+    MetricResolution.MINUTE: MetricRollup("metrics_1m", "1 minute", "3 hours", "1 minute", "1 minute"),
+    MetricResolution.HOUR: MetricRollup("metrics_1h", "1 hour", "3 days", "1 hour", "30 minutes"),
+    MetricResolution.DAY: MetricRollup(
+        "metrics_1d", "1 day", f"{ROLLUP_REFRESH_WINDOW_DAYS} days", "1 day", "1 hour"
+    ),
+}
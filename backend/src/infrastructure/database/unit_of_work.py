@@ -5,7 +5,9 @@ from src.application.interfaces.unit_of_work import IUnitOfWork
 from src.infrastructure.database.repositories.user_repository import PostgresUserRepository
 from src.infrastructure.database.repositories.database_repository import PostgresDatabaseRepository
 from src.infrastructure.database.repositories.query_repository import PostgresQueryRepository
+from src.infrastructure.database.repositories.query_pattern_repository import PostgresQueryPatternRepository
 from src.infrastructure.database.repositories.metric_repository import PostgresMetricRepository
+from src.infrastructure.database.repositories.wait_event_repository import PostgresWaitEventRepository
 
 
 class SqlAlchemyUnitOfWork(IUnitOfWork):
@@ -16,7 +18,9 @@ class SqlAlchemyUnitOfWork(IUnitOfWork):
         self.users = PostgresUserRepository(session)
         self.databases = PostgresDatabaseRepository(session)
         self.queries = PostgresQueryRepository(session)
+        self.query_patterns = PostgresQueryPatternRepository(session)
         self.metrics = PostgresMetricRepository(session)
+        self.wait_events = PostgresWaitEventRepository(session)
 
     async def __aenter__(self):
         return self
@@ -28,9 +32,11 @@ class SqlAlchemyUnitOfWork(IUnitOfWork):
             await self.rollback()
 
     async def commit(self):
-        """Commit the transaction."""
+        """Commit the transaction, writing buffered metrics first."""
+        await self.metrics.flush()
         await self._session.commit()
 
     async def rollback(self):
-        """Rollback the transaction."""
+        """Rollback the transaction, dropping buffered metrics."""
+        self.metrics.discard_buffer()
         await self._session.rollback()
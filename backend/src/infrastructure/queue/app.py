@@ -23,8 +23,12 @@ celery_app.conf.update(
 
 # Optional: Beat schedule for periodic tasks
 celery_app.conf.beat_schedule = {
-    "collect-all-metrics": {
-        "task": "src.infrastructure.queue.tasks.collect_all_databases_metrics",
-        "schedule": 300.0, # Every 5 minutes
+    "dispatch-due-collections": {
+        "task": "src.infrastructure.queue.tasks.dispatch_due_collections",
+        "schedule": 30.0, # Collects only the databases that are due (adaptive schedule)
+    },
+    "sample-all-sessions": {
+        "task": "src.infrastructure.queue.tasks.sample_all_databases_sessions",
+        "schedule": 60.0, # Every minute, each run samples for ASH_SAMPLE_WINDOW_SECONDS
     },
 }
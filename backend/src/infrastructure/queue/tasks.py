@@ -4,13 +4,19 @@ from typing import List
 from uuid import UUID
 
 from celery import shared_task
+from celery.signals import worker_process_shutdown
 from celery.utils.log import get_task_logger
 
 from src.infrastructure.queue.app import celery_app
+from src.infrastructure.collectors.connection_pool import close_pool_registry, get_pool_registry
 from src.infrastructure.database.session import AsyncSessionLocal
 from src.infrastructure.database.unit_of_work import SqlAlchemyUnitOfWork
-from src.application.use_cases.collect_metrics import CollectMetricsUseCase
+from src.application.use_cases.collect_metrics import CollectMetricsUseCase, CollectShardUseCase
 from src.application.use_cases.analyze_query import AnalyzeQueryUseCase
+from src.application.use_cases.sample_active_sessions import SampleActiveSessionsUseCase
+from src.application.use_cases.schedule_collections import DispatchDueCollectionsUseCase
+from src.application.services.collection_scheduler import CollectionScheduler
+from src.config import get_settings
 from src.infrastructure.database.repositories.recommendation_repository import PostgresRecommendationRepository
 
 logger = get_task_logger(__name__)
@@ -24,6 +30,14 @@ def run_async(coro):
         return new_loop.run_until_complete(coro)
     return loop.run_until_complete(coro)
 
+@worker_process_shutdown.connect
+def close_collector_pools(**kwargs):
+    """Close pooled connections to monitored databases when a worker process exits."""
+    try:
+        run_async(close_pool_registry())
+    except Exception as e:
+        logger.warning(f"Failed to close collector pools on shutdown: {e}")
+
 @celery_app.task(name="src.infrastructure.queue.tasks.collect_database_metrics")
 def collect_database_metrics(database_id: str):
     """Task to collect metrics for a single database."""
@@ -46,6 +60,75 @@ def collect_database_metrics(database_id: str):
         logger.error(f"Failed to collect metrics for database {database_id}: {e}")
         raise
 
+@celery_app.task(name="src.infrastructure.queue.tasks.collect_databases_shard")
+def collect_databases_shard(database_ids: List[str]):
+    """Task to collect metrics for a shard of databases concurrently."""
+    logger.info(f"Starting metrics collection for a shard of {len(database_ids)} databases")
+    settings = get_settings()
+    
+    async def _collect():
+        async with AsyncSessionLocal() as session:
+            uow = SqlAlchemyUnitOfWork(session)
+            use_case = CollectShardUseCase(
+                uow,
+                concurrency=settings.collection_concurrency,
+                timeout_seconds=settings.collection_timeout_seconds,
+            )
+            new_query_ids = await use_case.execute([UUID(db_id) for db_id in database_ids])
+            
+            # Dispatch analysis tasks for each new slow query
+            for query_ids in new_query_ids.values():
+                for q_id in query_ids:
+                    analyze_query.delay(str(q_id))
+            return len(new_query_ids)
+            
+    try:
+        count = run_async(_collect())
+        logger.info(f"Successfully collected metrics for {count} of {len(database_ids)} databases")
+    except Exception as e:
+        logger.error(f"Failed to collect metrics for shard: {e}")
+        raise
+
+def _dispatch_collections(db_ids: List[str]) -> None:
+    """Enqueue collection tasks, per database or per shard depending on COLLECTION_MODE."""
+    settings = get_settings()
+    if settings.collection_mode == "sharded":
+        # One task per shard, collected concurrently inside one event loop
+        shard_size = settings.collection_shard_size
+        for i in range(0, len(db_ids), shard_size):
+            collect_databases_shard.delay(db_ids[i:i + shard_size])
+    else:
+        for db_id in db_ids:
+            # Dispatch individual tasks for each database
+            collect_database_metrics.delay(db_id)
+
+@celery_app.task(name="src.infrastructure.queue.tasks.dispatch_due_collections")
+def dispatch_due_collections():
+    """Task to collect the databases that are due under the adaptive schedule."""
+    settings = get_settings()
+    scheduler = CollectionScheduler(
+        min_interval_seconds=settings.collection_min_interval_seconds,
+        max_interval_seconds=settings.collection_max_interval_seconds,
+        max_backoff_seconds=settings.collection_max_backoff_seconds,
+        jitter=settings.collection_jitter,
+    )
+    
+    async def _dispatch():
+        async with AsyncSessionLocal() as session:
+            uow = SqlAlchemyUnitOfWork(session)
+            use_case = DispatchDueCollectionsUseCase(uow, scheduler)
+            due_ids = await use_case.execute()
+            _dispatch_collections([str(db_id) for db_id in due_ids])
+            return len(due_ids)
+            
+    try:
+        count = run_async(_dispatch())
+        if count:
+            logger.info(f"Dispatched collection for {count} due databases")
+    except Exception as e:
+        logger.error(f"Failed to dispatch due collections: {e}")
+        raise
+
 @celery_app.task(name="src.infrastructure.queue.tasks.collect_all_databases_metrics")
 def collect_all_databases_metrics():
     """Task to trigger metrics collection for all active databases."""
@@ -55,11 +138,7 @@ def collect_all_databases_metrics():
         async with AsyncSessionLocal() as session:
             uow = SqlAlchemyUnitOfWork(session)
             active_dbs = await uow.databases.get_all_active()
-            
-            for db in active_dbs:
-                # Dispatch individual tasks for each database
-                collect_database_metrics.delay(str(db.id))
-            
+            _dispatch_collections([str(db.id) for db in active_dbs])
             return len(active_dbs)
             
     try:
@@ -106,7 +185,11 @@ def check_database_connection(database_id: str):
                 return
 
             from src.infrastructure.collectors.postgres_collector import PostgresCollector
-            collector = PostgresCollector(db.encrypted_connection_string)
+            collector = PostgresCollector(
+                db.encrypted_connection_string,
+                database_id=db.id,
+                pool_registry=get_pool_registry(),
+            )
             
             try:
                 await collector.test_connection()
@@ -144,3 +227,50 @@ def check_all_databases_connections():
     except Exception as e:
         logger.error(f"Failed to trigger bulk connection checks: {e}")
         raise
+
+@celery_app.task(name="src.infrastructure.queue.tasks.sample_active_sessions")
+def sample_active_sessions(database_ids: List[str]):
+    """Task to sample pg_stat_activity for a shard of databases for one window."""
+    logger.info(f"Starting session sampling for {len(database_ids)} databases")
+    settings = get_settings()
+    
+    async def _sample():
+        async with AsyncSessionLocal() as session:
+            uow = SqlAlchemyUnitOfWork(session)
+            use_case = SampleActiveSessionsUseCase(
+                uow,
+                interval_seconds=settings.ash_sample_interval_seconds,
+                window_seconds=settings.ash_sample_window_seconds,
+                bucket_seconds=settings.ash_bucket_seconds,
+                buffer_size=settings.ash_buffer_size,
+            )
+            return await use_case.execute([UUID(db_id) for db_id in database_ids])
+            
+    try:
+        saved = run_async(_sample())
+        logger.info(f"Saved session samples for {len(saved)} databases")
+    except Exception as e:
+        logger.error(f"Failed to sample active sessions: {e}")
+        raise
+
+@celery_app.task(name="src.infrastructure.queue.tasks.sample_all_databases_sessions")
+def sample_all_databases_sessions():
+    """Task to trigger session sampling for all active databases, in shards."""
+    shard_size = get_settings().ash_shard_size
+    
+    async def _trigger():
+        async with AsyncSessionLocal() as session:
+            uow = SqlAlchemyUnitOfWork(session)
+            active_dbs = await uow.databases.get_all_active()
+            db_ids = [str(db.id) for db in active_dbs]
+            # One task samples a whole shard concurrently, one connection per database
+            for i in range(0, len(db_ids), shard_size):
+                sample_active_sessions.delay(db_ids[i:i + shard_size])
+            return len(db_ids)
+            
+    try:
+        count = run_async(_trigger())
+        logger.info(f"Triggered session sampling for {count} databases")
+    except Exception as e:
+        logger.error(f"Failed to trigger session sampling: {e}")
+        raise
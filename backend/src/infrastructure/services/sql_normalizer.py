@@ -1,37 +1,399 @@
+import hashlib
+import logging
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
 import sqlparse
 from sqlparse.sql import Token, TokenList
 from sqlparse.tokens import Keyword, Name, Number, String, Punctuation
 
+try:
+    from pglast import parser as pg_parser
+except ImportError:  # pragma: no cover - sqlparse remains available
+    pg_parser = None
+
+from src.infrastructure.cache.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# libpg_query scanner tokens for literal constants
+PG_CONSTANT_TOKENS = frozenset({"ICONST", "FCONST", "SCONST", "BCONST", "XCONST", "USCONST"})
+PG_NUMERIC_TOKENS = frozenset({"ICONST", "FCONST"})
+PG_OPEN_TOKENS = {"ASCII_40": "ASCII_41", "ASCII_91": "ASCII_93"}  # ( ) and [ ]
+PG_COMMA_TOKEN = "ASCII_44"
+# Bracket that opens a variable-length list, by the keyword in front of it
+PG_LIST_PREFIXES = {"IN_P": "ASCII_40", "ARRAY": "ASCII_91"}
+
+# Version of the fingerprint rules, stored with each query so fingerprints
+# made by older rules can be found and renormalized:
+#   1: constants and parameters replaced by $n
+#   2: runs of list items, VALUES rows and CASE branches that only differ in
+#      constants collapsed to one (IN ($1, $2, $3) -> IN ($1))
+NORMALIZATION_VERSION = 2
+
+# sqlparse fallback: IN/ARRAY lists made only of placeholders
+PLACEHOLDER_LIST_PATTERN = re.compile(
+    r"(\bIN\s*\(|\bARRAY\s*\[)\s*(\$\d+)(?:\s*,\s*\$\d+)+", re.IGNORECASE
+)
+PLACEHOLDER_PATTERN = re.compile(r"\$\d+")
+
+# Scanned token (name, text, whitespace before it); bracketed groups nest as
+# lists whose first and last items are the brackets.
+_Token = Tuple[str, str, str]
+_Node = Union[_Token, list]
+
+# Normalized text per input text, keyed by a 128-bit blake2b digest so the
+# (often long) raw SQL is not kept alive by the cache.
+NORMALIZE_CACHE_SIZE = 20_000
+# Below this many uncached texts a process pool costs more than it saves
+PARALLEL_THRESHOLD = 5_000
+
+normalized_cache: LRUCache[str] = LRUCache(maxsize=NORMALIZE_CACHE_SIZE)
+
+
+def _cache_key(sql: str, version: int) -> bytes:
+    digest = hashlib.blake2b(sql.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    return bytes([version]) + digest
+
+
+def _render(nodes: List[_Node]) -> str:
+    return "".join(
+        _render(node) if isinstance(node, list) else node[2] + node[1] for node in nodes
+    )
+
+
+def _same(a: List[_Node], b: List[_Node]) -> bool:
+    """Whether two token runs are identical once constants are replaced."""
+    return _render(a).strip() == _render(b).strip()
+
+
+def _dedupe_runs(items: List[List[_Node]]) -> List[List[_Node]]:
+    kept: List[List[_Node]] = []
+    for item in items:
+        if not kept or not _same(kept[-1], item):
+            kept.append(item)
+    return kept
+
+
+def _is_comma(node: _Node) -> bool:
+    return not isinstance(node, list) and node[0] == PG_COMMA_TOKEN
+
+
+def _split_items(nodes: List[_Node]) -> List[List[_Node]]:
+    items: List[List[_Node]] = [[]]
+    for node in nodes:
+        if _is_comma(node):
+            items.append([])
+        else:
+            items[-1].append(node)
+    return items
+
+
+def _join_items(items: List[List[_Node]], comma: _Token) -> List[_Node]:
+    nodes: List[_Node] = list(items[0])
+    for item in items[1:]:
+        nodes.append(comma)
+        nodes.extend(item)
+    return nodes
+
+
+def _build_tree(tokens: List[_Token]) -> List[_Node]:
+    stack: List[list] = [[]]
+    for token in tokens:
+        if token[0] in PG_OPEN_TOKENS:
+            stack.append([token])
+        elif len(stack) > 1 and token[0] == PG_OPEN_TOKENS[stack[-1][0][0]]:
+            group = stack.pop()
+            group.append(token)
+            stack[-1].append(group)
+        else:
+            stack[-1].append(token)
+    while len(stack) > 1:
+        group = stack.pop()
+        stack[-1].extend(group)
+    return stack[0]
+
+
+def _flatten(nodes: List[_Node]) -> List[_Token]:
+    tokens: List[_Token] = []
+    for node in nodes:
+        if isinstance(node, list):
+            tokens.extend(_flatten(node))
+        else:
+            tokens.append(node)
+    return tokens
+
+
+def _collapse(nodes: List[_Node]) -> List[_Node]:
+    """
+    Collapse runs of equivalent items, innermost groups first.
+
+    - IN (...) and ARRAY[...] items
+    - VALUES rows
+    - CASE ... WHEN branches
+    """
+    nodes = [
+        [node[0], *_collapse(node[1:-1]), node[-1]] if isinstance(node, list) else node
+        for node in nodes
+    ]
+
+    for i, node in enumerate(nodes):
+        if (
+            isinstance(node, list)
+            and i > 0
+            and not isinstance(nodes[i - 1], list)
+            and PG_LIST_PREFIXES.get(nodes[i - 1][0]) == node[0][0]
+        ):
+            items = _split_items(node[1:-1])
+            if len(items) > 1:
+                comma = next(n for n in node[1:-1] if _is_comma(n))
+                nodes[i] = [node[0], *_join_items(_dedupe_runs(items), comma), node[-1]]
+
+    nodes = _collapse_values(nodes)
+    return _collapse_case(nodes)
+
+
+def _collapse_values(nodes: List[_Node]) -> List[_Node]:
+    i = 0
+    while i < len(nodes):
+        node = nodes[i]
+        if isinstance(node, list) or node[0] != "VALUES":
+            i += 1
+            continue
+        # VALUES (row), (row), ...
+        end = i + 1
+        if end >= len(nodes) or not isinstance(nodes[end], list):
+            i += 1
+            continue
+        while end + 2 < len(nodes) and _is_comma(nodes[end + 1]) and isinstance(nodes[end + 2], list):
+            end += 2
+        rows = [[nodes[j]] for j in range(i + 1, end + 1, 2)]
+        if len(rows) > 1:
+            kept = _dedupe_runs(rows)
+            if len(kept) < len(rows):
+                nodes = nodes[: i + 1] + _join_items(kept, nodes[i + 2]) + nodes[end + 1 :]
+        i += 1
+    return nodes
+
+
+def _collapse_case(nodes: List[_Node]) -> List[_Node]:
+    # Right to left, so a CASE nested in a branch is collapsed before its parent
+    for start in reversed(range(len(nodes))):
+        if isinstance(nodes[start], list) or nodes[start][0] != "CASE":
+            continue
+
+        depth = 0
+        bounds = []  # WHEN/ELSE/END positions of this CASE
+        for j in range(start, len(nodes)):
+            name = None if isinstance(nodes[j], list) else nodes[j][0]
+            if name == "CASE":
+                depth += 1
+            elif name == "END_P":
+                depth -= 1
+                if depth == 0:
+                    bounds.append(j)
+                    break
+            elif depth == 1 and name in ("WHEN", "ELSE"):
+                bounds.append(j)
+        else:
+            continue
+
+        branches = [
+            nodes[begin:finish]
+            for begin, finish in zip(bounds, bounds[1:], strict=False)
+            if nodes[begin][0] == "WHEN"
+        ]
+        kept = _dedupe_runs(branches)
+        if len(kept) < len(branches):
+            # WHEN branches come first, then ELSE or END
+            nodes = (
+                nodes[: bounds[0]]
+                + [node for branch in kept for node in branch]
+                + nodes[bounds[len(branches)] :]
+            )
+    return nodes
+
 
 class SqlNormalizer:
     """Service for normalizing SQL queries into fingerprints."""
 
     @staticmethod
-    def normalize(sql: str) -> str:
+    def normalize(sql: str, version: int = NORMALIZATION_VERSION) -> str:
         """
         Groups similar queries by replacing literals with placeholders.
-        
+
+        Uses the PostgreSQL parser (pglast/libpg_query) when available, so
+        spacing, keyword casing and comments do not change the result. Text
+        the parser rejects falls back to the sqlparse tokenizer. Results are
+        memoized per process (see normalized_cache).
+
         Example:
             SELECT * FROM users WHERE id = 10 -> SELECT * FROM users WHERE id = $1
+            SELECT * FROM users WHERE id IN (1, 2, 3) -> SELECT * FROM users WHERE id IN ($1)
+
+        Args:
+            sql: Query text.
+            version: Fingerprint rules to apply (see NORMALIZATION_VERSION).
         """
         if not sql:
             return ""
 
+        key = _cache_key(sql, version)
+        normalized = normalized_cache.get(key)
+        if normalized is None:
+            normalized = SqlNormalizer._normalize_uncached(sql, version)
+            normalized_cache.set(key, normalized)
+        return normalized
+
+    @staticmethod
+    def normalize_many(
+        sqls: Iterable[str],
+        max_workers: Optional[int] = None,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+        chunksize: int = 256,
+        version: int = NORMALIZATION_VERSION,
+    ) -> List[str]:
+        """
+        Normalize a batch of queries, in the same order.
+
+        Cached and duplicate texts are normalized once. When the number of
+        uncached texts reaches ``parallel_threshold`` they are fanned out to
+        a process pool (log ingestion, backfills); smaller batches run inline.
+
+        Args:
+            sqls: Query texts.
+            max_workers: Process pool size (defaults to the CPU count).
+            parallel_threshold: Minimum number of uncached texts for the pool.
+            chunksize: Texts sent to a worker at a time.
+            version: Fingerprint rules to apply (see NORMALIZATION_VERSION).
+
+        Returns:
+            Normalized texts, one per input.
+        """
+        sqls = list(sqls)
+        results: List[Optional[str]] = [None] * len(sqls)
+        pending: Dict[bytes, List[int]] = {}
+        texts: List[str] = []
+
+        for i, sql in enumerate(sqls):
+            if not sql:
+                results[i] = ""
+                continue
+            key = _cache_key(sql, version)
+            if key in pending:
+                pending[key].append(i)
+                continue
+            normalized = normalized_cache.get(key)
+            if normalized is not None:
+                results[i] = normalized
+            else:
+                pending[key] = [i]
+                texts.append(sql)
+
+        normalize = partial(SqlNormalizer._normalize_uncached, version=version)
+        if len(texts) >= parallel_threshold:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                normalized_texts = list(pool.map(normalize, texts, chunksize=chunksize))
+        else:
+            normalized_texts = [normalize(sql) for sql in texts]
+
+        for (key, indexes), normalized in zip(pending.items(), normalized_texts, strict=True):
+            normalized_cache.set(key, normalized)
+            for i in indexes:
+                results[i] = normalized
+
+        return results
+
+    @staticmethod
+    def cache_stats() -> Dict[str, Any]:
+        """Size and hit/miss counters of the normalization cache."""
+        return normalized_cache.stats()
+
+    @staticmethod
+    def _normalize_uncached(sql: str, version: int = NORMALIZATION_VERSION) -> str:
+        """Normalize without the cache (also the unit of work for process pools)."""
+        collapse = version >= 2
+        if pg_parser is not None:
+            try:
+                return SqlNormalizer._normalize_pglast(sql, collapse)
+            except pg_parser.Error as e:
+                logger.debug(f"pglast could not normalize query, using sqlparse: {e}")
+
+        return SqlNormalizer._normalize_sqlparse(sql, collapse)
+
+    @staticmethod
+    def _normalize_pglast(sql: str, collapse: bool = True) -> str:
+        """
+        Normalize with libpg_query: deparse to canonical SQL, then replace constants.
+
+        Deparsing the parse tree drops comments and fixes spacing and keyword
+        casing; constants and existing parameters are then replaced, runs of
+        equivalent list items collapsed (see _collapse), and the placeholders
+        numbered $1, $2, ... in order of appearance.
+
+        Raises:
+            pglast.Error: If the text is not valid PostgreSQL.
+        """
+        canonical = pg_parser.deparse_protobuf(pg_parser.parse_sql_protobuf(sql))
+
+        tokens: List[_Token] = []
+        position = 0
+        previous = None
+        for token in pg_parser.scan(canonical):
+            gap = canonical[position:token.start]
+            # Token offsets are inclusive
+            position = token.end + 1
+            if token.name in PG_CONSTANT_TOKENS or token.name == "PARAM":
+                # A unary minus is printed right against its constant ("-5")
+                if (
+                    token.name in PG_NUMERIC_TOKENS
+                    and previous is not None
+                    and previous.name == "ASCII_45"
+                    and previous.end + 1 == token.start
+                ):
+                    gap = tokens.pop()[2]
+                tokens.append(("CONST", "$", gap))
+            else:
+                tokens.append((token.name, canonical[token.start:position], gap))
+            previous = token
+
+        if collapse:
+            tokens = _flatten(_collapse(_build_tree(tokens)))
+
+        parts = []
+        placeholder_count = 0
+        for name, text, gap in tokens:
+            if name == "CONST":
+                placeholder_count += 1
+                text = f"${placeholder_count}"
+            parts.append(gap)
+            parts.append(text)
+        parts.append(canonical[position:])
+
+        return "".join(parts)
+
+    @staticmethod
+    def _normalize_sqlparse(sql: str, collapse: bool = True) -> str:
+        """Normalize with the sqlparse tokenizer (slower, accepts any text).
+
+        Only IN/ARRAY lists made entirely of placeholders are collapsed.
+        """
         # 1. Parse the SQL
         parsed = sqlparse.parse(sql)
         if not parsed:
             return sql
 
         statement = parsed[0]
-        
+
         # 2. Iterate tokens and replace literals
         normalized_tokens = []
         placeholder_count = 1
-        
+
         # We want to replace Numbers and Strings in WHERE/VALUES/etc.
         # but keep them if they are part of the structure (though sqlparse usually handles this)
-        
+
         for token in statement.flatten():
             if token.ttype in (Number.Integer, Number.Float, Number.Hexadecimal):
                 normalized_tokens.append(f"${placeholder_count}")
@@ -44,12 +406,29 @@ class SqlNormalizer:
 
         # 3. Clean up whitespace and join
         normalized_sql = "".join(normalized_tokens)
-        
+
         # Further cleanup: collapse multiple spaces
         normalized_sql = re.sub(r'\s+', ' ', normalized_sql).strip()
-        
+
+        if collapse:
+            normalized_sql = PLACEHOLDER_LIST_PATTERN.sub(r"\1\2", normalized_sql)
+            numbers = iter(range(1, normalized_sql.count("$") + 1))
+            normalized_sql = PLACEHOLDER_PATTERN.sub(lambda m: f"${next(numbers)}", normalized_sql)
+
         return normalized_sql
 
+    @staticmethod
+    def fingerprint_hash(normalized_sql: str) -> int:
+        """
+        Fixed-width 64-bit key of a fingerprint, for grouping and joins.
+
+        The first 8 bytes of md5 as a signed BIGINT, the same value as
+        ``('x' || substr(md5(normalized_sql), 1, 16))::bit(64)::bigint`` in
+        PostgreSQL, so rows can be backfilled in SQL.
+        """
+        digest = hashlib.md5(normalized_sql.encode("utf-8"), usedforsecurity=False).digest()
+        return int.from_bytes(digest[:8], "big", signed=True)
+
     @staticmethod
     def get_fingerprint(sql: str) -> str:
         """Alias for normalize, providing a clear domain concept."""
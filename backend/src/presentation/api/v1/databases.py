@@ -5,8 +5,12 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.application.dto.database_dto import DatabaseCreate, DatabaseRead
-from src.application.use_cases.databases import RegisterDatabaseUseCase, GetDatabasesUseCase
+from src.application.dto.database_dto import DatabaseCreate, DatabaseRead, DatabaseUpdate
+from src.application.use_cases.databases import (
+    RegisterDatabaseUseCase,
+    GetDatabasesUseCase,
+    UpdateDatabaseUseCase,
+)
 from src.application.use_cases.test_connection import TestDatabaseConnectionUseCase
 from src.domain.entities.user import User
 from src.infrastructure.database.repositories.database_repository import PostgresDatabaseRepository
@@ -69,6 +73,33 @@ async def get_databases(
     return await use_case.execute(current_user.id)
 
 
+@router.patch("/{database_id}", response_model=DatabaseRead)
+async def update_database(
+    database_id: UUID,
+    db_update: DatabaseUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Update a database's name, activity or EXPLAIN limits."""
+    db_repo = PostgresDatabaseRepository(db)
+    use_case = UpdateDatabaseUseCase(db_repo)
+    
+    try:
+        database = await use_case.execute(current_user.id, database_id, db_update)
+    except PermissionError:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to update this database"
+        )
+    
+    if not database:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Database not found"
+        )
+    return database
+
+
 @router.delete("/{database_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_database(
     database_id: UUID,
@@ -1,13 +1,18 @@
 """Intelligence API routes for patterns and trends."""
-from typing import List, Dict, Any
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.application.use_cases.advise_indexes import AdviseIndexesUseCase
 from src.application.use_cases.analyze_trends import AnalyzeTrendsUseCase
+from src.config import get_settings
 from src.domain.entities.user import User
+from src.infrastructure.database.repositories.query_pattern_repository import PostgresQueryPatternRepository
 from src.infrastructure.database.repositories.query_repository import PostgresQueryRepository
+from src.infrastructure.database.repositories.wait_event_repository import PostgresWaitEventRepository
 from src.infrastructure.database.unit_of_work import SqlAlchemyUnitOfWork
 from src.infrastructure.database.session import get_db_session
 from src.presentation.api.v1.deps import get_current_user
@@ -25,6 +30,37 @@ async def get_query_patterns(
     query_repo = PostgresQueryRepository(db)
     return await query_repo.get_aggregated_metrics(database_id, hours=hours)
 
+@router.get("/fingerprints")
+async def get_fingerprint_stats(
+    database_id: UUID,
+    hours: int = 24,
+    limit: int = 50,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Get running statistics of the fingerprints seen recently, by total time."""
+    pattern_repo = PostgresQueryPatternRepository(db)
+    patterns = await pattern_repo.get_by_database_id(
+        database_id, since=datetime.utcnow() - timedelta(hours=hours), limit=limit
+    )
+    return [
+        {
+            "fingerprint_hash": p.fingerprint_hash,
+            "normalized_sql": p.normalized_sql,
+            "sample_sql": p.sample_sql,
+            "samples": p.sample_count,
+            "total_calls": p.total_calls,
+            "total_exec_time_ms": p.total_exec_time_ms,
+            "mean_exec_time_ms": p.mean_exec_time_ms,
+            "stddev_exec_time_ms": p.stddev_exec_time_ms,
+            "min_exec_time_ms": p.min_exec_time_ms,
+            "max_exec_time_ms": p.max_exec_time_ms,
+            "first_seen": p.first_seen,
+            "last_seen": p.last_seen,
+        }
+        for p in patterns
+    ]
+
 @router.get("/trends")
 async def get_performance_trends(
     database_id: UUID,
@@ -35,3 +71,52 @@ async def get_performance_trends(
     uow = SqlAlchemyUnitOfWork(db)
     use_case = AnalyzeTrendsUseCase(uow)
     return await use_case.execute(database_id)
+
+@router.get("/index-plan")
+async def get_index_plan(
+    database_id: UUID,
+    hours: int = 168,
+    max_indexes: Optional[int] = Query(None, ge=1, le=50),
+    max_bytes: Optional[int] = Query(None, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Get one ranked index plan for the whole workload of a database."""
+    settings = get_settings()
+    uow = SqlAlchemyUnitOfWork(db)
+    use_case = AdviseIndexesUseCase(uow)
+    return await use_case.execute(
+        database_id,
+        hours=hours,
+        max_indexes=max_indexes or settings.index_advisor_max_indexes,
+        max_bytes=settings.index_advisor_max_bytes if max_bytes is None else max_bytes,
+    )
+
+@router.get("/wait-events")
+async def get_wait_events(
+    database_id: UUID,
+    hours: int = 1,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Get sampled session time per query fingerprint and wait event."""
+    end_time = datetime.utcnow()
+    wait_event_repo = PostgresWaitEventRepository(db)
+    return await wait_event_repo.get_breakdown_by_fingerprint(
+        database_id, end_time - timedelta(hours=hours), end_time
+    )
+
+@router.get("/wait-events/timeline")
+async def get_wait_event_timeline(
+    database_id: UUID,
+    hours: int = Query(1, ge=1),
+    bucket_minutes: int = Query(1, ge=1),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Get sampled session time per time bucket and wait event type."""
+    end_time = datetime.utcnow()
+    wait_event_repo = PostgresWaitEventRepository(db)
+    return await wait_event_repo.get_timeline(
+        database_id, end_time - timedelta(hours=hours), end_time, bucket_minutes * 60
+    )
@@ -1,8 +1,9 @@
 """Metrics API routes."""
-from typing import List
+from datetime import timedelta
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.application.dto.metric_dto import MetricsResponse
@@ -14,26 +15,54 @@ from src.presentation.api.v1.deps import get_current_user
 
 router = APIRouter(prefix="/databases/{database_id}/metrics", tags=["metrics"])
 
+DURATION_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def _parse_duration(value: str) -> Optional[timedelta]:
+    """Parse durations like "5m", "24h" or "30d"."""
+    try:
+        seconds = int(value[:-1]) * DURATION_UNITS[value[-1]]
+    except (KeyError, ValueError, IndexError):
+        return None
+    return timedelta(seconds=seconds) if seconds > 0 else None
+
+
 @router.get("", response_model=MetricsResponse)
 async def get_metrics(
     database_id: UUID,
     time_range: str = "1h",
+    resolution: Optional[str] = Query(
+        None, description='Widest acceptable bucket, e.g. "1m", "1h" or "1d"'
+    ),
+    max_points: Optional[int] = Query(
+        None, ge=3, le=10000,
+        description="Maximum points per metric type (LTTB downsampled); all points when omitted",
+    ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db_session)
 ):
-    """Get performance metrics for a specific database."""
+    """
+    Get performance metrics for a specific database.
+
+    Long ranges are served from 1m/1h/1d rollups (value is the bucket
+    average, metadata holds min/max/count) chosen from ``resolution`` and
+    ``max_points``. When ``max_points`` is given, each metric type is also
+    downsampled to ``max_points``.
+    """
     # Convert time_range string (e.g. "1h", "24h") to hours
-    try:
-        if time_range.endswith("h"):
-            hours = int(time_range[:-1])
-        elif time_range.endswith("d"):
-            hours = int(time_range[:-1]) * 24
-        else:
-            hours = 1
-    except ValueError:
-        hours = 1
+    time_range_delta = _parse_duration(time_range)
+    hours = max(1, int(time_range_delta.total_seconds() // 3600)) if time_range_delta else 1
+
+    resolution_delta = None
+    if resolution is not None:
+        resolution_delta = _parse_duration(resolution)
+        if resolution_delta is None:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Invalid resolution: {resolution}",
+            )
 
     metric_repo = PostgresMetricRepository(db)
     use_case = GetMetricsUseCase(metric_repo)
     
-    return await use_case.execute(database_id, hours)
+    return await use_case.execute(database_id, hours, resolution_delta, max_points)
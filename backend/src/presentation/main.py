@@ -45,6 +45,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     
     # Shutdown
     print("👋 Shutting down...")
+    from src.infrastructure.collectors.connection_pool import close_pool_registry
+    await close_pool_registry()
 
 
 # Create FastAPI app
@@ -0,0 +1,143 @@
+"""Unit tests for bulk INSERT/COPY writes."""
+import sys
+sys.path.insert(0, '/app')
+
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from src.domain.entities.query import QueryStatus
+from src.domain.entities.recommendation import Recommendation
+from src.infrastructure.database import bulk
+from src.infrastructure.database.models import QueryModel, RecommendationModel
+from src.infrastructure.database.repositories.recommendation_repository import (
+    PostgresRecommendationRepository,
+)
+
+
+def _rows(count):
+    return [
+        {
+            "id": uuid4(),
+            "database_id": uuid4(),
+            "fingerprint_hash": i,
+            "execution_time_ms": 1.0,
+            "explain_plan": {"Plan": {"Node Type": "Seq Scan"}},
+            "timestamp": datetime(2026, 1, 1),
+            "status": QueryStatus.SLOW,
+        }
+        for i in range(count)
+    ]
+
+
+def _returned_ids(stmt):
+    """Ids a RETURNING id would give for a multi-row INSERT."""
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [
+        params[f"id_m{i}"] for i in range(len(params)) if f"id_m{i}" in params
+    ]
+    return result
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=_returned_ids)
+    return session
+
+
+def _copy_driver(session):
+    """Route COPY of ``session`` to a mocked asyncpg connection."""
+    driver = MagicMock()
+    driver.copy_records_to_table = AsyncMock()
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=MagicMock(driver_connection=driver))
+    session.connection = AsyncMock(return_value=connection)
+    return driver
+
+
+class TestInsertRows:
+    """Test suite for insert_rows()."""
+
+    @pytest.mark.asyncio
+    async def test_multi_row_insert_is_chunked_to_the_bind_limit(self, session):
+        """Test one statement per chunk of rows, returning every id."""
+        rows = _rows(10)
+
+        with patch.object(bulk, "MAX_BIND_PARAMS", 7 * 4):
+            ids = await bulk.insert_rows(session, QueryModel, rows, update_columns=("status",))
+
+        assert session.execute.await_count == 3
+        assert ids == [row["id"] for row in rows]
+        sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (id) DO UPDATE SET status = excluded.status" in sql
+        assert "RETURNING queries.id" in sql
+
+    @pytest.mark.asyncio
+    async def test_conflicts_are_skipped_without_update_columns(self, session):
+        await bulk.insert_rows(session, QueryModel, _rows(2))
+
+        sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (id) DO NOTHING" in sql
+
+    @pytest.mark.asyncio
+    async def test_large_batches_use_copy(self, session):
+        """Test that COPY gets enum names and serialized JSON."""
+        driver = _copy_driver(session)
+        rows = _rows(3)
+
+        ids = await bulk.insert_rows(session, QueryModel, rows, copy_threshold=3)
+
+        assert ids == [row["id"] for row in rows]
+        session.execute.assert_not_awaited()
+        args, kwargs = driver.copy_records_to_table.call_args
+        assert args == ("queries",)
+        assert kwargs["columns"] == list(rows[0])
+        record = kwargs["records"][0]
+        assert record[-1] == "SLOW"
+        assert json.loads(record[4]) == rows[0]["explain_plan"]
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, session):
+        assert await bulk.insert_rows(session, QueryModel, []) == []
+        session.execute.assert_not_awaited()
+
+
+class TestRecommendationSaveAll:
+    """Test suite for PostgresRecommendationRepository.save_all()."""
+
+    def _recommendations(self, count):
+        return [
+            Recommendation(uuid4(), "index", f"Add index {i}", "Seq scan on orders")
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_existing_recommendations_are_updated(self, session):
+        recommendations = self._recommendations(2)
+
+        saved = await PostgresRecommendationRepository(session).save_all(recommendations)
+
+        assert saved == recommendations
+        sql = str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (id) DO UPDATE SET type = excluded.type" in sql
+        assert "status = excluded.status" in sql
+        assert "created_at = excluded" not in sql
+
+    @pytest.mark.asyncio
+    async def test_copy_stores_enum_names_like_the_orm(self, session):
+        """Test that plain-string enum values are written as member names."""
+        driver = _copy_driver(session)
+        rec = self._recommendations(1)[0]
+        row = {"id": rec.id, "query_id": rec.query_id, "type": rec.type, "title": rec.title,
+               "description": rec.description, "status": "dismissed"}
+
+        await bulk.copy_rows(session, RecommendationModel, [row])
+
+        [record] = driver.copy_records_to_table.call_args.kwargs["records"]
+        assert record[2] == "INDEX"
+        assert record[-1] == "DISMISSED"
@@ -0,0 +1,65 @@
+"""Unit tests for concurrent shard collection."""
+import sys
+sys.path.insert(0, '/app')
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.application.use_cases.collect_metrics import CollectMetricsUseCase, CollectShardUseCase
+from src.domain.entities.database import ConnectionStatus, Database, DatabaseType
+
+
+def _database(name):
+    return Database(
+        user_id=uuid4(),
+        name=name,
+        db_type=DatabaseType.POSTGRES,
+        encrypted_connection_string=f"postgresql://u:p@{name}:5432/app",
+    )
+
+
+class TestCollectShardUseCase:
+    """Test suite for CollectShardUseCase."""
+
+    @pytest.fixture
+    def uow(self):
+        uow = MagicMock()
+        uow.__aenter__ = AsyncMock(return_value=uow)
+        uow.__aexit__ = AsyncMock(return_value=None)
+        uow.commit = AsyncMock()
+        uow.databases.save = AsyncMock()
+        uow.queries.save_all = AsyncMock(return_value=[])
+        uow.metrics.ingest = AsyncMock()
+        return uow
+
+    @pytest.mark.asyncio
+    async def test_slow_target_times_out_without_blocking_the_shard(self, uow):
+        """Test per-target timeouts, bounded concurrency and a single commit."""
+        fast, slow = _database("fast"), _database("slow")
+        uow.databases.get_by_ids = AsyncMock(return_value=[fast, slow])
+        running = 0
+        peak = 0
+
+        async def gather(database):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            try:
+                await asyncio.sleep(10 if database is slow else 0)
+                return {"queries": [], "metrics": [MagicMock()]}
+            finally:
+                running -= 1
+
+        use_case = CollectShardUseCase(uow, concurrency=1, timeout_seconds=0.05)
+        with patch.object(CollectMetricsUseCase, "gather", side_effect=gather):
+            collected = await use_case.execute([fast.id, slow.id])
+
+        assert list(collected) == [fast.id]
+        assert fast.connection_status == ConnectionStatus.ONLINE
+        assert slow.connection_status == ConnectionStatus.OFFLINE
+        assert "timed out" in slow.connection_error
+        assert peak == 1
+        uow.metrics.ingest.assert_awaited_once()
+        uow.commit.assert_awaited_once()
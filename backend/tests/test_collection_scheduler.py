@@ -0,0 +1,99 @@
+"""Unit tests for the adaptive collection scheduler."""
+import sys
+sys.path.insert(0, '/app')
+
+import random
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+from src.application.services.collection_scheduler import CollectionScheduler
+from src.application.use_cases.schedule_collections import DispatchDueCollectionsUseCase
+from src.domain.entities.database import ConnectionStatus, Database, DatabaseType
+from src.domain.entities.user import PlanTier
+
+
+class TestCollectionScheduler:
+    """Test suite for CollectionScheduler."""
+
+    @pytest.fixture
+    def scheduler(self):
+        return CollectionScheduler(
+            min_interval_seconds=30, max_interval_seconds=3600, max_backoff_seconds=7200
+        )
+
+    def test_tier_sets_base_interval(self, scheduler):
+        """Test that higher tiers are collected more often."""
+        assert scheduler.next_interval(PlanTier.FREE) == 900
+        assert scheduler.next_interval(PlanTier.ENTERPRISE) == 60
+
+    def test_activity_adjusts_interval(self, scheduler):
+        """Test that idle databases are stretched and busy ones shortened."""
+        assert scheduler.next_interval(PlanTier.STARTER, calls_per_second=0.0) == 900
+        assert scheduler.next_interval(PlanTier.STARTER, calls_per_second=500.0) == 150
+
+    def test_regression_shortens_interval_down_to_minimum(self, scheduler):
+        """Test that regressions speed collection up, bounded by the minimum."""
+        assert scheduler.next_interval(PlanTier.STARTER, regression_severity="HIGH") == 150
+        assert scheduler.next_interval(
+            PlanTier.ENTERPRISE, calls_per_second=500.0, regression_severity="CRITICAL"
+        ) == 30
+
+    def test_offline_backs_off_exponentially(self, scheduler):
+        """Test exponential backoff for offline databases, capped."""
+        intervals = [
+            scheduler.next_interval(
+                PlanTier.STARTER,
+                connection_status=ConnectionStatus.OFFLINE,
+                consecutive_failures=failures,
+                regression_severity="CRITICAL",
+            )
+            for failures in (1, 2, 3, 10)
+        ]
+        assert intervals == [600, 1200, 2400, 7200]
+
+    def test_next_due_is_jittered_within_bounds(self):
+        """Test that due times are spread around the interval."""
+        scheduler = CollectionScheduler(jitter=0.1, rng=random.Random(42))
+        now = datetime(2026, 1, 1)
+
+        offsets = {(scheduler.next_due(now, 300) - now).total_seconds() for _ in range(50)}
+
+        assert len(offsets) > 1
+        assert all(270 <= offset <= 330 for offset in offsets)
+
+
+class TestDispatchDueCollectionsUseCase:
+    """Test suite for DispatchDueCollectionsUseCase."""
+
+    @pytest.mark.asyncio
+    async def test_regressions_come_from_one_batched_query(self):
+        """Test that running stats set the severity, without per-database trend analysis."""
+        user_id = uuid4()
+        regressed, steady = [
+            Database(user_id, name, DatabaseType.POSTGRES, "postgresql://x") for name in ("a", "b")
+        ]
+        uow = MagicMock()
+        uow.__aenter__ = AsyncMock(return_value=uow)
+        uow.__aexit__ = AsyncMock(return_value=False)
+        uow.commit = AsyncMock()
+        uow.databases.get_due_for_collection = AsyncMock(return_value=[regressed, steady])
+        uow.databases.save = AsyncMock()
+        uow.users.get_by_id = AsyncMock(return_value=MagicMock(plan_tier=PlanTier.STARTER))
+        uow.metrics.get_latest = AsyncMock(return_value=None)
+        uow.query_patterns.get_regression_ratios = AsyncMock(return_value={regressed.id: 3.0})
+        scheduler = CollectionScheduler(jitter=0.0)
+        now = datetime(2026, 1, 1)
+
+        dispatched = await DispatchDueCollectionsUseCase(uow, scheduler).execute(now)
+
+        assert dispatched == [regressed.id, steady.id]
+        uow.query_patterns.get_regression_ratios.assert_awaited_once()
+        assert uow.query_patterns.get_regression_ratios.call_args[0][0] == [regressed.id, steady.id]
+        # A 3x slowdown is HIGH, which shortens the interval
+        assert (regressed.next_collection_at - now).total_seconds() == scheduler.next_interval(
+            PlanTier.STARTER, regression_severity="HIGH"
+        )
+        assert (steady.next_collection_at - now).total_seconds() == scheduler.next_interval(PlanTier.STARTER)
+        uow.commit.assert_awaited_once()
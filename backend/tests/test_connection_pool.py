@@ -0,0 +1,126 @@
+"""Unit tests for ConnectionPoolRegistry."""
+import sys
+sys.path.insert(0, '/app')
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.infrastructure.collectors.connection_pool import ConnectionPoolRegistry
+
+
+def _mock_pool():
+    """Create a mocked asyncpg pool whose connections answer pings."""
+    conn = AsyncMock()
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=conn)
+    pool.release = AsyncMock()
+    pool.close = AsyncMock()
+    pool.expire_connections = AsyncMock()
+    return pool
+
+
+class TestConnectionPoolRegistry:
+    """Test suite for ConnectionPoolRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_pool_is_reused_per_key(self):
+        """Test that repeated acquisitions for the same target share one pool."""
+        registry = ConnectionPoolRegistry()
+        create_pool = AsyncMock(side_effect=lambda *a, **kw: _mock_pool())
+
+        with patch("asyncpg.create_pool", create_pool):
+            async with registry.acquire("db-1", "postgresql://a/db"):
+                pass
+            async with registry.acquire("db-1", "postgresql://a/db"):
+                pass
+
+        assert create_pool.call_count == 1
+        assert len(registry) == 1
+
+    @pytest.mark.asyncio
+    async def test_max_size_is_passed_to_pool(self):
+        """Test that the per-target size limit is applied."""
+        registry = ConnectionPoolRegistry(max_size=3)
+        create_pool = AsyncMock(side_effect=lambda *a, **kw: _mock_pool())
+
+        with patch("asyncpg.create_pool", create_pool):
+            await registry.get_pool("db-1", "postgresql://a/db")
+
+        assert create_pool.call_args.kwargs["max_size"] == 3
+        assert create_pool.call_args.kwargs["min_size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_changed_dsn_replaces_pool(self):
+        """Test that editing a connection string closes the old pool."""
+        registry = ConnectionPoolRegistry()
+        pools = [_mock_pool(), _mock_pool()]
+        create_pool = AsyncMock(side_effect=pools)
+
+        with patch("asyncpg.create_pool", create_pool):
+            await registry.get_pool("db-1", "postgresql://a/db")
+            await registry.get_pool("db-1", "postgresql://b/db")
+
+        pools[0].close.assert_awaited_once()
+        assert create_pool.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_pools_are_evicted(self):
+        """Test that pools unused for longer than idle_timeout are closed."""
+        registry = ConnectionPoolRegistry(idle_timeout=0.0)
+        pool = _mock_pool()
+
+        with patch("asyncpg.create_pool", AsyncMock(return_value=pool)):
+            async with registry.acquire("db-1", "postgresql://a/db"):
+                # In-use pools are never evicted
+                assert await registry.evict_idle() == 0
+            assert await registry.evict_idle() == 1
+
+        pool.close.assert_awaited_once()
+        assert len(registry) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_ping_expires_connections(self):
+        """Test that a dead connection triggers a reconnect before use."""
+        registry = ConnectionPoolRegistry(ping_interval=0.0)
+        dead_conn = AsyncMock()
+        dead_conn.execute.side_effect = OSError("connection reset")
+        fresh_conn = AsyncMock()
+        pool = _mock_pool()
+        pool.acquire = AsyncMock(side_effect=[dead_conn, fresh_conn])
+
+        with patch("asyncpg.create_pool", AsyncMock(return_value=pool)):
+            async with registry.acquire("db-1", "postgresql://a/db") as conn:
+                assert conn is fresh_conn
+
+        pool.expire_connections.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_reconnect_releases_dead_connection_once(self):
+        """Test that a failing re-acquire after a dead ping does not double-release."""
+        registry = ConnectionPoolRegistry(ping_interval=0.0)
+        dead_conn = AsyncMock()
+        dead_conn.execute.side_effect = OSError("connection reset")
+        pool = _mock_pool()
+        pool.acquire = AsyncMock(side_effect=[dead_conn, OSError("connection refused")])
+
+        with patch("asyncpg.create_pool", AsyncMock(return_value=pool)):
+            with pytest.raises(OSError, match="refused"):
+                async with registry.acquire("db-1", "postgresql://a/db"):
+                    pass
+
+        pool.release.assert_awaited_once_with(dead_conn)
+        assert registry._pools["db-1"].in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_close_all(self):
+        """Test that shutdown closes every pool."""
+        registry = ConnectionPoolRegistry()
+        pools = [_mock_pool(), _mock_pool()]
+
+        with patch("asyncpg.create_pool", AsyncMock(side_effect=pools)):
+            await registry.get_pool("db-1", "postgresql://a/db")
+            await registry.get_pool("db-2", "postgresql://b/db")
+            await registry.close_all()
+
+        for pool in pools:
+            pool.close.assert_awaited_once()
+        assert len(registry) == 0
@@ -0,0 +1,60 @@
+"""Unit tests for LTTB downsampling."""
+import sys
+sys.path.insert(0, '/app')
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import numpy as np
+from src.application.services.downsampling import downsample_metrics, lttb_indices
+from src.domain.entities.metric import Metric, MetricType
+
+
+def _series(metric_type, values):
+    database_id, start = uuid4(), datetime(2026, 1, 1)
+    return [
+        Metric(
+            database_id=database_id,
+            metric_type=metric_type,
+            value=float(value),
+            timestamp=start + timedelta(minutes=i),
+        )
+        for i, value in enumerate(values)
+    ]
+
+
+class TestLttb:
+    """Test suite for lttb_indices()."""
+
+    def test_peaks_survive_downsampling(self):
+        """Test that isolated spikes and dips are kept at 5% of the points."""
+        x = np.arange(10_000, dtype=np.float64)
+        y = np.sin(x / 300) + np.random.default_rng(0).normal(0, 0.05, len(x))
+        y[1234], y[5678], y[9001] = 25.0, -30.0, 40.0
+
+        indices = lttb_indices(x, y, 500)
+
+        assert len(indices) == 500
+        assert {0, 1234, 5678, 9001, 9999} <= set(indices.tolist())
+        assert np.all(np.diff(indices) > 0)
+
+    def test_short_series_is_unchanged(self):
+        x = np.arange(10, dtype=np.float64)
+
+        assert lttb_indices(x, x, 10).tolist() == list(range(10))
+        assert lttb_indices(x, x, 2).tolist() == [0, 9]
+
+
+class TestDownsampleMetrics:
+    """Test suite for downsample_metrics()."""
+
+    def test_each_metric_type_is_downsampled_separately(self):
+        qps = _series(MetricType.QPS, [1] * 499 + [100] + [1] * 500)
+        connections = _series(MetricType.CONN_COUNT, range(50))
+
+        kept = downsample_metrics(qps + connections, 100)
+
+        kept_qps = [m for m in kept if m.metric_type == MetricType.QPS]
+        assert len(kept_qps) == 100
+        assert max(m.value for m in kept_qps) == 100
+        assert [m for m in kept if m.metric_type == MetricType.CONN_COUNT] == connections
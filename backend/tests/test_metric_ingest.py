@@ -0,0 +1,89 @@
+"""Unit tests for buffered metric ingestion."""
+import sys
+sys.path.insert(0, '/app')
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.domain.entities.metric import Metric, MetricType
+from src.infrastructure.database.repositories import metric_repository
+from src.infrastructure.database.repositories.metric_repository import PostgresMetricRepository
+from src.infrastructure.database.unit_of_work import SqlAlchemyUnitOfWork
+
+
+def _metrics(count, database_id=None):
+    database_id = database_id or uuid4()
+    return [
+        Metric(
+            database_id=database_id,
+            metric_type=MetricType.QPS,
+            value=float(i),
+            timestamp=datetime(2026, 1, 1),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def settings():
+    settings = MagicMock(metric_ingest_batch_size=1000, metric_ingest_max_latency_seconds=60.0)
+    with patch.object(metric_repository, "get_settings", return_value=settings):
+        yield settings
+
+
+@pytest.fixture
+def copy_rows():
+    with patch.object(metric_repository, "copy_rows", new=AsyncMock()) as copy_rows:
+        yield copy_rows
+
+
+class TestMetricIngest:
+    """Test suite for PostgresMetricRepository.ingest()."""
+
+    @pytest.mark.asyncio
+    async def test_buffers_across_databases_until_batch_size(self, copy_rows):
+        """Test that metrics of several databases are written in one COPY."""
+        repo = PostgresMetricRepository(MagicMock(), batch_size=5, max_latency_seconds=60)
+
+        await repo.ingest(_metrics(3))
+        copy_rows.assert_not_awaited()
+        await repo.ingest(_metrics(3))
+
+        copy_rows.assert_awaited_once()
+        rows = copy_rows.call_args[0][2]
+        assert len(rows) == 6
+        assert len({row["database_id"] for row in rows}) == 2
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_oldest_metric_is_too_old(self, copy_rows):
+        """Test the latency bound on buffered metrics."""
+        repo = PostgresMetricRepository(MagicMock(), batch_size=1000, max_latency_seconds=2)
+
+        with patch.object(metric_repository.time, "monotonic", side_effect=[100.0, 100.5, 101.0, 102.5]):
+            await repo.ingest(_metrics(1))
+            await repo.ingest(_metrics(1))
+            copy_rows.assert_not_awaited()
+            await repo.ingest(_metrics(1))
+
+        copy_rows.assert_awaited_once()
+        assert len(copy_rows.call_args[0][2]) == 3
+
+    @pytest.mark.asyncio
+    async def test_commit_flushes_and_rollback_discards(self, copy_rows):
+        """Test that the unit of work writes or drops the buffer with the transaction."""
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session.rollback = AsyncMock()
+        uow = SqlAlchemyUnitOfWork(session)
+
+        await uow.metrics.ingest(_metrics(2))
+        await uow.rollback()
+        await uow.commit()
+        copy_rows.assert_not_awaited()
+
+        await uow.metrics.ingest(_metrics(2))
+        await uow.commit()
+        copy_rows.assert_awaited_once()
+        session.commit.assert_awaited()
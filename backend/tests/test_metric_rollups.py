@@ -0,0 +1,130 @@
+"""Unit tests for resolution-aware metric reads."""
+import sys
+sys.path.insert(0, '/app')
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from src.application.use_cases.get_metrics import GetMetricsUseCase
+from src.domain.entities.metric import MetricResolution, MetricType
+from src.infrastructure.database.repositories.metric_repository import (
+    ROLLUP_RECHECK_SECONDS,
+    PostgresMetricRepository,
+)
+
+DAY = 86400
+
+
+class TestResolutionForRange:
+    """Test suite for MetricResolution.for_range()."""
+
+    def test_without_limits_reads_raw(self):
+        assert MetricResolution.for_range(30 * DAY) == MetricResolution.RAW
+
+    def test_requested_resolution_picks_widest_bucket_within_it(self):
+        assert MetricResolution.for_range(DAY, resolution_seconds=300) == MetricResolution.MINUTE
+        assert MetricResolution.for_range(DAY, resolution_seconds=3600) == MetricResolution.HOUR
+        assert MetricResolution.for_range(DAY, resolution_seconds=10) == MetricResolution.RAW
+
+    def test_point_budget_picks_narrowest_bucket_that_fits(self):
+        """Test that the number of buckets stays within max_points."""
+        assert MetricResolution.for_range(3600, max_points=1000) == MetricResolution.MINUTE
+        assert MetricResolution.for_range(30 * DAY, max_points=1000) == MetricResolution.HOUR
+        assert MetricResolution.for_range(3 * 365 * DAY, max_points=1000) == MetricResolution.DAY
+        assert MetricResolution.for_range(3650 * DAY, max_points=100) == MetricResolution.DAY
+
+    def test_point_budget_overrides_finer_resolution(self):
+        resolution = MetricResolution.for_range(30 * DAY, resolution_seconds=60, max_points=1000)
+
+        assert resolution == MetricResolution.HOUR
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    result = MagicMock()
+    result.all.return_value = [(datetime(2026, 1, 1), MetricType.QPS, 2.0, 1.0, 3.0, 4)]
+    session.execute = AsyncMock(return_value=result)
+    with patch.object(PostgresMetricRepository, "_rollups_available", False), patch.object(
+        PostgresMetricRepository, "_rollups_checked_at", None
+    ):
+        yield session
+
+
+def _repo(session):
+    return PostgresMetricRepository(session, batch_size=1, max_latency_seconds=1)
+
+
+def _sql(session):
+    return str(session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+
+
+class TestGetRollups:
+    """Test suite for PostgresMetricRepository.get_rollups()."""
+
+    @pytest.mark.asyncio
+    async def test_reads_continuous_aggregate(self, session):
+        session.scalar = AsyncMock(return_value=0)
+        end = datetime(2026, 1, 2)
+
+        metrics = await _repo(session).get_rollups(
+            uuid4(), end - timedelta(days=1), end, MetricResolution.HOUR
+        )
+
+        assert "FROM metrics_1h" in _sql(session)
+        assert metrics[0].value == 2.0
+        assert metrics[0].metadata == {"resolution": "1h", "min": 1.0, "max": 3.0, "count": 4}
+
+    @pytest.mark.asyncio
+    async def test_aggregates_raw_metrics_without_timescaledb(self, session):
+        """Test the date_bin() fallback when the views are missing."""
+        session.scalar = AsyncMock(return_value=3)
+        end = datetime(2026, 1, 2)
+        repo = _repo(session)
+
+        await repo.get_rollups(uuid4(), end - timedelta(days=1), end, MetricResolution.MINUTE)
+        await repo.get_rollups(uuid4(), end - timedelta(days=1), end, MetricResolution.DAY)
+
+        sql = _sql(session)
+        assert "date_bin(INTERVAL '86400 seconds', metrics.timestamp" in sql
+        assert "GROUP BY" in sql
+        session.scalar.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_rollups_are_looked_for_again(self, session):
+        """Test that rollups created after a negative check are picked up."""
+        session.scalar = AsyncMock(side_effect=[3, 0])
+        end = datetime(2026, 1, 2)
+        repo = _repo(session)
+
+        with patch("src.infrastructure.database.repositories.metric_repository.time") as clock:
+            clock.monotonic.return_value = 1000.0
+            await repo.get_rollups(uuid4(), end - timedelta(days=1), end, MetricResolution.HOUR)
+            assert "FROM metrics_1h" not in _sql(session)
+
+            clock.monotonic.return_value = 1000.0 + ROLLUP_RECHECK_SECONDS
+            await repo.get_rollups(uuid4(), end - timedelta(days=1), end, MetricResolution.HOUR)
+            assert "FROM metrics_1h" in _sql(session)
+
+            # Found rollups are never checked again
+            clock.monotonic.return_value = 1000.0 + 10 * ROLLUP_RECHECK_SECONDS
+            await repo.get_rollups(uuid4(), end - timedelta(days=1), end, MetricResolution.HOUR)
+
+        assert session.scalar.await_count == 2
+
+
+class TestGetMetricsUseCase:
+    """Test suite for GetMetricsUseCase."""
+
+    @pytest.mark.asyncio
+    async def test_long_range_reads_rollup(self):
+        repo = MagicMock()
+        repo.get_rollups = AsyncMock(return_value=[])
+
+        response = await GetMetricsUseCase(repo).execute(uuid4(), hours=30 * 24, max_points=1000)
+
+        assert response.resolution == MetricResolution.HOUR
+        assert repo.get_rollups.call_args[0][3] == MetricResolution.HOUR
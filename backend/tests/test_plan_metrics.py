@@ -0,0 +1,96 @@
+"""Unit tests for derived EXPLAIN plan metrics."""
+import sys
+sys.path.insert(0, '/app')
+
+import pytest
+from src.infrastructure.analyzers.explain_analyzer import ExplainAnalyzer
+from src.infrastructure.analyzers.plan_metrics import compute_plan_metrics, root_plan
+
+
+def _analyzed_plan():
+    return [{
+        "Plan": {
+            "Node Type": "Hash Join",
+            "Total Cost": 2000.0,
+            "Plan Rows": 100,
+            "Actual Rows": 100,
+            "Actual Total Time": 100.0,
+            "Actual Loops": 1,
+            "Shared Hit Blocks": 500,
+            "Plans": [
+                {
+                    "Node Type": "Seq Scan",
+                    "Relation Name": "orders",
+                    "Total Cost": 1500.0,
+                    "Plan Rows": 50000,
+                    "Actual Rows": 50000,
+                    "Actual Total Time": 80.0,
+                    "Actual Loops": 1,
+                    "Shared Hit Blocks": 450,
+                },
+                {
+                    "Node Type": "Index Scan",
+                    "Relation Name": "customers",
+                    "Total Cost": 8.0,
+                    "Plan Rows": 1,
+                    "Actual Rows": 40,
+                    "Actual Total Time": 0.1,
+                    "Actual Loops": 50,
+                    "Shared Hit Blocks": 30,
+                },
+            ],
+        },
+        "Execution Time": 100.5,
+    }]
+
+
+class TestComputePlanMetrics:
+    """Test suite for compute_plan_metrics()."""
+
+    def test_exclusive_time_and_buffers(self):
+        """Test that children's inclusive values are subtracted, with loops applied."""
+        join, scan, index_scan = compute_plan_metrics(root_plan(_analyzed_plan()))
+
+        assert index_scan.inclusive_time_ms == pytest.approx(5.0)
+        assert join.exclusive_time_ms == pytest.approx(15.0)
+        assert scan.share == pytest.approx(0.8)
+        assert join.exclusive_buffers == {"Shared Hit Blocks": 20}
+        assert index_scan.row_estimate_ratio == 40
+        assert (scan.parent, index_scan.parent, index_scan.depth) == (0, 0, 1)
+
+    def test_shares_fall_back_to_cost_without_analyze(self):
+        plan = {"Plan": {
+            "Node Type": "Sort",
+            "Total Cost": 100.0,
+            "Plans": [{"Node Type": "Seq Scan", "Total Cost": 75.0}],
+        }}
+
+        sort, scan = compute_plan_metrics(root_plan(plan))
+
+        assert sort.exclusive_time_ms is None
+        assert (sort.share, scan.share) == (0.25, 0.75)
+
+    def test_deep_plans_do_not_recurse(self):
+        """Test a plan deeper than the Python recursion limit."""
+        node = {"Node Type": "Seq Scan", "Total Cost": 1.0}
+        for _ in range(sys.getrecursionlimit() * 2):
+            node = {"Node Type": "Nested Loop", "Total Cost": node["Total Cost"] + 1, "Plans": [node]}
+
+        metrics = compute_plan_metrics(node)
+
+        assert metrics[-1].depth == sys.getrecursionlimit() * 2
+        assert ExplainAnalyzer().analyze({"Plan": node}) == []
+
+
+class TestExplainAnalyzerImpact:
+    """Test suite for runtime-based impact in ExplainAnalyzer."""
+
+    def test_impact_follows_runtime_share(self):
+        findings = ExplainAnalyzer().analyze(_analyzed_plan())
+
+        assert [f["title"] for f in findings] == [
+            "Sequential Scan on orders",
+            "Outdated Statistics for customers",
+        ]
+        assert findings[0]["impact"] == 0.64  # 80% of the time, weight 0.8
+        assert "80.0 ms, 80% of the execution time" in findings[0]["description"]
@@ -0,0 +1,215 @@
+"""Unit tests for the plan rule registry."""
+import sys
+sys.path.insert(0, '/app')
+
+import pytest
+from src.domain.entities.recommendation import RecommendationType
+from src.infrastructure.analyzers.explain_analyzer import ExplainAnalyzer
+from src.infrastructure.analyzers.index_analyzer import IndexAnalyzer
+from src.infrastructure.analyzers.plan_rules import PlanRule, PlanRuleRegistry, default_plan_rules
+
+
+class HashBatchesRule(PlanRule):
+    name = "hash_batches"
+    version = 2
+    node_types = frozenset({"Hash"})
+
+    def __init__(self):
+        self.seen = []
+
+    def check(self, m):
+        self.seen.append(m.node_type)
+        if m.node.get("Hash Batches", 1) > 1:
+            return self.finding(m, RecommendationType.REWRITE, "Hash spilled", "", m.share, 0.9)
+        return None
+
+
+PLAN = {"Plan": {
+    "Node Type": "Sort",
+    "Sort Key": ["created_at DESC"],
+    "Total Cost": 1000.0,
+    "Plan Rows": 50000,
+    "Plans": [{
+        "Node Type": "Hash Join",
+        "Total Cost": 800.0,
+        "Plan Rows": 50000,
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "orders", "Total Cost": 500.0, "Plan Rows": 50000},
+            {"Node Type": "Hash", "Hash Batches": 4, "Total Cost": 100.0, "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "customers", "Total Cost": 90.0, "Plan Rows": 10},
+            ]},
+        ],
+    }],
+}}
+
+
+class TestPlanRuleRegistry:
+    """Test suite for PlanRuleRegistry."""
+
+    def test_rules_are_dispatched_by_node_type(self):
+        registry = default_plan_rules()
+
+        assert [r.name for r in registry.rules_for("Seq Scan")] == [
+            "seq_scan", "row_estimate", "temp_io", "shared_read",
+        ]
+        assert [r.name for r in registry.rules_for("Hash")] == [
+            "row_estimate", "hash_spill", "temp_io", "shared_read",
+        ]
+
+    def test_registered_rule_only_sees_its_node_types(self):
+        """Test that a new rule runs on its nodes and tags findings with its version."""
+        registry = default_plan_rules()
+        rule = registry.register(HashBatchesRule())
+        analyzer = ExplainAnalyzer(registry)
+
+        findings = analyzer.analyze(PLAN)
+
+        assert rule.seen == ["Hash"]
+        hash_finding = next(f for f in findings if f["rule"] == "hash_batches")
+        assert hash_finding["rule_version"] == 2
+        assert analyzer.rule_stats["hash_batches@v2"]["calls"] == 1
+        assert analyzer.rule_stats["seq_scan@v2"] == pytest.approx(
+            {"calls": 2, "findings": 1, "seconds": analyzer.rule_stats["seq_scan@v2"]["seconds"]}
+        )
+
+    def test_duplicate_rule_names_are_rejected(self):
+        registry = PlanRuleRegistry([HashBatchesRule()])
+
+        with pytest.raises(ValueError):
+            registry.register(HashBatchesRule())
+
+
+class TestIndexAnalyzerFromRules:
+    """Test suite for IndexAnalyzer reading rule findings."""
+
+    def test_sort_index_uses_first_relation_below_the_sort(self):
+        findings = ExplainAnalyzer().analyze(PLAN)
+
+        recommendations = IndexAnalyzer().analyze("", findings)
+
+        assert {r["sql_suggestion"] for r in recommendations} == {
+            "CREATE INDEX idx_orders_created_at ON orders (created_at);",
+        }
+
+
+def _findings(node, settings=None):
+    plan = {"Plan": node}
+    if settings:
+        plan["Settings"] = settings
+    return {f["rule"]: f for f in ExplainAnalyzer().analyze([plan])}
+
+
+class TestSpillRules:
+    """Test suite for the spill and memory-pressure rules."""
+
+    def test_external_sort_suggests_work_mem(self):
+        """Test that a spilled sort gets a work_mem suggestion instead of the row-count rule."""
+        findings = _findings(
+            {
+                "Node Type": "Sort",
+                "Sort Method": "external merge",
+                "Sort Space Used": 30000,
+                "Sort Space Type": "Disk",
+                "Plan Rows": 200000,
+                "Actual Rows": 200000,
+                "Actual Total Time": 500.0,
+                "Actual Loops": 1,
+            },
+            settings={"work_mem": "8MB"},
+        )
+
+        assert set(findings) == {"sort_spill"}
+        spill = findings["sort_spill"]
+        assert spill["sql_suggestion"] == "SET work_mem = '59MB';"
+        assert "from 8MB to about 59MB (+51MB)" in spill["description"]
+
+    def test_spilled_incremental_sort_suggests_work_mem(self):
+        """Test that incremental sorts are read from their per-group sort space."""
+        findings = _findings(
+            {
+                "Node Type": "Incremental Sort",
+                "Presorted Key": ["created_at"],
+                "Full-sort Groups": {
+                    "Group Count": 40,
+                    "Sort Methods Used": ["quicksort"],
+                    "Sort Space Memory": {"Average Sort Space Used": 30, "Peak Sort Space Used": 30},
+                },
+                "Pre-sorted Groups": {
+                    "Group Count": 3,
+                    "Sort Methods Used": ["external merge"],
+                    "Sort Space Disk": {"Average Sort Space Used": 20000, "Peak Sort Space Used": 30000},
+                },
+                "Plan Rows": 200000,
+                "Actual Rows": 200000,
+                "Actual Total Time": 500.0,
+                "Actual Loops": 1,
+                "Temp Written Blocks": 3750,
+            },
+            settings={"work_mem": "8MB"},
+        )
+
+        assert set(findings) == {"sort_spill"}
+        spill = findings["sort_spill"]
+        assert spill["sql_suggestion"] == "SET work_mem = '59MB';"
+        assert "used quicksort, external merge with 30000 kB on disk" in spill["description"]
+
+    def test_in_memory_sort_is_not_a_spill(self):
+        findings = _findings({
+            "Node Type": "Sort",
+            "Sort Method": "quicksort",
+            "Sort Space Used": 3000,
+            "Sort Space Type": "Memory",
+            "Plan Rows": 200000,
+            "Actual Rows": 200000,
+            "Actual Total Time": 50.0,
+            "Actual Loops": 1,
+        })
+
+        assert set(findings) == {"large_sort"}
+
+    def test_hash_batches_use_hash_mem_multiplier(self):
+        findings = _findings(
+            {
+                "Node Type": "Hash Join",
+                "Actual Total Time": 100.0,
+                "Actual Loops": 1,
+                "Temp Written Blocks": 4000,
+                "Plans": [{
+                    "Node Type": "Hash",
+                    "Hash Batches": 8,
+                    "Peak Memory Usage": 4000,
+                    "Actual Total Time": 60.0,
+                    "Actual Loops": 1,
+                    "Temp Written Blocks": 2000,
+                }],
+            },
+            settings={"hash_mem_multiplier": "1"},
+        )
+
+        assert set(findings) == {"hash_spill"}
+        assert findings["hash_spill"]["work_mem_kb"] == 32000
+        assert findings["hash_spill"]["title"] == "Hash table spilled to disk (8 batches)"
+
+    def test_temp_io_and_shared_reads_of_other_nodes(self):
+        findings = _findings({
+            "Node Type": "Materialize",
+            "Actual Total Time": 100.0,
+            "Actual Loops": 1,
+            "Temp Written Blocks": 1280,
+            "Temp Read Blocks": 1280,
+            "Shared Read Blocks": 9500,
+            "Shared Hit Blocks": 1000,
+            "Plans": [{
+                "Node Type": "Seq Scan",
+                "Relation Name": "events",
+                "Actual Total Time": 80.0,
+                "Actual Loops": 1,
+                "Shared Read Blocks": 9000,
+                "Shared Hit Blocks": 100,
+            }],
+        })
+
+        assert findings["temp_io"]["title"] == "Temporary files written by Materialize (10MB)"
+        assert findings["shared_read"]["title"] == "Cache misses on events (1% hit ratio)"
+        # The Materialize node itself only read 500 blocks
+        assert findings["shared_read"]["relation"] == "events"
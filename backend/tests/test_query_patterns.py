@@ -0,0 +1,170 @@
+"""Unit tests for per-fingerprint running statistics."""
+import sys
+sys.path.insert(0, '/app')
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from src.domain.entities.query import Query
+from src.domain.entities.query_pattern import QueryPattern
+from src.infrastructure.database.models import QueryPatternModel
+from src.infrastructure.database.repositories.query_pattern_repository import PostgresQueryPatternRepository
+from src.infrastructure.services.sql_normalizer import SqlNormalizer
+
+DATABASE_ID = uuid4()
+T0 = datetime(2026, 1, 1)
+
+
+def _sample(fingerprint_hash, latency, calls, minutes, sql="SELECT * FROM t WHERE id = 1"):
+    return Query(
+        database_id=DATABASE_ID,
+        sql_text=sql,
+        normalized_sql="SELECT * FROM t WHERE id = $1",
+        execution_time_ms=latency,
+        timestamp=T0 + timedelta(minutes=minutes),
+        calls=calls,
+        fingerprint_hash=fingerprint_hash,
+    )
+
+
+class TestQueryPattern:
+    """Test suite for QueryPattern."""
+
+    def test_from_samples_folds_one_pattern_per_fingerprint(self):
+        """Test that samples of a fingerprint are merged, keeping the latest text."""
+        patterns = QueryPattern.from_samples([
+            _sample(1, 10.0, 3, minutes=5, sql="latest"),
+            _sample(1, 30.0, 1, minutes=0, sql="oldest"),
+            _sample(2, 5.0, None, minutes=0),
+        ])
+
+        by_hash = {p.fingerprint_hash: p for p in patterns}
+        first = by_hash[1]
+        assert (first.sample_count, first.total_calls) == (2, 4)
+        assert (first.min_exec_time_ms, first.max_exec_time_ms) == (10.0, 30.0)
+        assert (first.first_seen, first.last_seen) == (T0, T0 + timedelta(minutes=5))
+        assert first.sample_sql == "latest"
+        assert by_hash[2].total_calls == 1
+
+    def test_mean_and_stddev_are_weighted_by_calls(self):
+        """Test the running mean and standard deviation."""
+        pattern = QueryPattern.from_samples([
+            _sample(1, 10.0, 3, minutes=0),
+            _sample(1, 30.0, 1, minutes=5),
+        ])[0]
+
+        assert pattern.mean_exec_time_ms == pytest.approx(15.0)
+        # sqrt((3 * 10^2 + 30^2) / 4 - 15^2)
+        assert pattern.stddev_exec_time_ms == pytest.approx(75 ** 0.5)
+
+    def test_merge_adds_statistics_and_keeps_latest_text(self):
+        older = QueryPattern.from_samples([_sample(1, 10.0, 3, minutes=0, sql="old")])[0]
+        newer = QueryPattern.from_samples([_sample(2, 40.0, 1, minutes=5, sql="new")])[0]
+
+        older.merge(newer)
+
+        assert (older.sample_count, older.total_calls) == (2, 4)
+        assert (older.min_exec_time_ms, older.max_exec_time_ms) == (10.0, 40.0)
+        assert older.last_seen == T0 + timedelta(minutes=5)
+        assert older.sample_sql == "new"
+
+
+class TestPostgresQueryPatternRepository:
+    """Test suite for the pattern upsert."""
+
+    @pytest.mark.asyncio
+    async def test_upsert_adds_to_stored_statistics(self):
+        """Test that one INSERT ... ON CONFLICT DO UPDATE merges every pattern."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+        patterns = QueryPattern.from_samples([
+            _sample(2, 5.0, 1, minutes=0),
+            _sample(1, 10.0, 1, minutes=0),
+        ])
+
+        await PostgresQueryPatternRepository(session).upsert_all(patterns)
+
+        session.execute.assert_awaited_once()
+        stmt = session.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (database_id, fingerprint_hash) DO UPDATE" in sql
+        assert "total_calls = (query_patterns.total_calls + excluded.total_calls)" in sql
+        assert "least(query_patterns.first_seen, excluded.first_seen)" in sql
+        # Rows are written in key order
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        assert [params["fingerprint_hash_m0"], params["fingerprint_hash_m1"]] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_upsert_without_patterns_is_a_no_op(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await PostgresQueryPatternRepository(session).upsert_all([])
+
+        session.execute.assert_not_awaited()
+
+
+def _pattern_model(fingerprint_hash, sample_sql, calls, minutes):
+    return QueryPatternModel(
+        database_id=DATABASE_ID,
+        fingerprint_hash=fingerprint_hash,
+        normalized_sql="old rules",
+        sample_sql=sample_sql,
+        sample_count=1,
+        total_calls=calls,
+        total_exec_time_ms=10.0 * calls,
+        sum_sq_exec_time_ms=100.0 * calls,
+        min_exec_time_ms=10.0,
+        max_exec_time_ms=10.0,
+        first_seen=T0 + timedelta(minutes=minutes),
+        last_seen=T0 + timedelta(minutes=minutes),
+    )
+
+
+class TestRenormalize:
+    """Test suite for PostgresQueryPatternRepository.renormalize()."""
+
+    @pytest.mark.asyncio
+    async def test_text_less_samples_follow_their_pattern_text(self):
+        """Test that fingerprints come from query_patterns, never from NULL sample texts."""
+        session = MagicMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [
+            _pattern_model(101, "SELECT * FROM t WHERE id = 1", calls=2, minutes=0),
+            _pattern_model(102, "SELECT * FROM t WHERE id = 2", calls=3, minutes=5),
+        ]
+        session.execute = AsyncMock(side_effect=[result, None, None, None])
+
+        renamed = await PostgresQueryPatternRepository(session).renormalize(DATABASE_ID, version=2)
+
+        assert renamed == 2
+        select_stmt, rekey, delete_stmt, upsert = [c.args for c in session.execute.await_args_list]
+        # Samples are selected by fingerprint only; their texts are never read
+        assert "queries.sql_text" not in str(select_stmt[0])
+        new_hash = SqlNormalizer.fingerprint_hash(SqlNormalizer.normalize("SELECT * FROM t WHERE id = 1"))
+        assert new_hash != SqlNormalizer.fingerprint_hash("")
+        assert "CASE WHEN normalized_sql IS NULL THEN NULL" in str(rekey[0])
+        assert [(r["old_hash"], r["new_hash"]) for r in rekey[1]] == [(101, new_hash), (102, new_hash)]
+        # Both old patterns collapse into one, with their statistics added
+        params = upsert[0].compile(dialect=postgresql.dialect()).params
+        assert params["fingerprint_hash_m0"] == new_hash
+        assert params["total_calls_m0"] == 5
+        assert params["sample_sql_m0"] == "SELECT * FROM t WHERE id = 2"
+        # An older batch never replaces the text of a more recent one
+        assert (
+            "sample_sql = CASE WHEN (excluded.last_seen >= query_patterns.last_seen) "
+            "THEN excluded.sample_sql ELSE query_patterns.sample_sql END"
+        ) in str(upsert[0].compile(dialect=postgresql.dialect()))
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_do_without_pattern_texts(self):
+        session = MagicMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        session.execute = AsyncMock(return_value=result)
+
+        assert await PostgresQueryPatternRepository(session).renormalize(DATABASE_ID) == 0
+        session.execute.assert_awaited_once()
@@ -0,0 +1,148 @@
+"""Unit tests for server statistics rates."""
+import sys
+sys.path.insert(0, '/app')
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.infrastructure.collectors.postgres_collector import PostgresCollector
+from src.infrastructure.collectors.server_stats import ServerStatsSnapshot, compute_server_rates
+from src.infrastructure.collectors.snapshot_store import SnapshotStore
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _values(**overrides):
+    values = {
+        "numbackends": 12,
+        "xact_commit": 1000,
+        "xact_rollback": 10,
+        "deadlocks": 1,
+        "blks_read": 100,
+        "blks_hit": 900,
+        "blk_read_time": 50.0,
+        "temp_bytes": 0,
+        "stats_reset": T0 - timedelta(days=30),
+        "block_size": 8192,
+        "active_connections": 3,
+        "idle_in_transaction": 1,
+        "lock_waiters": 2,
+        "lock_wait_seconds": 1.5,
+        "locks_not_granted": 2,
+        "heap_blks_read": 80,
+        "heap_blks_hit": 720,
+        "idx_blks_read": 20,
+        "idx_blks_hit": 180,
+    }
+    values.update(overrides)
+    return values
+
+
+class TestComputeServerRates:
+    """Test suite for compute_server_rates()."""
+
+    def test_first_snapshot_reports_gauges_only(self):
+        """Test that gauges are available before a baseline exists."""
+        stats = compute_server_rates(None, ServerStatsSnapshot(T0, _values()))
+
+        assert stats["conn_count"] == 12
+        assert stats["lock_wait_time_ms"] == pytest.approx(1500.0)
+        assert stats["tps"] is None
+        assert stats["cache_hit_ratio"] is None
+
+    def test_rates_use_interval_deltas(self):
+        """Test that counters are converted to rates over the interval."""
+        previous = ServerStatsSnapshot(T0, _values())
+        current = ServerStatsSnapshot(
+            T0 + timedelta(seconds=100),
+            _values(
+                xact_commit=1990, xact_rollback=20, deadlocks=3,
+                blks_read=150, blks_hit=1850,
+            ),
+        )
+
+        stats = compute_server_rates(previous, current)
+
+        assert stats["tps"] == pytest.approx(10.0)
+        assert stats["deadlocks"] == 2
+        # 950 hits and 50 reads during the interval, regardless of history
+        assert stats["cache_hit_ratio"] == pytest.approx(0.95)
+        assert stats["disk_reads_per_second"] == pytest.approx(0.5)
+        assert stats["disk_read_bytes_per_second"] == pytest.approx(0.5 * 8192)
+
+    def test_stats_reset_skips_rates(self):
+        """Test that a pg_stat_database reset does not produce negative rates."""
+        previous = ServerStatsSnapshot(T0, _values())
+        current = ServerStatsSnapshot(
+            T0 + timedelta(seconds=60), _values(xact_commit=5, stats_reset=T0)
+        )
+
+        stats = compute_server_rates(previous, current)
+
+        assert stats["tps"] is None
+        assert stats["conn_count"] == 12
+
+
+class TestSharedServerSnapshots:
+    """Test suite for server rates across collector processes."""
+
+    async def _collect(self, collector, values, taken_at):
+        conn = AsyncMock()
+        conn.fetchrow.return_value = values
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        with patch.object(collector, "_acquire", acquire), patch(
+            "src.infrastructure.collectors.postgres_collector.datetime"
+        ) as clock:
+            clock.utcnow.return_value = taken_at
+            return await collector.collect_server_stats()
+
+    @pytest.mark.asyncio
+    async def test_alternating_collectors_sum_to_the_true_total(self):
+        """Test that two worker processes sharing a store never count an interval twice."""
+        store = SnapshotStore()
+        workers = [
+            PostgresCollector("postgresql://db", database_id="db", snapshot_store=store)
+            for _ in range(2)
+        ]
+        cumulative_commits = [1000, 1300, 1350, 2000]
+
+        commits = 0
+        for i, xact_commit in enumerate(cumulative_commits):
+            stats = await self._collect(
+                workers[i % 2], _values(xact_commit=xact_commit), T0 + timedelta(minutes=i)
+            )
+            commits += stats.get("commits", 0)
+
+        assert commits == cumulative_commits[-1] - cumulative_commits[0]
+
+    @pytest.mark.asyncio
+    async def test_older_snapshot_reports_gauges_only(self):
+        """Test that a snapshot older than the stored one produces no rates."""
+        store = SnapshotStore()
+        first, late = [
+            PostgresCollector("postgresql://db", database_id="db", snapshot_store=store)
+            for _ in range(2)
+        ]
+        await self._collect(first, _values(), T0)
+        await self._collect(first, _values(xact_commit=2000), T0 + timedelta(minutes=2))
+
+        stats = await self._collect(late, _values(xact_commit=1500), T0 + timedelta(minutes=1))
+
+        assert stats["tps"] is None
+        assert stats["active_connections"] == 3
+
+    def test_snapshot_round_trips_through_json(self):
+        reset = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        snapshot = ServerStatsSnapshot(T0, _values(stats_reset=reset))
+
+        restored = ServerStatsSnapshot.from_json(snapshot.to_json())
+
+        assert restored.taken_at == T0
+        assert restored.stats_reset == reset
+        assert restored.values["blk_read_time"] == 50.0
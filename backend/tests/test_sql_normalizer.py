@@ -0,0 +1,152 @@
+"""Unit tests for SqlNormalizer."""
+import sys
+sys.path.insert(0, '/app')
+
+from unittest.mock import patch
+
+import pytest
+from src.infrastructure.services.sql_normalizer import SqlNormalizer, normalized_cache
+
+
+class TestSqlNormalizer:
+    """Test suite for SqlNormalizer.normalize()."""
+
+    def test_spacing_casing_and_comments_do_not_matter(self):
+        """Test that trivially different texts share one fingerprint."""
+        variants = [
+            "SELECT * FROM users WHERE id = 10",
+            "select *\n  from Users\twhere id=42 -- lookup",
+            "/* app:api */ SELECT * FROM users WHERE id = $1",
+        ]
+
+        assert {SqlNormalizer.normalize(sql) for sql in variants} == {
+            "SELECT * FROM users WHERE id = $1"
+        }
+
+    def test_constants_are_numbered_in_order(self):
+        """Test that literals of every kind, including negatives, become placeholders."""
+        sql = "SELECT * FROM t WHERE a = -5 AND b = 'x' AND c > 1.5 AND d = $1 LIMIT 10"
+
+        assert SqlNormalizer.normalize(sql) == (
+            "SELECT * FROM t WHERE a = $1 AND b = $2 AND c > $3 AND d = $4 LIMIT $5"
+        )
+
+    def test_unparsable_text_falls_back_to_sqlparse(self):
+        """Test that text rejected by the PostgreSQL parser is still normalized."""
+        sql = "SELECT * FROM users WHERE id = ? AND name = 'bob'"
+
+        with patch.object(
+            SqlNormalizer, "_normalize_sqlparse", wraps=SqlNormalizer._normalize_sqlparse
+        ) as fallback:
+            normalized = SqlNormalizer.normalize(sql)
+
+        fallback.assert_called_once_with(sql, True)
+        assert normalized == "SELECT * FROM users WHERE id = ? AND name = $1"
+
+    @pytest.mark.parametrize("sql", ["", None])
+    def test_empty_input(self, sql):
+        assert SqlNormalizer.normalize(sql) == ""
+
+
+class TestListCollapsing:
+    """Test suite for the version 2 fingerprint rules."""
+
+    @pytest.mark.parametrize(
+        "variants, expected",
+        [
+            (
+                ["SELECT * FROM t WHERE id IN (1)", "SELECT * FROM t WHERE id IN ($1, $2, $3)"],
+                "SELECT * FROM t WHERE id IN ($1)",
+            ),
+            (
+                ["INSERT INTO t (a, b) VALUES (1, 'x')", "INSERT INTO t (a, b) VALUES (1, 'x'), (2, 'y')"],
+                "INSERT INTO t (a, b) VALUES ($1, $2)",
+            ),
+            (
+                ["SELECT * FROM t WHERE id = ANY(ARRAY[1, 2])", "SELECT * FROM t WHERE id = ANY(ARRAY[-1])"],
+                "SELECT * FROM t WHERE id = ANY(ARRAY[$1])",
+            ),
+            (
+                [
+                    "SELECT CASE kind WHEN 1 THEN 'a' ELSE 'c' END FROM t",
+                    "SELECT CASE kind WHEN 1 THEN 'a' WHEN 2 THEN 'b' ELSE 'c' END FROM t",
+                ],
+                "SELECT CASE kind WHEN $1 THEN $2 ELSE $3 END FROM t",
+            ),
+        ],
+    )
+    def test_variable_length_lists_share_a_fingerprint(self, variants, expected):
+        """Test that IN lists, VALUES rows, arrays and CASE branches collapse."""
+        assert {SqlNormalizer.normalize(sql) for sql in variants} == {expected}
+
+    def test_only_runs_of_equivalent_items_collapse(self):
+        """Test that items differing in more than constants are kept."""
+        sql = "SELECT * FROM t WHERE a IN (1, 2, b, 3) AND (c, d) IN ((1, 'x'), (2, 'y'))"
+
+        assert SqlNormalizer.normalize(sql) == (
+            "SELECT * FROM t WHERE a IN ($1, b, $2) AND (c, d) IN (($3, $4))"
+        )
+
+    def test_version_1_keeps_lists(self):
+        """Test that the previous rules can still be applied."""
+        assert SqlNormalizer.normalize("SELECT * FROM t WHERE id IN (1, 2)", version=1) == (
+            "SELECT * FROM t WHERE id IN ($1, $2)"
+        )
+
+
+class TestNormalizeCache:
+    """Test suite for memoized and batch normalization."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        normalized_cache.clear()
+        yield
+        normalized_cache.clear()
+
+    def test_repeated_text_is_parsed_once(self):
+        """Test that normalization cost only grows with new texts."""
+        with patch.object(
+            SqlNormalizer, "_normalize_uncached", wraps=SqlNormalizer._normalize_uncached
+        ) as uncached:
+            for _ in range(3):
+                SqlNormalizer.normalize("SELECT * FROM users WHERE id = 7")
+
+        uncached.assert_called_once()
+        assert SqlNormalizer.cache_stats()["hits"] == 2
+
+    def test_normalize_many_keeps_order_and_dedupes(self):
+        """Test that batches map back to their inputs and skip duplicates."""
+        sqls = ["SELECT 1", "", "SELECT * FROM t WHERE a = 2", "SELECT 1"]
+
+        with patch.object(
+            SqlNormalizer, "_normalize_uncached", wraps=SqlNormalizer._normalize_uncached
+        ) as uncached:
+            normalized = SqlNormalizer.normalize_many(sqls)
+
+        assert normalized == ["SELECT $1", "", "SELECT * FROM t WHERE a = $1", "SELECT $1"]
+        assert uncached.call_count == 2
+
+    def test_normalize_many_process_pool(self):
+        """Test that large batches produce the same result through the process pool."""
+        sqls = [f"SELECT * FROM t WHERE id = {i}" for i in range(20)]
+
+        normalized = SqlNormalizer.normalize_many(sqls, max_workers=2, parallel_threshold=10)
+
+        assert set(normalized) == {"SELECT * FROM t WHERE id = $1"}
+        assert len(normalized_cache) == 20
+
+
+class TestFingerprintHash:
+    """Test suite for SqlNormalizer.fingerprint_hash()."""
+
+    def test_matches_postgres_backfill_expression(self):
+        """Test the value of ('x' || substr(md5(text), 1, 16))::bit(64)::bigint."""
+        # md5('SELECT $1') = e3dee35b749e22ac...
+        assert SqlNormalizer.fingerprint_hash("SELECT $1") == int("e3dee35b749e22ac", 16) - 2**64
+
+    def test_fits_in_bigint(self):
+        """Test that hashes are signed 64-bit values."""
+        hashes = [SqlNormalizer.fingerprint_hash(f"SELECT {i}") for i in range(100)]
+
+        assert all(-(2**63) <= h < 2**63 for h in hashes)
+        assert len(set(hashes)) == 100
@@ -0,0 +1,201 @@
+"""Unit tests for pg_stat_statements interval deltas."""
+import sys
+sys.path.insert(0, '/app')
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.infrastructure.collectors.postgres_collector import PostgresCollector
+from src.infrastructure.collectors.snapshot_store import RedisSnapshotStore, SnapshotStore
+from src.infrastructure.collectors.statement_snapshots import (
+    StatementSnapshot,
+    compute_statement_deltas,
+    select_slow_statements,
+)
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _counters(calls, total_exec_time, rows=0, shared_blks_read=0):
+    return {
+        "calls": calls,
+        "total_exec_time": total_exec_time,
+        "rows": rows,
+        "shared_blks_hit": 0,
+        "shared_blks_read": shared_blks_read,
+        "shared_blks_dirtied": 0,
+        "shared_blks_written": 0,
+        "temp_blks_read": 0,
+        "temp_blks_written": 0,
+    }
+
+
+class TestComputeStatementDeltas:
+    """Test suite for compute_statement_deltas()."""
+
+    def test_first_snapshot_is_baseline(self):
+        """Test that no deltas are produced without a previous snapshot."""
+        current = StatementSnapshot(T0, {1: _counters(10, 100.0)})
+        assert compute_statement_deltas(None, current) is None
+
+    def test_interval_latency_ignores_history(self):
+        """Test that a recent regression is not hidden by cumulative history."""
+        # 1M fast calls historically, then 100 calls at 500ms each
+        previous = StatementSnapshot(T0, {1: _counters(1_000_000, 1_000_000.0)})
+        current = StatementSnapshot(
+            T0 + timedelta(minutes=5), {1: _counters(1_000_100, 1_050_000.0, rows=100)}
+        )
+
+        interval = compute_statement_deltas(previous, current)
+
+        statement = interval["statements"][0]
+        assert statement["calls"] == 100
+        assert statement["mean_exec_time_ms"] == pytest.approx(500.0)
+        assert statement["total_rows"] == 100
+        assert statement["calls_per_second"] == pytest.approx(100 / 300)
+        assert interval["interval_seconds"] == 300
+        assert interval["calls"] == 100
+
+    def test_new_statement_counts_fully(self):
+        """Test that statements first seen in this interval are included as-is."""
+        previous = StatementSnapshot(T0, {})
+        current = StatementSnapshot(T0 + timedelta(seconds=60), {2: _counters(4, 40.0)})
+
+        interval = compute_statement_deltas(previous, current)
+
+        assert interval["statements"][0]["query_id"] == "2"
+        assert interval["statements"][0]["mean_exec_time_ms"] == pytest.approx(10.0)
+
+    def test_idle_statements_are_omitted(self):
+        """Test that statements without calls in the interval are dropped."""
+        previous = StatementSnapshot(T0, {1: _counters(5, 50.0)})
+        current = StatementSnapshot(T0 + timedelta(seconds=60), {1: _counters(5, 50.0)})
+
+        interval = compute_statement_deltas(previous, current)
+
+        assert interval["statements"] == []
+        assert interval["calls"] == 0
+
+    def test_stats_reset_rebaselines(self):
+        """Test that pg_stat_statements_reset() invalidates the previous snapshot."""
+        previous = StatementSnapshot(T0, {1: _counters(50, 500.0)}, stats_reset=T0)
+        current = StatementSnapshot(
+            T0 + timedelta(seconds=60),
+            {1: _counters(3, 30.0)},
+            stats_reset=T0 + timedelta(seconds=30),
+        )
+
+        assert compute_statement_deltas(previous, current) is None
+
+    def test_counter_going_backwards_is_skipped(self):
+        """Test that entries evicted and re-created between polls are skipped."""
+        previous = StatementSnapshot(
+            T0, {1: _counters(50, 500.0), 2: _counters(10, 10.0)}, dealloc=0
+        )
+        current = StatementSnapshot(
+            T0 + timedelta(seconds=60),
+            {1: _counters(3, 30.0), 2: _counters(20, 30.0)},
+            dealloc=1,
+        )
+
+        interval = compute_statement_deltas(previous, current)
+
+        assert [s["query_id"] for s in interval["statements"]] == ["2"]
+        assert interval["skipped_statements"] == 1
+        assert interval["dealloc_gap"] is True
+
+
+def test_select_slow_statements():
+    """Test filtering and ordering by interval mean latency."""
+    statements = [
+        {"query_id": "1", "mean_exec_time_ms": 5.0},
+        {"query_id": "2", "mean_exec_time_ms": 50.0},
+        {"query_id": "3", "mean_exec_time_ms": 500.0},
+    ]
+
+    slow = select_slow_statements(statements, threshold_ms=10.0, limit=1)
+
+    assert [s["query_id"] for s in slow] == ["3"]
+
+
+class TestSharedStatementSnapshots:
+    """Test suite for statement deltas across collector processes."""
+
+    def _conn(self, calls, total_exec_time):
+        conn = AsyncMock()
+        conn.fetchval.return_value = 1
+        conn.fetch.return_value = [{"query_id": 1, **_counters(calls, total_exec_time)}]
+        conn.fetchrow.return_value = {"stats_reset": T0, "dealloc": 0}
+        return conn
+
+    async def _collect(self, collector, conn, taken_at):
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        with patch.object(collector, "_acquire", acquire), patch(
+            "src.infrastructure.collectors.postgres_collector.datetime"
+        ) as clock:
+            clock.utcnow.return_value = taken_at
+            return await collector.collect_statement_deltas()
+
+    @pytest.mark.asyncio
+    async def test_alternating_collectors_sum_to_the_true_total(self):
+        """Test that two worker processes sharing a store never count an interval twice."""
+        store = SnapshotStore()
+        workers = [
+            PostgresCollector("postgresql://db", database_id="db", snapshot_store=store)
+            for _ in range(2)
+        ]
+        cumulative_calls = [100, 130, 180, 185, 260]
+
+        intervals = []
+        for i, calls in enumerate(cumulative_calls):
+            interval = await self._collect(
+                workers[i % 2], self._conn(calls, calls * 2.0), T0 + timedelta(minutes=i)
+            )
+            if interval is not None:
+                intervals.append(interval)
+
+        assert sum(i["calls"] for i in intervals) == cumulative_calls[-1] - cumulative_calls[0]
+        assert sum(i["total_exec_time_ms"] for i in intervals) == pytest.approx(
+            (cumulative_calls[-1] - cumulative_calls[0]) * 2.0
+        )
+
+    @pytest.mark.asyncio
+    async def test_older_snapshot_loses_the_race(self):
+        """Test that a snapshot older than the stored one reports nothing."""
+        store = SnapshotStore()
+        first, late = [
+            PostgresCollector("postgresql://db", database_id="db", snapshot_store=store)
+            for _ in range(2)
+        ]
+        await self._collect(first, self._conn(100, 100.0), T0)
+        await self._collect(first, self._conn(150, 150.0), T0 + timedelta(minutes=2))
+
+        assert await self._collect(late, self._conn(120, 120.0), T0 + timedelta(minutes=1)) is None
+
+    def test_snapshot_round_trips_through_json(self):
+        snapshot = StatementSnapshot(T0, {7: _counters(3, 9.0)}, stats_reset=T0, dealloc=2)
+
+        restored = StatementSnapshot.from_json(snapshot.to_json())
+
+        assert restored.entries == {7: _counters(3, 9.0)}
+        assert (restored.taken_at, restored.stats_reset, restored.dealloc) == (T0, T0, 2)
+
+    @pytest.mark.asyncio
+    async def test_redis_store_swaps_with_one_script_call(self):
+        store = RedisSnapshotStore("redis://localhost")
+        redis = MagicMock()
+        redis.eval = AsyncMock(side_effect=[[1, b""], [1, b"previous"], [0, b""]])
+
+        with patch.object(store, "_redis", return_value=redis):
+            assert await store.swap("statements:db", T0, "a") == (True, None)
+            assert await store.swap("statements:db", T0, "b") == (True, "previous")
+            assert await store.swap("statements:db", T0, "c") == (False, None)
+
+        key, taken_at = redis.eval.await_args_list[0].args[2:4]
+        assert key == "queryinsight:snapshot:statements:db"
+        assert float(taken_at) == (T0 - datetime(1970, 1, 1)).total_seconds()
@@ -0,0 +1,51 @@
+"""Unit tests for the metrics hypertable policies."""
+import sys
+sys.path.insert(0, '/app')
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from src.domain.entities.metric import MetricResolution
+from src.infrastructure.database.timescale import (
+    METRIC_ROLLUPS,
+    ROLLUP_REFRESH_WINDOW_DAYS,
+    metrics_policy_statements,
+)
+
+
+def _compiled(statements):
+    return [statement.compile(dialect=postgresql.dialect()) for statement in statements]
+
+
+class TestMetricsPolicyStatements:
+    """Test suite for metrics_policy_statements()."""
+
+    def test_policies_are_replaced(self):
+        """Test that each policy is removed before it is added again."""
+        compiled = _compiled(metrics_policy_statements(24, 90))
+
+        assert [str(c).split("(")[0] for c in compiled] == [
+            "SELECT remove_compression_policy",
+            "SELECT add_compression_policy",
+            "SELECT remove_retention_policy",
+            "SELECT add_retention_policy",
+        ]
+        assert compiled[1].params == {"table": "metrics", "hours": 24}
+        assert compiled[3].params == {"table": "metrics", "days": 90}
+
+    def test_zero_retention_keeps_metrics(self):
+        compiled = _compiled(metrics_policy_statements(24, 0))
+
+        assert "remove_retention_policy" in str(compiled[-1])
+        assert not any("add_retention_policy" in str(c) for c in compiled)
+
+    @pytest.mark.parametrize("retention_days", [-1, 1, ROLLUP_REFRESH_WINDOW_DAYS])
+    def test_retention_within_refresh_window_is_rejected(self, retention_days):
+        """Test that raw chunks cannot be dropped while rollups still refresh from them."""
+        with pytest.raises(ValueError, match="rollup refresh window"):
+            metrics_policy_statements(24, retention_days)
+
+    def test_retention_just_past_refresh_window_is_accepted(self):
+        daily = METRIC_ROLLUPS[MetricResolution.DAY]
+
+        assert f"start_offset => INTERVAL '{ROLLUP_REFRESH_WINDOW_DAYS} days'" in daily.policy_sql()
+        assert len(metrics_policy_statements(24, ROLLUP_REFRESH_WINDOW_DAYS + 1)) == 4
@@ -0,0 +1,104 @@
+"""Unit tests for the workload index advisor."""
+import sys
+sys.path.insert(0, '/app')
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.application.use_cases.advise_indexes import AdviseIndexesUseCase
+from src.domain.entities.query_pattern import QueryPattern
+from src.infrastructure.analyzers.workload_index_advisor import WorkloadIndexAdvisor
+
+
+def _scan_plan(table, filter_text, rows=100000, removed=0):
+    return [{"Plan": {
+        "Node Type": "Seq Scan",
+        "Relation Name": table,
+        "Filter": filter_text,
+        "Total Cost": 1000.0,
+        "Plan Rows": rows,
+        "Actual Rows": rows,
+        "Rows Removed by Filter": removed,
+        "Actual Total Time": 100.0,
+        "Actual Loops": 1,
+    }}]
+
+
+class TestWorkloadIndexAdvisor:
+    """Test suite for WorkloadIndexAdvisor."""
+
+    def test_prefix_candidates_merge_into_one_composite(self):
+        """Test that (customer_id) and (customer_id, status) become one index."""
+        advisor = WorkloadIndexAdvisor()
+        advisor.add_plan(1, _scan_plan("orders", "(customer_id = 42)"), 1000.0)
+        advisor.add_plan(2, _scan_plan("orders", "((customer_id = 42) AND (status = 'paid'))"), 500.0)
+
+        [index] = advisor.plan()
+
+        assert index["columns"] == ["customer_id", "status"]
+        assert index["weight_ms"] == 1500.0
+        assert index["fingerprints"] == 2
+        assert index["sql_suggestion"] == (
+            "CREATE INDEX CONCURRENTLY idx_orders_customer_id_status ON orders (customer_id, status);"
+        )
+
+    def test_shared_leading_column_becomes_covering_index(self):
+        advisor = WorkloadIndexAdvisor()
+        advisor.add_plan(1, _scan_plan("orders", "((customer_id = 42) AND (status = 'paid'))"), 1000.0)
+        advisor.add_plan(2, _scan_plan("orders", "((customer_id = 42) AND (region = 'eu'))"), 400.0)
+
+        [index] = advisor.plan()
+
+        assert index["columns"] == ["customer_id", "status"]
+        assert index["include"] == ["region"]
+        # Only the shared leading column helps the second query's filter
+        assert index["weight_ms"] == 1200.0
+
+    def test_count_budget_keeps_heaviest_tables(self):
+        advisor = WorkloadIndexAdvisor(max_indexes=2)
+        for i, weight in enumerate([10.0, 300.0, 200.0]):
+            advisor.add_plan(i, _scan_plan(f"t{i}", "(id = 1)"), weight)
+
+        plan = advisor.plan()
+
+        assert [index["table"] for index in plan] == ["t1", "t2"]
+        assert plan[0]["workload_share"] == pytest.approx(300 / 510, abs=1e-4)
+
+    def test_byte_budget_prefers_weight_per_byte(self):
+        """Test that a heavy index on a huge table loses to two small ones."""
+        advisor = WorkloadIndexAdvisor(max_bytes=10_000_000)
+        advisor.add_plan(1, _scan_plan("events", "(user_id = 1)", rows=1000, removed=5_000_000), 500.0)
+        advisor.add_plan(2, _scan_plan("users", "(email = 'a')", rows=1000, removed=20_000), 300.0)
+        advisor.add_plan(3, _scan_plan("teams", "(slug = 'a')", rows=1000, removed=10_000), 100.0)
+
+        plan = advisor.plan()
+
+        assert [index["table"] for index in plan] == ["users", "teams"]
+        assert sum(index["estimated_bytes"] for index in plan) <= 10_000_000
+
+
+class TestAdviseIndexesUseCase:
+    """Test suite for AdviseIndexesUseCase."""
+
+    @pytest.mark.asyncio
+    async def test_weights_come_from_fingerprint_total_time(self):
+        database_id = uuid4()
+        now = datetime(2026, 1, 1)
+        patterns = [
+            QueryPattern(database_id, 1, "SELECT $1", "SELECT 1", now, now, total_exec_time_ms=900.0),
+            QueryPattern(database_id, 2, "SELECT $1", "SELECT 2", now, now, total_exec_time_ms=100.0),
+        ]
+        uow = MagicMock()
+        uow.__aenter__ = AsyncMock(return_value=uow)
+        uow.__aexit__ = AsyncMock(return_value=False)
+        uow.databases.get_by_id = AsyncMock(return_value=None)
+        uow.query_patterns.get_by_database_id = AsyncMock(return_value=patterns)
+        uow.queries.get_latest_plans = AsyncMock(return_value={1: _scan_plan("orders", "(id = 1)")})
+
+        result = await AdviseIndexesUseCase(uow).execute(database_id)
+
+        assert result["fingerprints_with_plans"] == 1
+        assert result["indexes"][0]["weight_ms"] == 900.0
+        assert result["indexes"][0]["workload_share"] == 0.9
@@ -106,9 +106,9 @@ class ApiClient {
     }
 
     // Metrics
-    async getMetrics(databaseId: string, timeRange: string = '1h') {
+    async getMetrics(databaseId: string, timeRange: string = '1h', maxPoints: number = 500) {
         const { data } = await this.client.get(
-            `/api/v1/databases/${databaseId}/metrics?time_range=${timeRange}`
+            `/api/v1/databases/${databaseId}/metrics?time_range=${timeRange}&max_points=${maxPoints}`
         )
         return data
     }